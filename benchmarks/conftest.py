@@ -0,0 +1,97 @@
+"""pytest options and fixtures for the benchmarks."""
+
+import os
+import shutil
+import ssl
+from collections.abc import Generator
+
+import pytest
+
+from benchmarks.stand_ins import FakeOpenAI, SmtpSink, make_tls_context
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Adds options for the behavior of the stand-in services."""
+    group = parser.getgroup("daily-report benchmarks")
+    group.addoption(
+        "--github-latency",
+        type=float,
+        default=0.0,
+        help="Seconds the GitHub stand-in waits before each response.",
+    )
+    group.addoption(
+        "--github-page-size",
+        type=int,
+        default=30,
+        help="Commits per page if the client does not request a page size.",
+    )
+    group.addoption(
+        "--openai-latency",
+        type=float,
+        default=0.0,
+        help="Seconds the OpenAI stand-in waits before each response.",
+    )
+    group.addoption(
+        "--import-budget",
+        type=float,
+        default=0.25,
+        help="Maximum seconds for importing daily_report.main.",
+    )
+
+
+@pytest.fixture(scope="session")
+def tls_context(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> ssl.SSLContext:
+    """A TLS context with a self-signed certificate for the SMTP sink."""
+    if shutil.which("openssl") is None:
+        pytest.skip("The openssl command is needed for the SMTP sink certificate.")
+    return make_tls_context(str(tmp_path_factory.mktemp("tls")))
+
+
+@pytest.fixture(scope="session")
+def fake_openai(request: pytest.FixtureRequest) -> Generator[FakeOpenAI, None, None]:
+    """The OpenAI stand-in, shared by all benchmarks."""
+    server = FakeOpenAI(latency=request.config.getoption("--openai-latency"))
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def smtp_sink(
+    tls_context: ssl.SSLContext,  # pylint: disable=redefined-outer-name
+) -> Generator[SmtpSink, None, None]:
+    """The SMTP sink, shared by all benchmarks."""
+    sink = SmtpSink(tls_context)
+    sink.start()
+    yield sink
+    sink.stop()
+
+
+@pytest.fixture
+def reporter_env(
+    fake_openai: FakeOpenAI,  # pylint: disable=redefined-outer-name
+    smtp_sink: SmtpSink,  # pylint: disable=redefined-outer-name
+    tmp_path: os.PathLike[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> pytest.MonkeyPatch:
+    """Points the Daily Reporter at the OpenAI stand-in and the SMTP sink and
+    runs it in a temporary directory. The caller sets REPO_NAME and
+    GITHUB_API_URL."""
+    monkeypatch.chdir(tmp_path)
+    env = {
+        "GITHUB_TOKEN": "token",
+        "EMAIL_SENDER": "sender@example.com",
+        "EMAIL_USER": "sender@example.com",
+        "EMAIL_RECEIVER": "receiver@example.com",
+        "EMAIL_PASSWORD": "pw",
+        "OPENAI_API_KEY": "sk-benchmark",
+        "OPENAI_BASE_URL": fake_openai.base_url,
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": str(smtp_sink.port),
+        "GITHUB_OUTPUT": os.path.join(tmp_path, "github_output"),
+    }
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return monkeypatch
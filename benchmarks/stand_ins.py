@@ -0,0 +1,319 @@
+"""
+stand_ins.py
+
+Local stand-ins for the services the Daily Reporter talks to, so the benchmarks
+run the real client libraries (PyGithub, openai, smtplib) over real sockets:
+
+- FakeGitHub serves the REST endpoints used by the REST collector (repository
+  lookup, rate limit, paginated commit list) with a configurable page size and
+  latency per request. Commits are generated on demand from their index, so a
+  repository with 100k commits needs no memory on the server side.
+- FakeOpenAI answers chat completion requests with a fixed report and usage.
+- SmtpSink is an aiosmtpd server with STARTTLS and AUTH that accepts and counts
+  every message.
+"""
+
+import json
+import socket
+import ssl
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import SMTP, AuthResult, Envelope, Session
+
+# Page size GitHub uses when the client does not send per_page.
+DEFAULT_PAGE_SIZE = 30
+MAX_PAGE_SIZE = 100
+RATE_LIMIT = 1_000_000
+
+
+class _StandInServer(ThreadingHTTPServer):
+    """HTTP server on a free local port, served from a daemon thread."""
+
+    daemon_threads = True
+
+    def __init__(self, handler: type[BaseHTTPRequestHandler], latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), handler)
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def count_request(self) -> None:
+        """Counts a request and waits for the configured latency."""
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def start(self) -> None:
+        """Starts serving in the background."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops serving and closes the socket."""
+        self.shutdown()
+        self.server_close()
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    """Request handler with helpers for JSON responses."""
+
+    server: _StandInServer
+    protocol_version = "HTTP/1.1"
+
+    def send_json(
+        self, data: Any, status: int = 200, headers: dict[str, str] | None = None
+    ) -> None:
+        """Sends data as a JSON response."""
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(  # pylint: disable=redefined-builtin
+        self, format: str, *args: Any
+    ) -> None:
+        """Keeps the benchmark output free of access logs."""
+
+
+class FakeGitHub(_StandInServer):
+    """Stand-in for the GitHub REST API with commits_per_repo commits in each
+    of the given repositories; the commit list honors the since parameter."""
+
+    def __init__(
+        self,
+        repo_names: list[str],
+        commits_per_repo: int,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        latency: float = 0.0,
+    ) -> None:
+        super().__init__(_GitHubHandler, latency)
+        self.repo_names = repo_names
+        self.commits_per_repo = commits_per_repo
+        self.page_size = page_size
+        self.newest = datetime.now(timezone.utc)
+
+    def repo(self, name: str) -> dict[str, Any]:
+        """Returns the JSON of a repository."""
+        return {
+            "id": self.repo_names.index(name) + 1,
+            "name": name.split("/")[1],
+            "full_name": name,
+            "owner": {"login": name.split("/")[0]},
+            "url": f"{self.url}/repos/{name}",
+            "html_url": f"https://github.com/{name}",
+            "clone_url": f"https://github.com/{name}.git",
+            "default_branch": "main",
+            "private": False,
+        }
+
+    def commit(self, name: str, index: int) -> dict[str, Any]:
+        """Returns the JSON of the index-th newest commit of a repository; one
+        second older than the previous commit."""
+        sha = f"{self.repo_names.index(name):08x}{index:032x}"
+        date = (self.newest - timedelta(seconds=index)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return {
+            "sha": sha,
+            "url": f"{self.url}/repos/{name}/commits/{sha}",
+            "html_url": f"https://github.com/{name}/commit/{sha}",
+            "commit": {
+                "message": f"Change {index} of {name}\n\nUpdate module {index % 97}.",
+                "author": {"name": f"dev{index % 7}", "date": date},
+            },
+            "parents": [{"sha": f"{self.repo_names.index(name):08x}{index + 1:032x}"}],
+        }
+
+    def rate_limit_headers(self) -> dict[str, str]:
+        """Returns headers that report a nearly unused rate limit."""
+        return {
+            "X-RateLimit-Limit": str(RATE_LIMIT),
+            "X-RateLimit-Remaining": str(RATE_LIMIT - self.requests),
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+        }
+
+
+class _GitHubHandler(_JsonHandler):
+    server: FakeGitHub
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Serves the repository, rate limit and commit list endpoints."""
+        self.server.count_request()
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        parts = url.path.strip("/").split("/")
+        headers = self.server.rate_limit_headers()
+        if parts == ["rate_limit"]:
+            core = {
+                "limit": RATE_LIMIT,
+                "remaining": RATE_LIMIT - self.server.requests,
+                "reset": int(time.time()) + 3600,
+                "used": self.server.requests,
+            }
+            self.send_json({"resources": {"core": core}, "rate": core}, 200, headers)
+            return
+        name = "/".join(parts[1:3])
+        if parts[0] != "repos" or name not in self.server.repo_names:
+            self.send_json({"message": "Not Found"}, 404, headers)
+        elif len(parts) == 3:
+            self.send_json(self.server.repo(name), 200, headers)
+        elif parts[3:] == ["commits"]:
+            self._send_commits(name, query, headers)
+        else:
+            self.send_json({"message": "Not Found"}, 404, headers)
+
+    def _send_commits(
+        self, name: str, query: dict[str, str], headers: dict[str, str]
+    ) -> None:
+        per_page = min(int(query.get("per_page", self.server.page_size)), MAX_PAGE_SIZE)
+        page = int(query.get("page", "1"))
+        total = self.server.commits_per_repo
+        if "since" in query:
+            since = datetime.fromisoformat(query["since"].replace("Z", "+00:00"))
+            age = int((self.server.newest - since).total_seconds())
+            total = max(0, min(total, age + 1))
+        start = (page - 1) * per_page
+        end = min(start + per_page, total)
+        if end < total:
+            next_query = urlencode({**query, "page": page + 1})
+            headers["Link"] = (
+                f'<{self.server.url}/repos/{name}/commits?{next_query}>; rel="next"'
+            )
+        commits = [self.server.commit(name, i) for i in range(start, end)]
+        self.send_json(commits, 200, headers)
+
+
+class FakeOpenAI(_StandInServer):
+    """Stand-in for the OpenAI chat completions API."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        super().__init__(_OpenAIHandler, latency)
+
+    @property
+    def base_url(self) -> str:
+        """The value for OPENAI_BASE_URL."""
+        return f"{self.url}/v1"
+
+
+class _OpenAIHandler(_JsonHandler):
+    server: FakeOpenAI
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Answers every chat completion with the same short report."""
+        self.server.count_request()
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = request["messages"][-1]["content"]
+        self.send_json(
+            {
+                "id": f"chatcmpl-{self.server.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": "## Summary\n\n- Several modules were updated.",
+                        },
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    # Roughly four characters per token.
+                    "prompt_tokens": len(prompt) // 4,
+                    "completion_tokens": 12,
+                    "total_tokens": len(prompt) // 4 + 12,
+                },
+            }
+        )
+
+
+class _SinkHandler:  # pylint: disable=too-few-public-methods
+    """aiosmtpd handler that counts the received messages and bytes."""
+
+    def __init__(self) -> None:
+        self.messages = 0
+        self.bytes = 0
+
+    async def handle_DATA(  # pylint: disable=invalid-name
+        self, server: SMTP, session: Session, envelope: Envelope
+    ) -> str:
+        """Accepts the message."""
+        del server, session
+        self.messages += 1
+        self.bytes += len(envelope.original_content or b"")
+        return "250 Message accepted for delivery"
+
+
+def _accept_any_login(*_args: Any) -> AuthResult:
+    return AuthResult(success=True)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def make_tls_context(directory: str) -> ssl.SSLContext:
+    """Creates a server TLS context with a self-signed certificate generated by
+    the openssl command. smtplib's starttls() does not verify certificates by
+    default, so the reporter accepts it."""
+    cert, key = f"{directory}/cert.pem", f"{directory}/key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", key, "-out", cert, "-days", "1", "-subj", "/CN=localhost",
+        ],  # fmt: skip
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+class SmtpSink:
+    """SMTP server that requires STARTTLS and AUTH and discards all messages."""
+
+    def __init__(self, tls_context: ssl.SSLContext) -> None:
+        self.handler = _SinkHandler()
+        self.port = _free_port()
+        self._controller = Controller(
+            self.handler,
+            hostname="127.0.0.1",
+            port=self.port,
+            tls_context=tls_context,
+            require_starttls=True,
+            authenticator=_accept_any_login,
+        )
+
+    @property
+    def messages(self) -> int:
+        """The number of messages received so far."""
+        return self.handler.messages
+
+    def start(self) -> None:
+        """Starts the server in a background thread."""
+        self._controller.start()
+
+    def stop(self) -> None:
+        """Stops the server."""
+        self._controller.stop()
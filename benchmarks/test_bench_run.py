@@ -0,0 +1,70 @@
+"""End-to-end benchmarks of DailyReporter.run() against the local stand-ins."""
+
+import tracemalloc
+from collections.abc import Generator
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.stand_ins import FakeGitHub, FakeOpenAI, SmtpSink
+from daily_report.daily_reporter import DailyReporter
+
+# (commits per repository, repositories); the largest cases run a single round.
+SIZES = [(10, 1), (1_000, 1), (1_000, 5), (10_000, 1), (100_000, 1)]
+SINGLE_ROUND = 10_000
+
+
+def _run_reporter() -> None:
+    """Runs the reporter once and checks that it finished successfully."""
+    with pytest.raises(SystemExit) as exc_info:
+        DailyReporter().run()
+    assert exc_info.value.code == 0
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size[0]}commits-{size[1]}repos")
+def fake_github(
+    request: pytest.FixtureRequest,
+    reporter_env: pytest.MonkeyPatch,
+) -> Generator[FakeGitHub, None, None]:
+    """A GitHub stand-in with the parameterized number of repositories and
+    commits, configured as the reporter's GitHub API."""
+    commits, repos = request.param
+    names = [f"bench/repo{i}" for i in range(repos)]
+    server = FakeGitHub(
+        names,
+        commits,
+        page_size=request.config.getoption("--github-page-size"),
+        latency=request.config.getoption("--github-latency"),
+    )
+    server.start()
+    reporter_env.setenv("GITHUB_API_URL", server.url)
+    reporter_env.setenv("REPO_NAME", ",".join(names))
+    yield server
+    server.stop()
+
+
+def test_run(
+    benchmark: BenchmarkFixture,
+    fake_github: FakeGitHub,  # pylint: disable=redefined-outer-name
+    fake_openai: FakeOpenAI,
+    smtp_sink: SmtpSink,
+) -> None:
+    """Benchmarks a full run: collection, analysis, rendering and sending."""
+    # A first run under tracemalloc measures the peak memory and warms up
+    # imports and connections; it is not part of the timings.
+    openai_requests = fake_openai.requests
+    tracemalloc.start()
+    try:
+        _run_reporter()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_memory_mb"] = round(peak / 2**20, 1)
+    benchmark.extra_info["github_requests"] = fake_github.requests
+    benchmark.extra_info["openai_requests"] = fake_openai.requests - openai_requests
+    messages = smtp_sink.messages
+
+    single = fake_github.commits_per_repo >= SINGLE_ROUND
+    benchmark.pedantic(_run_reporter, rounds=1 if single else 5, iterations=1)
+
+    assert smtp_sink.messages > messages
@@ -0,0 +1,55 @@
+"""Start-up benchmarks: import time of the entry point and a cold start that
+stops at the environment check, as in a container with a broken configuration."""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+# Imported only by the stages that need them.
+HEAVY_MODULES = ("openai", "github", "markdown")
+
+
+def _python(*args: str) -> subprocess.CompletedProcess[str]:
+    """Runs a fresh interpreter with only src on the path and no configuration."""
+    return subprocess.run(
+        [sys.executable, *args],
+        env={"PATH": os.environ.get("PATH", ""), "PYTHONPATH": SRC},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_import_time_budget(request: pytest.FixtureRequest) -> None:
+    """Test that importing the entry point stays within the import-time budget
+    and does not load the GitHub, OpenAI or Markdown libraries."""
+    budget = request.config.getoption("--import-budget")
+    result = _python(
+        "-X",
+        "importtime",
+        "-c",
+        "import sys, daily_report.main; print(*sorted(sys.modules), sep='\\n')",
+    )
+    assert result.returncode == 0, result.stderr
+
+    loaded = set(result.stdout.split())
+    assert not loaded & set(HEAVY_MODULES)
+    match = re.search(r"\|\s*(\d+) \|\s*daily_report\.main$", result.stderr, re.M)
+    assert match is not None
+    seconds = int(match.group(1)) / 1_000_000
+    assert seconds <= budget, f"import took {seconds:.3f}s, budget {budget}s"
+
+
+def test_cold_start_until_env_check(benchmark: BenchmarkFixture) -> None:
+    """Benchmarks starting the entry point without configuration, which exits
+    with status 1 after the environment check."""
+    result = benchmark.pedantic(
+        _python, args=("-m", "daily_report.main"), rounds=10, iterations=1
+    )
+    assert result.returncode == 1
+    assert "GITHUB_TOKEN is not set." in result.stdout + result.stderr
@@ -0,0 +1,144 @@
+"""
+activity_collector.py
+
+This module provides a collector for the pull request, review and issue activity
+of a repository. One GraphQL search query returns up to 100 pull requests and
+issues updated since a date, including their reviews, so a day of activity costs
+a single request (or a few for very busy repositories) instead of one REST call
+per pull request. The results are flattened into ActivityEvent records (opened,
+merged, closed, reviewed) that lie inside the collection window.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from github import Github
+
+# Maximum page size allowed by the GraphQL API.
+PAGE_SIZE = 100
+# Reviews fetched per pull request.
+REVIEWS_PER_PULL_REQUEST = 20
+
+ACTIVITY_QUERY = """
+query($query: String!, $after: String, $first: Int!, $reviews: Int!) {
+  search(query: $query, type: ISSUE, first: $first, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      __typename
+      ... on PullRequest {
+        number title url createdAt closedAt mergedAt author { login }
+        reviews(first: $reviews) { nodes { state submittedAt author { login } } }
+      }
+      ... on Issue {
+        number title url createdAt closedAt author { login }
+      }
+    }
+  }
+}
+"""
+
+
+@dataclass(slots=True)
+class ActivityEvent:
+    """One pull request, review or issue event."""
+
+    kind: str  # e.g. "pull request merged", "issue opened", "review approved"
+    number: int
+    title: str
+    url: str
+    actor: str | None
+    date: datetime
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the event as a JSON-compatible dict (ISO 8601 date)."""
+        return {
+            "kind": self.kind,
+            "number": self.number,
+            "title": self.title,
+            "url": self.url,
+            "actor": self.actor,
+            "date": self.date.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ActivityEvent":
+        """Creates an event from a dict as returned by to_dict."""
+        return cls(
+            kind=data["kind"],
+            number=int(data["number"]),
+            title=data["title"],
+            url=data.get("url", ""),
+            actor=data.get("actor"),
+            date=datetime.fromisoformat(data["date"]),
+        )
+
+
+def format_event(event: ActivityEvent) -> str:
+    """Formats an event as one line of the activity list in a prompt."""
+    line = f"- {event.kind} #{event.number}: {event.title}"
+    return f"{line} ({event.actor})" if event.actor else line
+
+
+def _parse_date(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _login(node: dict[str, Any]) -> str | None:
+    return (node.get("author") or {}).get("login")
+
+
+def parse_activity_node(node: dict[str, Any], since: datetime) -> list[ActivityEvent]:
+    """Converts a search result node into the events that happened since the date."""
+    is_pull = node["__typename"] == "PullRequest"
+    noun = "pull request" if is_pull else "issue"
+    merged = _parse_date(node.get("mergedAt"))
+    dates = [
+        (f"{noun} opened", _parse_date(node.get("createdAt")), _login(node)),
+        (f"{noun} merged", merged, None),
+        # A merged pull request is closed as well; report it once.
+        (f"{noun} closed", None if merged else _parse_date(node.get("closedAt")), None),
+    ]
+    if is_pull:
+        for review in (node.get("reviews") or {}).get("nodes", []):
+            dates.append(
+                (
+                    f"review {review['state'].lower().replace('_', ' ')}",
+                    _parse_date(review.get("submittedAt")),
+                    _login(review),
+                )
+            )
+    return [
+        ActivityEvent(kind, node["number"], node["title"], node["url"], actor, date)
+        for kind, date, actor in dates
+        if date is not None and date >= since
+    ]
+
+
+def iter_activity_graphql(
+    github: "Github", repo_name: str, since: datetime
+) -> Iterator[ActivityEvent]:
+    """Yields the pull request, review and issue events of repo_name since the
+    given date, ordered by the last update of their pull request or issue."""
+    since_utc = since.astimezone(timezone.utc).replace(microsecond=0)
+    query = (
+        f"repo:{repo_name} updated:>={since_utc.strftime('%Y-%m-%dT%H:%M:%SZ')} "
+        "sort:updated-desc"
+    )
+    variables: dict[str, Any] = {
+        "query": query,
+        "after": None,
+        "first": PAGE_SIZE,
+        "reviews": REVIEWS_PER_PULL_REQUEST,
+    }
+    while True:
+        _headers, data = github.requester.graphql_query(ACTIVITY_QUERY, variables)
+        search = data["data"]["search"]
+        for node in search["nodes"]:
+            if node and node.get("__typename") in ("PullRequest", "Issue"):
+                yield from parse_activity_node(node, since)
+        if not search["pageInfo"]["hasNextPage"]:
+            return
+        variables["after"] = search["pageInfo"]["endCursor"]
@@ -0,0 +1,123 @@
+"""
+analysis.py
+
+This module provides the prompts and helpers used to analyze commits with OpenAI.
+Commit lists that do not fit into the prompt token budget are split into batches
+(chunk_by_tokens); each batch is summarized on its own and the partial summaries
+are then reduced into the final Markdown report.
+
+For memoized analyses the model writes one note per commit (NOTES_PROMPT), which
+parse_commit_notes maps back to the commits so the notes can be cached by SHA.
+"""
+
+import math
+import re
+
+from .commit_record import CommitRecord
+
+# Rough average number of characters per token for English text and code.
+CHARS_PER_TOKEN = 4
+
+# What the lines of a prompt list: commits, optionally followed by pull request,
+# review and issue events.
+COMMITS_SUBJECT = "Git commits"
+ACTIVITY_SUBJECT = "Git commits and pull request, review, and issue events"
+
+SUMMARY_PROMPT = """
+Here is a list of {subject}:
+{formatted}
+
+Create a daily summary in Markdown.
+Analyze possible issues, TODOs, or code smells and provide recommendations.
+"""
+
+CHUNK_PROMPT = """
+Here is part {part} of {parts} of a list of {subject}:
+{formatted}
+
+Summarize these as concise Markdown bullet points.
+Note possible issues, TODOs, or code smells.
+"""
+
+MERGE_PROMPT = """
+Here are partial summaries of a list of {subject}:
+{formatted}
+
+Merge them into one concise list of Markdown bullet points.
+Keep all noted issues, TODOs, and code smells.
+"""
+
+REDUCE_PROMPT = """
+Here are partial summaries of a list of {subject}:
+{formatted}
+
+Create a daily summary in Markdown.
+Analyze possible issues, TODOs, or code smells and provide recommendations.
+"""
+
+NOTES_PROMPT = """
+Here is a list of Git commits:
+{formatted}
+
+For every commit, write exactly one line of the form "<short sha>: <note>".
+The note summarizes the change in one sentence and mentions possible issues,
+TODOs, or code smells. Do not write anything else.
+"""
+
+# Matches a "<sha>: <note>" line, tolerating list markers and brackets.
+NOTE_LINE = re.compile(r"^\s*(?:[-*]\s*)?\[?([0-9a-fA-F]{7,40})\]?\s*[:–-]\s*(.+?)\s*$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimates the number of tokens of a text without a tokenizer."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def format_commit(commit: CommitRecord, message: str | None = None) -> str:
+    """Formats a commit as one line of the commit list in a prompt, optionally
+    with a different message (e.g. a cached note). The diffstat is appended if
+    the commit was enriched with one."""
+    if message is None:
+        message = commit.message
+    line = f"- [{commit.sha[:7]}] {message} ({commit.author})"
+    return f"{line} [{commit.diffstat}]" if commit.diffstat else line
+
+
+def chunk_by_tokens(items: list[str], budget: int) -> list[list[str]]:
+    """
+    Splits items into consecutive batches whose estimated token count stays within
+    budget. Items larger than the budget are truncated and get a batch of their own.
+    """
+    max_chars = budget * CHARS_PER_TOKEN
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    used = 0
+    for item in items:
+        if len(item) > max_chars:
+            item = item[: max_chars - 1] + "…"
+        tokens = estimate_tokens(item) + 1  # joining newline
+        if current and used + tokens > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def parse_commit_notes(answer: str, commits: list[CommitRecord]) -> dict[str, str]:
+    """
+    Parses the per-commit notes of a NOTES_PROMPT answer and returns them keyed by
+    the full SHA of the matching commits. Lines that match no commit are ignored.
+    """
+    notes: dict[str, str] = {}
+    for line in answer.splitlines():
+        match = NOTE_LINE.match(line)
+        if not match:
+            continue
+        prefix = match.group(1).lower()
+        for commit in commits:
+            if commit.sha.lower().startswith(prefix):
+                notes[commit.sha] = match.group(2)
+    return notes
@@ -0,0 +1,62 @@
+"""
+branches.py
+
+This module lists the branches of a repository for multi-branch collection.
+One GraphQL request returns up to 100 branches together with the commit date of
+their heads, so the Daily Reporter can skip branches without commits in the
+collection window before walking any history, even in repositories with
+hundreds of branches. Branch names are selected with shell-style patterns
+such as 'release/*', matched case-sensitively like git refs.
+"""
+
+from collections.abc import Iterator
+from datetime import datetime
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from github import Github
+
+# Maximum page size allowed by the GraphQL API.
+PAGE_SIZE = 100
+
+BRANCHES_QUERY = """
+query($owner: String!, $name: String!, $after: String, $first: Int!) {
+  repository(owner: $owner, name: $name) {
+    refs(refPrefix: "refs/heads/", first: $first, after: $after) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name target { ... on Commit { committedDate } } }
+    }
+  }
+}
+"""
+
+
+def matches_any(name: str, patterns: list[str]) -> bool:
+    """Returns whether a branch name matches one of the patterns."""
+    return any(fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def iter_branches(
+    github: "Github", repo_name: str, patterns: list[str]
+) -> Iterator[tuple[str, datetime | None]]:
+    """Yields the name and head commit date of each branch of repo_name that
+    matches one of the patterns."""
+    owner, name = repo_name.split("/", 1)
+    variables: dict[str, Any] = {
+        "owner": owner,
+        "name": name,
+        "after": None,
+        "first": PAGE_SIZE,
+    }
+    while True:
+        _headers, data = github.requester.graphql_query(BRANCHES_QUERY, variables)
+        refs = data["data"]["repository"]["refs"]
+        for node in refs["nodes"]:
+            if not matches_any(node["name"], patterns):
+                continue
+            date = (node.get("target") or {}).get("committedDate")
+            yield node["name"], datetime.fromisoformat(date) if date else None
+        if not refs["pageInfo"]["hasNextPage"]:
+            return
+        variables["after"] = refs["pageInfo"]["endCursor"]
@@ -0,0 +1,117 @@
+"""
+checkpoints.py
+
+This module provides the CheckpointStore class, which records the completed
+stages of each repository's report in a JSON file per repository: the collected
+commits and events, the generated report and the sinks it has been delivered
+to. When a run fails, e.g. because the SMTP server is down, a rerun on the same
+day resumes from the failed stage instead of collecting and analyzing again.
+The checkpoints of a run are removed once it has succeeded, and checkpoints of
+other days are ignored and removed.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from typing import Any
+
+from .activity_collector import ActivityEvent
+from .commit_record import CommitRecord
+
+
+class CheckpointStore:
+    """Stores the completed stages of the reports of one day in a directory."""
+
+    def __init__(self, directory: str, run_date: str) -> None:
+        self.directory = directory
+        self.run_date = run_date
+        self._lock = threading.Lock()
+
+    def path(self, repo_name: str) -> str:
+        """Returns the checkpoint file of a repository (names are lowercased)."""
+        safe_name = re.sub(r"[^a-z0-9_\-\.]", "_", repo_name.lower().replace("/", "-"))
+        return os.path.join(
+            self.directory, f"checkpoint-{self.run_date}-{safe_name}.json"
+        )
+
+    def _files(self) -> list[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return [
+            name
+            for name in os.listdir(self.directory)
+            if name.startswith("checkpoint-") and name.endswith(".json")
+        ]
+
+    def load(self, repo_name: str) -> dict[str, Any]:
+        """Returns the checkpoint of a repository; a missing or unreadable file
+        yields an empty checkpoint."""
+        path = self.path(repo_name)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError) as exc:
+            print(
+                f"⚠️ Warning: Ignoring unreadable checkpoint '{path}': {exc}",
+                file=sys.stderr,
+            )
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def update(self, repo_name: str, **values: Any) -> None:
+        """Adds values to the checkpoint of a repository and writes it atomically."""
+        path = self.path(repo_name)
+        with self._lock:
+            data = self.load(repo_name)
+            data.update(values)
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
+
+    def save_collection(
+        self,
+        repo_name: str,
+        commits: list[CommitRecord],
+        events: list[ActivityEvent],
+        branch_heads: dict[str, CommitRecord],
+    ) -> None:
+        """Checkpoints the collected commits and events of a repository and the
+        newest commit per branch."""
+        self.update(
+            repo_name,
+            commits=[commit.to_dict() for commit in commits],
+            events=[event.to_dict() for event in events],
+            branch_heads={name: head.to_dict() for name, head in branch_heads.items()},
+        )
+
+    @staticmethod
+    def collection(
+        checkpoint: dict[str, Any],
+    ) -> tuple[list[CommitRecord], list[ActivityEvent], dict[str, CommitRecord]]:
+        """Returns the commits, events and branch heads saved by save_collection."""
+        return (
+            [CommitRecord.from_dict(commit) for commit in checkpoint["commits"]],
+            [ActivityEvent.from_dict(event) for event in checkpoint.get("events", [])],
+            {
+                name: CommitRecord.from_dict(head)
+                for name, head in checkpoint.get("branch_heads", {}).items()
+            },
+        )
+
+    def remove_stale(self) -> None:
+        """Removes the checkpoints of other days."""
+        prefix = f"checkpoint-{self.run_date}-"
+        for name in self._files():
+            if not name.startswith(prefix):
+                os.remove(os.path.join(self.directory, name))
+
+    def clear(self) -> None:
+        """Removes all checkpoints after a successful run."""
+        for name in self._files():
+            os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,78 @@
+"""
+commit_filters.py
+
+This module provides the CommitFilter class, a chain of filter stages that the
+collected commits stream through before they are buffered and analyzed. Stages
+are plain predicates; the built-in ones drop commits by author (allow and deny
+lists with '*' wildcards), merge commits and commits whose message matches a
+regular expression (e.g. '[skip ci]'). The collectors yield their commits page
+by page, so filtered commits are never kept in memory or sent to the model.
+"""
+
+import re
+from collections.abc import Callable, Iterable, Iterator
+
+from .commit_record import CommitRecord
+
+CommitPredicate = Callable[[CommitRecord], bool]
+
+
+def parse_patterns(value: str) -> list[str]:
+    """Splits a comma or newline separated list of patterns."""
+    return [p.strip() for p in re.split(r"[,\n]", value) if p.strip()]
+
+
+def compile_author_patterns(patterns: list[str]) -> re.Pattern[str] | None:
+    """Compiles author patterns into one case-insensitive regex. Only '*' is a
+    wildcard, so bot names such as 'dependabot[bot]' match literally."""
+    if not patterns:
+        return None
+    alternatives = (".*".join(map(re.escape, p.split("*"))) for p in patterns)
+    return re.compile("|".join(f"(?:{a})" for a in alternatives), re.IGNORECASE)
+
+
+def exclude_shas(
+    commits: Iterable[CommitRecord], shas: set[str]
+) -> Iterator[CommitRecord]:
+    """Yields the commits whose SHA is not in shas, e.g. the already reported ones."""
+    return (commit for commit in commits if commit.sha not in shas)
+
+
+class CommitFilter:
+    """Applies filter stages lazily to a stream of commits."""
+
+    def __init__(self) -> None:
+        self.stages: list[CommitPredicate] = []
+
+    @classmethod
+    def from_options(cls, options: dict[str, str], skip_merges: bool) -> "CommitFilter":
+        """Creates the filter configured by INCLUDE_AUTHORS, EXCLUDE_AUTHORS,
+        EXCLUDE_MESSAGE_PATTERN and SKIP_MERGE_COMMITS."""
+        commit_filter = cls()
+        include = compile_author_patterns(parse_patterns(options["INCLUDE_AUTHORS"]))
+        if include is not None:
+            commit_filter.add_stage(
+                lambda c: c.author is not None and bool(include.fullmatch(c.author))
+            )
+        exclude = compile_author_patterns(parse_patterns(options["EXCLUDE_AUTHORS"]))
+        if exclude is not None:
+            commit_filter.add_stage(
+                lambda c: c.author is None or not exclude.fullmatch(c.author)
+            )
+        if skip_merges:
+            commit_filter.add_stage(lambda c: not c.is_merge)
+        if options["EXCLUDE_MESSAGE_PATTERN"]:
+            message = re.compile(options["EXCLUDE_MESSAGE_PATTERN"])
+            commit_filter.add_stage(lambda c: not message.search(c.message))
+        return commit_filter
+
+    def add_stage(self, predicate: CommitPredicate) -> None:
+        """Adds a stage that keeps the commits for which predicate returns True."""
+        self.stages.append(predicate)
+
+    def apply(self, commits: Iterable[CommitRecord]) -> Iterator[CommitRecord]:
+        """Returns an iterator over the commits that pass all stages."""
+        stream: Iterator[CommitRecord] = iter(commits)
+        for stage in self.stages:
+            stream = filter(stage, stream)
+        return stream
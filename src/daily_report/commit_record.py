@@ -0,0 +1,53 @@
+"""
+commit_record.py
+
+This module provides the CommitRecord class, the compact representation of a
+collected commit that all collector backends produce. Records use __slots__, so
+they need a fraction of the memory of the equivalent dicts when org-wide runs
+collect many commits, and fields are read as attributes instead of looked up by
+key. to_dict and from_dict convert records to and from JSON-compatible dicts.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+
+@dataclass(slots=True)
+class CommitRecord:
+    """One commit of a collected history."""
+
+    sha: str
+    message: str
+    author: str | None
+    url: str
+    date: datetime | None
+    is_merge: bool = False
+    # Compact diffstat added by DiffstatEnricher, e.g. "+12 -3: src/a.py +10 -2".
+    diffstat: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the record as a JSON-compatible dict (ISO 8601 date)."""
+        return {
+            "sha": self.sha,
+            "message": self.message,
+            "author": self.author,
+            "url": self.url,
+            "date": self.date.isoformat() if self.date else None,
+            "is_merge": self.is_merge,
+            "diffstat": self.diffstat,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CommitRecord":
+        """Creates a record from a dict as returned by to_dict."""
+        date = data.get("date")
+        return cls(
+            sha=data["sha"],
+            message=data["message"],
+            author=data.get("author"),
+            url=data.get("url", ""),
+            date=datetime.fromisoformat(date) if date else None,
+            is_merge=bool(data.get("is_merge", False)),
+            diffstat=data.get("diffstat", ""),
+        )
@@ -0,0 +1,146 @@
+"""
+cursor_store.py
+
+This module provides the CursorStore class, which persists the newest processed
+commit (SHA and date) per repository and branch in a JSON file, together with
+the SHAs and dates of the recently reported commits of each repository. The
+Daily Reporter collects from the cursor date minus a bounded overlap, so commits
+that were pushed after the previous run with an earlier date are not missed,
+and skips the commits of the overlap that were already reported.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+# Key of the reported SHAs in the JSON file; repository keys always contain "/".
+REPORTED_KEY = "_reported"
+
+
+class CursorStore:
+    """Stores the last processed commit per repository and branch in a JSON file."""
+
+    def __init__(self, path: str, overlap: timedelta = timedelta(hours=24)) -> None:
+        self.path = path
+        # Collection starts this long before the cursor date.
+        self.overlap = overlap
+        self._lock = threading.Lock()
+        data = self._load()
+        reported = data.pop(REPORTED_KEY, {})
+        # Reported SHAs per repository with their commit dates.
+        self._reported: dict[str, dict[str, str]] = (
+            reported if isinstance(reported, dict) else {}
+        )
+        self._cursors: dict[str, dict[str, str]] = data
+
+    def _load(self) -> dict[str, dict[str, str]]:
+        """Loads the cursors from disk; a missing or unreadable file yields no cursors."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError) as exc:
+            print(
+                f"⚠️ Warning: Ignoring unreadable cursor store '{self.path}': {exc}",
+                file=sys.stderr,
+            )
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return data
+
+    @staticmethod
+    def key(repo_name: str, branch: str = "") -> str:
+        """Returns the store key for a repository and branch
+        (an empty branch denotes the default branch).
+        Repository names are case-insensitive on GitHub, so they are lowercased."""
+        repo_name = repo_name.lower()
+        return f"{repo_name}@{branch}" if branch else repo_name
+
+    def get(self, repo_name: str, branch: str = "") -> dict[str, str] | None:
+        """Returns the cursor ({'sha': ..., 'date': ...}) or None if there is none."""
+        with self._lock:
+            return self._cursors.get(self.key(repo_name, branch))
+
+    def since(self, repo_name: str, branch: str = "") -> datetime | None:
+        """Returns the date of the last processed commit as an aware datetime."""
+        cursor = self.get(repo_name, branch)
+        if cursor is None:
+            return None
+        return _parse_date(cursor["date"])
+
+    def start(self, repo_name: str, branch: str = "") -> datetime | None:
+        """Returns the date to collect from: the cursor date minus the overlap,
+        or None if there is no cursor."""
+        since = self.since(repo_name, branch)
+        return None if since is None else since - self.overlap
+
+    def advance(self, repo_name: str, sha: str, date: Any, branch: str = "") -> None:
+        """Records the given commit as the last processed one."""
+        if isinstance(date, datetime):
+            date = date.isoformat()
+        with self._lock:
+            self._cursors[self.key(repo_name, branch)] = {"sha": sha, "date": str(date)}
+
+    def reported(self, repo_name: str) -> set[str]:
+        """Returns the SHAs of the commits of a repository reported recently,
+        including those of its cursors."""
+        repo_name = repo_name.lower()
+        with self._lock:
+            shas = set(self._reported.get(repo_name, {}))
+            for key, cursor in self._cursors.items():
+                if key == repo_name or key.startswith(f"{repo_name}@"):
+                    shas.add(cursor["sha"])
+        return shas
+
+    def mark_reported(
+        self, repo_name: str, commits: Iterable[tuple[str, datetime | None]]
+    ) -> None:
+        """Records commits given as (SHA, date) pairs as reported; a missing date
+        counts as now. Commits dated before the start of every cursor of the
+        repository can no longer be collected and are forgotten, so call this
+        after advancing the cursors."""
+        repo_name = repo_name.lower()
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            starts = [
+                _parse_date(cursor["date"]) - self.overlap
+                for key, cursor in self._cursors.items()
+                if key == repo_name or key.startswith(f"{repo_name}@")
+            ]
+            entries = dict(self._reported.get(repo_name, {}))
+            for sha, date in commits:
+                entries[sha] = (date or now).isoformat()
+            if starts:
+                oldest = min(starts)
+                entries = {
+                    sha: date
+                    for sha, date in entries.items()
+                    if _parse_date(date) >= oldest
+                }
+            self._reported[repo_name] = entries
+
+    def save(self) -> None:
+        """Writes all cursors and reported SHAs to disk atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            data: dict[str, Any] = {**self._cursors, REPORTED_KEY: self._reported}
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def _parse_date(value: str) -> datetime:
+    """Parses an ISO date; naive dates are taken as UTC."""
+    date = datetime.fromisoformat(value)
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date
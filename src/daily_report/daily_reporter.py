@@ -4,13 +4,46 @@ and sends daily reports of GitHub commits for a repository via email.
 Main features:
 - Loads and validates required environment variables for GitHub, OpenAI,
   and email configuration.
-- Collects commits from the last two days from a specified GitHub repository.
+- Collects commits from the last two days from one or more GitHub repositories,
+  fanning out over several repositories concurrently with a bounded worker pool.
+- Optionally remembers the newest processed commit per repository in a cursor
+  store, so that each run only collects the commits added since the last run
+  (with a bounded overlap whose already reported commits are skipped).
+- With BRANCHES, also collects the matching branches that have recent commits,
+  concurrently, and reports commits shared between branches once.
+- Collects commits either through the REST API (PyGithub) or with batched
+  GraphQL history queries (COLLECTOR_BACKEND=graphql), or from a local partial
+  clone with `git log` without using the API (COLLECTOR_BACKEND=git). Commits
+  stream through configurable filters (authors, merges, message patterns, path)
+  as they are collected, so bot commits never reach the analysis. With
+  COMMIT_DIFFSTAT, commits are enriched with cached, concurrently fetched
+  diffstats that are included in the prompts. With COLLECT_ACTIVITY, pull
+  request, review and issue events are collected alongside the commits with
+  batched GraphQL search queries and analyzed together with them. Every GitHub
+  request waits for the rate limit reset instead of failing once the quota runs
+  low, and with GITHUB_CACHE_DIR unchanged REST commit pages are revalidated
+  with conditional requests (ETag/If-None-Match).
 - Analyzes commits using OpenAI GPT, generates a daily summary in Markdown
   format, and provides recommendations for possible issues, TODOs, or code smells.
+  Large commit lists are summarized in token-budgeted batches (map-reduce),
+  and responses can be cached on disk to make reruns free. With COMMIT_MEMO,
+  per-commit notes are cached by SHA so that only new commits reach the model.
+  With OPENAI_STREAM, the report is streamed into its file as it is generated,
+  and a hard timeout keeps the partial report instead of failing.
 - Sends the generated report via email
-  (as Markdown text, HTML, and as an attachment).
+  (as Markdown text, HTML, and as an attachment) to one or more recipients,
+  reusing one SMTP connection for all reports of a run. Each report is rendered
+  once with a reusable Markdown converter and precompiled, optionally per-team
+  HTML templates with inline styles.
 - Saves the report locally as a Markdown file and optionally outputs it for
-  GitHub Actions.
+  GitHub Actions. The outputs are sinks (OUTPUT_SINKS) that also include Slack
+  and Teams webhooks and S3-compatible storage; each report is dispatched to
+  all of them concurrently, with a timeout and retries per sink.
+- Runs these stages as an asyncio pipeline: repositories move from collection to
+  analysis to delivery independently, and the file and Actions outputs are
+  written while the emails are in flight. Transient GitHub, OpenAI and SMTP
+  errors are retried with backoff behind per-service circuit breakers, and with
+  CHECKPOINT_DIR a failed run resumes from its last completed stage.
 
 Dependencies:
 - env_check (local module for environment variable validation)
@@ -19,30 +52,105 @@ Usage example:
 from daily_report import DailyReporter
 """
 
+# pylint: disable=too-many-lines
+
+import asyncio
+import json
 import os
 import re
 import smtplib
 import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime, timedelta, timezone
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Any
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from .activity_collector import ActivityEvent, format_event, iter_activity_graphql
+from .analysis import (
+    ACTIVITY_SUBJECT,
+    CHUNK_PROMPT,
+    COMMITS_SUBJECT,
+    MERGE_PROMPT,
+    NOTES_PROMPT,
+    REDUCE_PROMPT,
+    SUMMARY_PROMPT,
+    chunk_by_tokens,
+    estimate_tokens,
+    format_commit,
+    parse_commit_notes,
+)
+from .branches import iter_branches
+from .checkpoints import CheckpointStore
+from .commit_filters import CommitFilter, exclude_shas, parse_patterns
+from .commit_record import CommitRecord
+from .cursor_store import CursorStore
+from .enrichment import DiffstatEnricher
+from .env_check import (
+    EnvCheckError,
+    GithubSession,
+    check_env_vars,
+    check_optional_env_vars,
+    env_flag,
+    is_repo_selector,
+    parse_repo_names,
+)
+from .git_collector import branch_ref, iter_commits_git, iter_log, update_clone
+from .graphql_collector import iter_commits_graphql
+from .mailer import (
+    SmtpMailer,
+    compose_message,
+    parse_addresses,
+    parse_routes,
+    recipients_for,
+)
+from .profiling import RunProfile
+from .rendering import RenderedReport, ReportRenderer, parse_templates
+from .request_scheduler import RequestScheduler, iter_commits_conditional
+from .resilience import CircuitBreaker, call_with_retry, is_transient
+from .response_cache import ResponseCache
+from .sinks import OutputReport, OutputSink, create_sinks, dispatch
 
-import markdown
-from github import Github
-from openai import OpenAI
+if TYPE_CHECKING:
+    from github.Repository import Repository
+    from openai import OpenAI
 
-from .env_check import EnvCheckError, check_env_vars
+T = TypeVar("T")
 
 
 class DailyReporter:
     """Generates and sends a daily GitHub report via email."""
 
     # pylint: disable=too-many-instance-attributes
-    def __init__(self) -> None:
+
+    # Remaining API requests below which workers pause until the rate limit resets.
+    RATE_LIMIT_RESERVE = 100
+
+    # Commits of this period are collected when there is no cursor.
+    COMMIT_WINDOW = timedelta(days=2)
+
+    OPENAI_MODEL = "gpt-4.1-nano"
+    OPENAI_TEMPERATURE = 0.4
+
+    def __init__(self) -> None:  # pylint: disable=too-many-statements
+        self.profile = RunProfile()
+        # Shares the client and repositories validated by check_env_vars.
+        self.session = GithubSession()
         try:
-            env = check_env_vars()
+            with self.profile.stage("env_check"):
+                options = check_optional_env_vars()
+                # Attached to the client as soon as it is created, so the
+                # requests of the validation are paced as well.
+                self.scheduler = RequestScheduler(
+                    self.RATE_LIMIT_RESERVE, options["GITHUB_CACHE_DIR"]
+                )
+                self.session.on_connect = self.scheduler.attach
+                env = check_env_vars(
+                    session=self.session,
+                    probe=not env_flag(options["SKIP_REPO_CHECK"]),
+                )
         except EnvCheckError as exc:
             github_output = os.environ.get("GITHUB_OUTPUT")
             if github_output:  # pragma: no cover
@@ -67,91 +175,626 @@ class DailyReporter:
         self.openai_api_key: str = env["OPENAI_API_KEY"]
         self.smtp_server: str = env["SMTP_SERVER"]
         self.smtp_port: int = int(env["SMTP_PORT"])
+        self.email_receivers: list[str] = parse_addresses(self.email_receiver)
+        self.email_routes = parse_routes(options["EMAIL_ROUTES"])
+        self.mailer: SmtpMailer | None = None
+        # Bounds every SMTP operation, so a hanging server cannot outlast the
+        # timeout of the email sink.
+        self.smtp_timeout = float(options["SINK_TIMEOUT"])
+        self.renderer = ReportRenderer(parse_templates(options["EMAIL_TEMPLATES"]))
+        self.sinks = create_sinks(options, self._email_report)
+        self.repo_names: list[str] = parse_repo_names(self.repo_name)
+        self.repo_topic: str = options["REPO_TOPIC"]
+        self.max_workers: int = int(options["MAX_WORKERS"])
+        self.prompt_token_budget: int = int(options["PROMPT_TOKEN_BUDGET"])
+        self.collector_backend: str = options["COLLECTOR_BACKEND"]
+        self.git_clone_dir: str = options["GIT_CLONE_DIR"]
+        self.commit_path: str = options["COMMIT_PATH"]
+        self.collect_activity_enabled: bool = env_flag(options["COLLECT_ACTIVITY"])
+        self.branch_patterns = parse_patterns(options["BRANCHES"])
+        # Newest collected commit per branch of each repository (lowercased name),
+        # recorded as branch cursors once the report has been delivered.
+        self._branch_heads: dict[str, dict[str, CommitRecord]] = {}
+        self.commit_filter = CommitFilter.from_options(
+            options, skip_merges=env_flag(options["SKIP_MERGE_COMMITS"])
+        )
+        self.response_cache = self._response_cache(options)
+        self.commit_memo: bool = env_flag(options["COMMIT_MEMO"])
+        self.openai_stream: bool = env_flag(options["OPENAI_STREAM"])
+        self.openai_timeout: float = float(options["OPENAI_TIMEOUT"])
+        self.openai_metrics: list[dict[str, Any]] = []
+        self.cursor_store = (
+            CursorStore(
+                options["CURSOR_STORE"],
+                timedelta(hours=int(options["CURSOR_OVERLAP_HOURS"])),
+            )
+            if options["CURSOR_STORE"]
+            else None
+        )
+        self.profile_file: str = options["PROFILE_FILE"]
+        self.service_retries: int = int(options["SERVICE_RETRIES"])
+        self.breakers = {
+            service: CircuitBreaker(service, int(options["CIRCUIT_BREAKER_THRESHOLD"]))
+            for service in ("github", "openai", "smtp")
+        }
+        self.checkpoint_dir: str = options["CHECKPOINT_DIR"]
+        # Created by run_pipeline for the day of the run.
+        self.checkpoints: CheckpointStore | None = None
 
-        self.client = OpenAI(api_key=self.openai_api_key)
-        self.github = Github(self.github_token)
-        self.repo = self.github.get_repo(self.repo_name)
+        # Created on first use, so runs that stop before the analysis never
+        # import the openai package.
+        self._client: "OpenAI | None" = None
+        self._client_lock = threading.Lock()
+        self.github = self.session.connect(self.github_token)
+        # The validation may have connected the session without the hook.
+        self.scheduler.attach(self.github)
+        self.enricher = self._diffstat_enricher(options)
+        self.repo: "Repository | None" = None
+        if self.is_single_repo():
+            self.repo = self.session.get_repo(self.repo_names[0])
 
-    def collect_commits(self) -> list[dict[str, Any]]:
-        """Collects commits from the last 2 days."""
-        since = datetime.now(timezone.utc) - timedelta(days=2)
-        commits = self.repo.get_commits(since=since)
-        commit_data: list[dict[str, Any]] = []
-        for commit in commits:
-            commit_data.append(
-                {
-                    "message": commit.commit.message,
-                    "author": commit.commit.author.name,
-                    "url": commit.html_url,
-                    "sha": commit.sha,
-                    "date": commit.commit.author.date,
-                }
+    @staticmethod
+    def _response_cache(options: dict[str, str]) -> ResponseCache | None:
+        """Returns the response cache configured by LLM_CACHE_*, if any."""
+        if not options["LLM_CACHE_DIR"]:
+            return None
+        return ResponseCache(
+            options["LLM_CACHE_DIR"],
+            max_bytes=int(options["LLM_CACHE_MAX_MB"]) * 1024 * 1024,
+            max_age=int(options["LLM_CACHE_MAX_AGE_DAYS"]) * 86400,
+        )
+
+    def _diffstat_enricher(self, options: dict[str, str]) -> DiffstatEnricher | None:
+        """Returns the diffstat enricher if COMMIT_DIFFSTAT is enabled."""
+        if not env_flag(options["COMMIT_DIFFSTAT"]):
+            return None
+        return DiffstatEnricher(
+            self.scheduler,
+            max_workers=self.max_workers,
+            max_commits=int(options["DIFFSTAT_MAX_COMMITS"]),
+            max_files=int(options["DIFFSTAT_MAX_FILES"]),
+        )
+
+    def is_single_repo(self) -> bool:
+        """Returns True if exactly one repository (and no selector) is configured."""
+        return len(self.repo_names) == 1 and not is_repo_selector(self.repo_names[0])
+
+    def resolve_repositories(self) -> list["Repository"]:
+        """Resolves the configured repository names and 'owner/*' selectors."""
+        repos: list["Repository"] = []
+        seen: set[str] = set()
+        for name in self.repo_names:
+            if is_repo_selector(name):
+                query = f"user:{name[:-2]} archived:false"
+                if self.repo_topic:
+                    query += f" topic:{self.repo_topic}"
+                candidates = list(self.github.search_repositories(query=query))
+            else:
+                candidates = [self.session.get_repo(name)]
+            for repo in candidates:
+                if repo.full_name not in seen:
+                    seen.add(repo.full_name)
+                    repos.append(repo)
+        return repos
+
+    def _guarded(
+        self,
+        service: str,
+        func: Callable[[], T],
+        retryable: Callable[[BaseException], bool] = is_transient,
+    ) -> T:
+        """Calls func through the circuit breaker of a service (github, openai or
+        smtp) and retries transient errors up to SERVICE_RETRIES times."""
+        return call_with_retry(
+            self.breakers[service], func, self.service_retries, retryable=retryable
+        )
+
+    def commit_window(
+        self, repo_name: str, branch: str = ""
+    ) -> tuple[datetime, set[str]]:
+        """Returns the date to collect commits from (the cursor date minus
+        CURSOR_OVERLAP_HOURS, or COMMIT_WINDOW ago without a cursor) and the SHAs
+        of the already reported commits for a repository and branch (an empty
+        branch is the default branch)."""
+        since = datetime.now(timezone.utc) - self.COMMIT_WINDOW
+        if self.cursor_store is None:
+            return since, set()
+        start = self.cursor_store.start(repo_name, branch)
+        return start or since, self.cursor_store.reported(repo_name)
+
+    def collect_commits(self, repo: "Repository | None" = None) -> list[CommitRecord]:
+        """Collects commits from the last 2 days, or since the stored cursor
+        minus CURSOR_OVERLAP_HOURS, newest first. With a cursor store, commits
+        reported by a previous run are skipped.
+        Commits rejected by the configured filters are dropped as they arrive.
+        With BRANCHES, the matching branches are collected as well."""
+        if repo is None:
+            repo = self.repo
+        if repo is None:
+            raise ValueError("No single repository configured; pass a repository.")
+        with self.profile.stage("github_commits"):
+            if self.branch_patterns:
+                commit_data = self._collect_branches(repo)
+            else:
+                commit_data = self._walk_branch(repo, None)
+        self.profile.count("commits", len(commit_data))
+        if self.enricher is not None:
+            with self.profile.stage("github_diffstats"):
+                self.enricher.enrich(repo, commit_data)
+        return commit_data
+
+    def _walk_branch(
+        self, repo: "Repository", branch: str | None
+    ) -> list[CommitRecord]:
+        """Collects the commits of one branch (None or an empty name for the
+        default branch) in its commit window that pass the filters."""
+        since, reported = self.commit_window(repo.full_name, branch or "")
+        commits = exclude_shas(self._iter_commits(repo, since, branch), reported)
+        return list(self.commit_filter.apply(commits))
+
+    def _active_branches(self, repo: "Repository") -> list[str]:
+        """Returns the branches matching BRANCHES, other than the default branch,
+        whose head commit lies in their commit window; the others cannot have
+        new commits, so their history is never requested."""
+        branches: list[str] = []
+        for name, head_date in iter_branches(
+            self.github, repo.full_name, self.branch_patterns
+        ):
+            if name == repo.default_branch:
+                continue
+            since, _reported = self.commit_window(repo.full_name, name)
+            if head_date is None or head_date >= since:
+                branches.append(name)
+        return branches
+
+    def _collect_branches(self, repo: "Repository") -> list[CommitRecord]:
+        """Collects the default branch and the active branches matching BRANCHES
+        concurrently. Commits reachable from several branches (shared history,
+        merges, fast-forwarded cherry-picks) are kept once, newest first."""
+        branches = ["", *self._active_branches(repo)]
+        if self.collector_backend == "git":
+            # One fetch for all branches; the walks then read the local refs.
+            update_clone(
+                repo.clone_url,
+                self._clone_path(repo.full_name),
+                self.github_token,
+                with_trees=bool(self.commit_path),
+                branches=branches[1:],
             )
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(branches))
+        ) as pool:
+            walks = list(pool.map(lambda b: self._walk_branch(repo, b), branches))
+        self._branch_heads[repo.full_name.lower()] = {
+            branch: walk[0] for branch, walk in zip(branches, walks) if walk
+        }
+        seen: set[str] = set()
+        commit_data: list[CommitRecord] = []
+        for walk in walks:
+            for commit in walk:
+                if commit.sha not in seen:
+                    seen.add(commit.sha)
+                    commit_data.append(commit)
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        commit_data.sort(key=lambda c: c.date or oldest, reverse=True)
         return commit_data
 
-    def analyze_commits_with_gpt(self, commits: list[dict[str, Any]]) -> str:
-        """Analyzes commits using OpenAI GPT and returns a Markdown summary."""
-        if not commits:
-            return "No commits in the last 24 hours."
+    def _iter_commits(
+        self, repo: "Repository", since: datetime, branch: str | None = None
+    ) -> Iterator[CommitRecord]:
+        """Yields the commits of a repository's default branch (or the given
+        branch) since the given date from the configured collector backend,
+        page by page. For the git backend, a branch other than None is read from
+        the clone that _collect_branches updated."""
+        if self.collector_backend == "graphql":
+            yield from iter_commits_graphql(
+                self.github, repo.full_name, since, self.commit_path, branch or ""
+            )
+        elif self.collector_backend == "git" and branch is not None:
+            yield from iter_log(
+                self._clone_path(repo.full_name),
+                since,
+                repo.html_url,
+                self.commit_path,
+                branch_ref(branch),
+            )
+        elif self.collector_backend == "git":
+            yield from iter_commits_git(
+                repo,
+                self._clone_path(repo.full_name),
+                since,
+                token=self.github_token,
+                commit_path=self.commit_path,
+            )
+        elif self.scheduler.cache is not None:
+            yield from iter_commits_conditional(
+                self.scheduler, repo.full_name, since, self.commit_path, branch or ""
+            )
+        else:
+            arguments: dict[str, Any] = {"since": since}
+            if self.commit_path:
+                arguments["path"] = self.commit_path
+            if branch:
+                arguments["sha"] = branch
+            commits = repo.get_commits(**arguments)
+            for commit in commits:
+                yield CommitRecord(
+                    sha=commit.sha,
+                    message=commit.commit.message,
+                    author=commit.commit.author.name,
+                    url=commit.html_url,
+                    date=commit.commit.author.date,
+                    is_merge=len(commit.parents) > 1,
+                )
+
+    def _collect_activity(self, repo: "Repository") -> list[ActivityEvent]:
+        """Collects the pull request, review and issue events of the commit
+        window if COLLECT_ACTIVITY is enabled, otherwise returns no events."""
+        if not self.collect_activity_enabled:
+            return []
+        since, _reported = self.commit_window(repo.full_name)
+        with self.profile.stage("github_activity"):
+            events = self._guarded(
+                "github",
+                lambda: list(iter_activity_graphql(self.github, repo.full_name, since)),
+            )
+        self.profile.count("activity_events", len(events))
+        return events
 
-        formatted = "\n".join(
-            f"- [{c['sha'][:7]}] {c['message']} ({c['author']})" for c in commits
+    def _clone_path(self, repo_name: str) -> str:
+        """Returns the path of the local clone of a repository (git backend)."""
+        owner, name = repo_name.lower().split("/", 1)
+        return os.path.join(
+            self.git_clone_dir,
+            self.sanitize_filename(owner),
+            self.sanitize_filename(name) + ".git",
         )
-        prompt = f"""
-Here is a list of Git commits:
-{formatted}
 
-Create a daily summary in Markdown.
-Analyze possible issues, TODOs, or code smells and provide recommendations.
-"""
+    def collect_targets(self) -> list[tuple[str, "Repository"]]:
+        """Returns the repositories to report on as (name, repository) pairs."""
+        if self.repo is not None:
+            return [(self.repo_names[0], self.repo)]
+        return [(repo.full_name, repo) for repo in self.resolve_repositories()]
+
+    def _collect_repository(self, repo: "Repository") -> list[CommitRecord]:
+        """Collects the commits of one repository; every GitHub request waits for
+        the rate limit through the scheduler. A collection that fails with a
+        transient error is retried as a whole."""
+        return self._guarded("github", lambda: self.collect_commits(repo))
+
+    def _openai(self) -> "OpenAI":
+        """Returns the OpenAI client, creating it on first use."""
+        with self._client_lock:
+            if self._client is None:
+                from openai import OpenAI  # pylint: disable=import-outside-toplevel
+
+                # Retries are left to _guarded, which shares the circuit breaker
+                # and SERVICE_RETRIES with the other services.
+                self._client = OpenAI(api_key=self.openai_api_key, max_retries=0)
+            return self._client
+
+    def _openai_retryable(self, exc: BaseException) -> bool:
+        """Returns whether an OpenAI error (including timeouts) is transient."""
+        from openai import APIConnectionError  # pylint: disable=import-outside-toplevel
+
+        return isinstance(exc, APIConnectionError) or is_transient(exc)
+
+    def _stream_retryable(self, exc: BaseException) -> bool:
+        """Like _openai_retryable, but a timeout of a streamed completion keeps
+        the partial report instead of being retried."""
+        from openai import APITimeoutError  # pylint: disable=import-outside-toplevel
+
+        return not isinstance(exc, APITimeoutError) and self._openai_retryable(exc)
+
+    def complete(self, prompt: str, stream_path: str | None = None) -> str | None:
+        """Sends a prompt to the OpenAI chat model and returns the stripped answer,
+        or None if the response was empty. Answers are served from and stored in
+        the response cache if one is configured. With OPENAI_STREAM and a
+        stream_path (the final report), the answer is streamed and written to
+        that file as it arrives; the intermediate map, merge and notes prompts
+        are always sent as plain requests, so their answers are never truncated."""
+        cache = self.response_cache
+        key = ""
+        if cache is not None:
+            key = ResponseCache.make_key(
+                self.OPENAI_MODEL, str(self.OPENAI_TEMPERATURE), prompt.strip()
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                self.profile.count("openai_cache_hits")
+                return cached
+
+        self.profile.count("openai_requests")
+        if self.openai_stream and stream_path is not None:
+            content, finished = self._stream_completion(prompt, stream_path)
+        else:
+            with self.profile.stage("openai_request"):
+                response = self._guarded(
+                    "openai",
+                    lambda: self._openai().chat.completions.create(
+                        **self._request_body(prompt)
+                    ),
+                    self._openai_retryable,
+                )
+            self._record_usage(response.usage)
+            self._record_response_bytes(response)
+            content, finished = response.choices[0].message.content, True
+        if content is None:
+            return None
+        content = content.strip()
+        if cache is not None and finished:
+            cache.set(key, content)
+        return content
+
+    def _stream_completion(
+        self, prompt: str, stream_path: str
+    ) -> tuple[str | None, bool]:
+        """Streams a completion until it ends or OPENAI_TIMEOUT expires and returns
+        the (possibly partial) answer and whether it is complete. Time to first
+        token and total generation time are recorded in openai_metrics."""
+        from openai import APITimeoutError  # pylint: disable=import-outside-toplevel
+
+        started = time.monotonic()
+        deadline = started + self.openai_timeout
+        first_token: float | None = None
+        parts: list[str] = []
+        finished = True
+        with ExitStack() as stack:
+            sink = stack.enter_context(open(stream_path, "w", encoding="utf-8"))
+            try:
+                stream = self._guarded(
+                    "openai",
+                    lambda: self._openai().chat.completions.create(
+                        **self._request_body(
+                            prompt, stream=True, stream_options={"include_usage": True}
+                        ),
+                        timeout=self.openai_timeout,
+                    ),
+                    self._stream_retryable,
+                )
+                stack.callback(stream.close)
+                for chunk in stream:
+                    # The last chunk carries the token usage and no choices.
+                    self._record_usage(getattr(chunk, "usage", None))
+                    self._record_response_bytes(chunk)
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        if first_token is None:
+                            first_token = time.monotonic() - started
+                        parts.append(delta)
+                        sink.write(delta)
+                        sink.flush()
+                    if time.monotonic() > deadline:
+                        finished = False
+                        break
+            except APITimeoutError:
+                finished = False
+
+        self._record_stream_metrics(started, first_token, finished)
+        if not parts:
+            return None, finished
+        content = "".join(parts)
+        if not finished:
+            content += (
+                "\n\n_⚠️ Report truncated: the OpenAI response exceeded "
+                f"{self.openai_timeout}s._"
+            )
+        return content, finished
+
+    def _request_body(self, prompt: str, **options: Any) -> dict[str, Any]:
+        """Returns the body of a chat completion request for a prompt and counts
+        its size as JSON in the run profile (once per attempt)."""
+        body = {
+            "model": self.OPENAI_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": self.OPENAI_TEMPERATURE,
+            **options,
+        }
+        self.profile.count("openai_request_bytes", len(json.dumps(body).encode()))
+        return body
+
+    def _record_response_bytes(self, response: Any) -> None:
+        """Adds the size of an OpenAI response (or stream chunk) as compact JSON
+        to the run profile."""
+        dump = getattr(response, "model_dump_json", None)
+        data = dump() if callable(dump) else None
+        if isinstance(data, str):
+            self.profile.count("openai_response_bytes", len(data.encode()))
 
-        response = self.client.chat.completions.create(
-            model="gpt-4.1-nano",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.4,
+    def _record_usage(self, usage: Any) -> None:
+        """Adds the token usage of an OpenAI response to the run profile."""
+        for field in ("prompt_tokens", "completion_tokens"):
+            tokens = getattr(usage, field, None)
+            if isinstance(tokens, int):
+                self.profile.count(f"openai_{field}", tokens)
+
+    def _record_stream_metrics(
+        self, started: float, first_token: float | None, finished: bool
+    ) -> None:
+        """Records and logs the timings of a streamed completion."""
+        metrics = {
+            "time_to_first_token": first_token,
+            "generation_time": time.monotonic() - started,
+            "finished": finished,
+        }
+        self.openai_metrics.append(metrics)
+        self.profile.record("openai_stream", metrics["generation_time"])
+        if first_token is not None:
+            self.profile.record("openai_first_token", first_token)
+        suffix = "" if finished else " (timed out)"
+        print(
+            f"⏱️ OpenAI stream: first token after {first_token or 0:.2f}s, "
+            f"finished after {metrics['generation_time']:.2f}s{suffix}",
+            file=sys.stderr,
         )
-        content = response.choices[0].message.content
+
+    def complete_all(self, prompts: list[str]) -> list[str]:
+        """Sends several prompts concurrently and returns the non-empty answers
+        in prompt order."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return [content for content in pool.map(self.complete, prompts) if content]
+
+    def reduce_summaries(
+        self,
+        partials: list[str],
+        stream_path: str | None = None,
+        subject: str = COMMITS_SUBJECT,
+    ) -> str | None:
+        """Reduces partial summaries into the final Markdown report. Partials that
+        exceed the token budget together are merged in batches first."""
+        if not partials:
+            return None
+        budget = max(self.prompt_token_budget - estimate_tokens(REDUCE_PROMPT), 1)
+        chunks = chunk_by_tokens(partials, budget)
+        while len(chunks) > 1:
+            merged = self.complete_all(
+                [
+                    MERGE_PROMPT.format(subject=subject, formatted="\n\n".join(chunk))
+                    for chunk in chunks
+                ]
+            )
+            merged_chunks = chunk_by_tokens(merged, budget)
+            if not merged or len(merged_chunks) >= len(chunks):
+                # Merging no longer shrinks the input; reduce what we have.
+                break
+            chunks = merged_chunks
+        formatted = "\n\n".join(item for chunk in chunks for item in chunk)
+        return self.complete(
+            REDUCE_PROMPT.format(subject=subject, formatted=formatted), stream_path
+        )
+
+    def annotate_commits(
+        self, commits: list[CommitRecord], cache: ResponseCache
+    ) -> list[str]:
+        """Returns one note line per commit. Notes are memoized by commit SHA;
+        only commits without a cached note are sent to the model, in batches."""
+        notes: dict[str, str] = {}
+        unseen: list[CommitRecord] = []
+        for commit in commits:
+            note = cache.get(
+                ResponseCache.make_key("note", self.OPENAI_MODEL, commit.sha)
+            )
+            if note is None:
+                unseen.append(commit)
+            else:
+                notes[commit.sha] = note
+
+        if unseen:
+            budget = max(self.prompt_token_budget - estimate_tokens(NOTES_PROMPT), 1)
+            chunks = chunk_by_tokens([format_commit(c) for c in unseen], budget)
+            answers = self.complete_all(
+                [NOTES_PROMPT.format(formatted="\n".join(chunk)) for chunk in chunks]
+            )
+            for answer in answers:
+                for sha, note in parse_commit_notes(answer, unseen).items():
+                    cache.set(
+                        ResponseCache.make_key("note", self.OPENAI_MODEL, sha), note
+                    )
+                    notes[sha] = note
+
+        # Commits the model skipped are passed on with their original message.
+        return [format_commit(c, notes.get(c.sha)) for c in commits]
+
+    def summarize_commits(
+        self,
+        commits: list[CommitRecord],
+        stream_path: str | None = None,
+        activity: list[str] | None = None,
+    ) -> str | None:
+        """Summarizes commits, followed by the given activity lines, in one prompt,
+        or in concurrent batches reduced into one report if the list exceeds
+        PROMPT_TOKEN_BUDGET."""
+        lines = [format_commit(c) for c in commits] + (activity or [])
+        subject = ACTIVITY_SUBJECT if activity else COMMITS_SUBJECT
+        budget = max(self.prompt_token_budget - estimate_tokens(CHUNK_PROMPT), 1)
+        chunks = chunk_by_tokens(lines, budget)
+        if len(chunks) == 1:
+            return self.complete(
+                SUMMARY_PROMPT.format(subject=subject, formatted="\n".join(lines)),
+                stream_path,
+            )
+        prompts = [
+            CHUNK_PROMPT.format(
+                subject=subject,
+                part=part,
+                parts=len(chunks),
+                formatted="\n".join(chunk),
+            )
+            for part, chunk in enumerate(chunks, start=1)
+        ]
+        return self.reduce_summaries(self.complete_all(prompts), stream_path, subject)
+
+    def analyze_commits_with_gpt(
+        self,
+        commits: list[CommitRecord],
+        stream_path: str | None = None,
+        events: list[ActivityEvent] | None = None,
+    ) -> str:
+        """Analyzes commits, and pull request and issue events if given, using
+        OpenAI GPT and returns a Markdown summary. In streaming mode the final
+        report is written to stream_path as it is generated."""
+        if not commits and not events:
+            return "No commits in the last 24 hours."
+
+        activity = [format_event(e) for e in events or []]
+        with self.profile.stage("analyze"):
+            if self.commit_memo and self.response_cache is not None:
+                notes = self.annotate_commits(commits, self.response_cache)
+                content = self.reduce_summaries(
+                    notes + activity,
+                    stream_path,
+                    ACTIVITY_SUBJECT if activity else COMMITS_SUBJECT,
+                )
+            else:
+                content = self.summarize_commits(commits, stream_path, activity)
         if content is not None:
-            return content.strip()
+            return content
         return "No summary generated (response was empty)."
 
-    def send_email(self, subject: str, body_md: str) -> None:
-        """Sends an email with the report as HTML and Markdown attachment."""
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = self.email_sender
-        msg["To"] = self.email_receiver
-
-        html_body = markdown.markdown(body_md)
-        if not html_body:
-            raise ValueError("Failed to convert Markdown to HTML.")
-
-        html = f"""\
-<html>
-  <body>
-    {html_body}
-  </body>
-</html>
-"""
+    def _open_mailer(self) -> SmtpMailer:
+        """Returns a mailer for the configured SMTP server; the connection is
+        opened on the first message and reused for all following ones."""
+        mailer = SmtpMailer(
+            self.smtp_server, self.smtp_port, self.email_user, self.email_password
+        )
+        mailer.profile = self.profile
+        mailer.timeout = self.smtp_timeout
+        return mailer
 
-        part1 = MIMEText(body_md, "plain")
-        part2 = MIMEText(html, "html")
-        msg.attach(part1)
-        msg.attach(part2)
-
-        attachment = MIMEApplication(body_md.encode("utf-8"), Name="report.md")
-        attachment["Content-Disposition"] = 'attachment; filename="report.md"'
-        msg.attach(attachment)
-
-        with smtplib.SMTP(self.smtp_server, port=self.smtp_port) as server:
-            server.ehlo()
-            server.starttls()
-            if not self.email_password:
-                raise ValueError(
-                    "EMAIL_PASSWORD environment variable is not set or is empty."
-                )
-            server.login(self.email_user, self.email_password)
-            server.sendmail(self.email_sender, self.email_receiver, msg.as_string())
+    def send_email(
+        self,
+        subject: str,
+        body_md: str,
+        recipients: list[str] | None = None,
+        rendered: RenderedReport | None = None,
+    ) -> None:
+        """Sends an email with the report as HTML and Markdown attachment.
+        Uses the shared SMTP connection of a running pipeline if there is one,
+        and the already rendered report if one is passed. Transient SMTP errors
+        are retried."""
+        if recipients is None:
+            recipients = self.email_receivers
+        if rendered is None:
+            with self.profile.stage("render_markdown"):
+                rendered = self.renderer.render(body_md, subject)
+        message = compose_message(
+            {
+                "Subject": subject,
+                "From": self.email_sender,
+                "To": ", ".join(recipients),
+            },
+            rendered.mime_body(),
+        )
+        self.profile.count("email_bytes", len(message))
+        with self.profile.stage("smtp_send"):
+            self._guarded("smtp", lambda: self._send_message(recipients, message))
+
+    def _send_message(self, recipients: list[str], message: bytes) -> None:
+        if self.mailer is not None:
+            self.mailer.send(self.email_sender, recipients, message)
+            return
+        with self._open_mailer() as mailer:
+            mailer.send(self.email_sender, recipients, message)
 
     @staticmethod
     def sanitize_filename(filename: str) -> str:
@@ -161,34 +804,214 @@ Analyze possible issues, TODOs, or code smells and provide recommendations.
         filename = re.sub(r"[^a-zA-Z0-9_\-\.]", "_", filename)
         return filename
 
-    def run(self) -> None:
-        """Runs the report generation and email sending process."""
-        try:
-            today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-            # Sanitize repo_name for filename to prevent path injection
-            safe_repo_name = self.sanitize_filename(self.repo_name.replace("/", "-"))
-            filename = f"{today}-{safe_repo_name}.md"
-            os.environ["DAILY_REPORT_FILENAME"] = filename
+    @classmethod
+    def _report_filename(cls, repo_name: str, today: str) -> str:
+        """Returns the report file name of a repository."""
+        # Sanitize repo_name for filename to prevent path injection
+        safe_repo_name = cls.sanitize_filename(repo_name.replace("/", "-"))
+        return f"{today}-{safe_repo_name}.md"
 
-            subject = f"GitHub Daily Report – {self.repo_name} – {today}"
+    @staticmethod
+    def combine_reports(reports: dict[str, str]) -> str:
+        """Combines the reports of several repositories under one heading each."""
+        if len(reports) == 1:
+            return next(iter(reports.values()))
+        return "\n\n".join(
+            f"# {repo_name}\n\n{report}" for repo_name, report in reports.items()
+        )
+
+    def _email_report(self, report: OutputReport) -> None:
+        """Sends a report to the recipients of its repository (email sink)."""
+        recipients = recipients_for(
+            report.repo_name, self.email_receivers, self.email_routes
+        )
+        self.send_email(report.subject, report.markdown, recipients, report.rendered)
+
+    async def _deliver_report(
+        self,
+        repo_name: str,
+        commit_data: list[CommitRecord],
+        report_md: str,
+        today: str,
+    ) -> None:
+        """Delivers the report of one repository to all per-report sinks
+        concurrently, except those it was delivered to before a failure, then
+        advances the repository's cursor."""
+        filename = self._report_filename(repo_name, today)
+        os.environ["DAILY_REPORT_FILENAME"] = filename
+
+        subject = f"GitHub Daily Report – {repo_name} – {today}"
+        report = OutputReport(repo_name, subject, report_md, filename)
+        delivered = set(self._checkpoint(repo_name).get("delivered", []))
+        sinks = [
+            sink
+            for sink in self.sinks
+            if not sink.per_run and sink.name not in delivered
+        ]
+        if any(sink.needs_rendered for sink in sinks):
+            report.rendered = await asyncio.to_thread(
+                self.profile.call,
+                "render_markdown",
+                self.renderer.render,
+                report_md,
+                subject,
+                repo_name,
+            )
+
+        def on_delivered(sink: OutputSink) -> None:
+            delivered.add(sink.name)
+            self._save_checkpoint(repo_name, delivered=sorted(delivered))
 
-            commit_data = self.collect_commits()
-            report_md = self.analyze_commits_with_gpt(commit_data)
-            self.send_email(subject, report_md)
+        await dispatch(sinks, report, self.profile, on_delivered)
 
-            # Save report to file (safe filename)
-            with open(filename, "w", encoding="utf-8") as reportfile:
-                reportfile.write(report_md)
+        heads = self._branch_heads.pop(repo_name.lower(), None)
+        if self.cursor_store is not None and commit_data:
+            for branch, newest in (heads or {"": commit_data[0]}).items():
+                self.cursor_store.advance(repo_name, newest.sha, newest.date, branch)
+            self.cursor_store.mark_reported(
+                repo_name, ((c.sha, c.date) for c in commit_data)
+            )
+
+    async def run_pipeline(self, today: str) -> dict[str, str]:
+        """
+        Runs collection, analysis and delivery for all repositories and returns the
+        reports keyed by repository name.
+
+        Each repository moves on to analysis as soon as its commits are collected
+        and to delivery as soon as its report is ready; at most MAX_WORKERS
+        repositories are collected or analyzed at the same time. The Actions output
+        is written while the emails are still being sent. All emails are delivered
+        over one SMTP connection. With CHECKPOINT_DIR, the completed stages of
+        each repository are checkpointed, and a rerun on the same day resumes
+        from them.
+        """
+        if self.checkpoint_dir:
+            self.checkpoints = CheckpointStore(self.checkpoint_dir, today)
+            self.checkpoints.remove_stale()
+        with self._open_mailer() as self.mailer:
+            try:
+                return await self._run_stages(today)
+            finally:
+                self.mailer = None
+
+    async def _run_stages(self, today: str) -> dict[str, str]:
+        """Runs the pipeline stages of run_pipeline."""
+        targets = await asyncio.to_thread(self.collect_targets)
+        semaphore = asyncio.Semaphore(self.max_workers)
+        # Reports are only streamed into the file that the file sink writes.
+        stream_to_file = any(sink.name == "file" for sink in self.sinks)
+        deliveries: list[asyncio.Task[None]] = []
+
+        async def analyze(repo_name: str, repo: "Repository") -> str:
+            checkpoint = self._checkpoint(repo_name)
+            async with semaphore:
+                if "commits" in checkpoint:
+                    self.profile.count("checkpoint_resumes")
+                    commit_data, events, heads = CheckpointStore.collection(checkpoint)
+                    if heads:
+                        self._branch_heads[repo_name.lower()] = heads
+                else:
+                    commit_data, events = await asyncio.gather(
+                        asyncio.to_thread(self._collect_repository, repo),
+                        asyncio.to_thread(self._collect_activity, repo),
+                    )
+                    if self.checkpoints is not None:
+                        self.checkpoints.save_collection(
+                            repo_name,
+                            commit_data,
+                            events,
+                            self._branch_heads.get(repo_name.lower(), {}),
+                        )
+                report_md = checkpoint.get("report")
+                if report_md is None:
+                    report_md = await asyncio.to_thread(
+                        self.analyze_commits_with_gpt,
+                        commit_data,
+                        (
+                            self._report_filename(repo_name, today)
+                            if stream_to_file
+                            else None
+                        ),
+                        events,
+                    )
+                    self._save_checkpoint(repo_name, report=report_md)
+                else:
+                    self.profile.count("checkpoint_resumes")
+            deliveries.append(
+                asyncio.create_task(
+                    self._deliver_report(repo_name, commit_data, report_md, today)
+                )
+            )
+            return report_md
 
-            # Provide output for GitHub Actions
+        results = await asyncio.gather(*(analyze(name, repo) for name, repo in targets))
+        reports = {name: report for (name, _), report in zip(targets, results)}
+        await dispatch(
+            [sink for sink in self.sinks if sink.per_run],
+            OutputReport(
+                "", f"GitHub Daily Report – {today}", self.combine_reports(reports)
+            ),
+            self.profile,
+        )
+        await asyncio.gather(*deliveries)
+        return reports
+
+    def _checkpoint(self, repo_name: str) -> dict[str, Any]:
+        """Returns the checkpoint of a repository (empty without CHECKPOINT_DIR)."""
+        if self.checkpoints is None:
+            return {}
+        return self.checkpoints.load(repo_name)
+
+    def _save_checkpoint(self, repo_name: str, **values: Any) -> None:
+        """Adds completed stages to the checkpoint of a repository."""
+        if self.checkpoints is not None:
+            self.checkpoints.update(repo_name, **values)
+
+    def _write_profile(self) -> None:
+        """Writes the run profile to PROFILE_FILE (if set) and as the `profile`
+        output for GitHub Actions. A failure to write it only prints a warning."""
+        self.profile.extra["openai_streams"] = self.openai_metrics
+        self.profile.extra["github_requests"] = dict(self.scheduler.stats)
+        retries = {name: breaker.retries for name, breaker in self.breakers.items()}
+        for sink in self.sinks:
+            retries[f"sink_{sink.name}"] = sink.breaker.retries
+        self.profile.extra["retries"] = retries
+        try:
+            if self.profile_file:
+                self.profile.save(self.profile_file)
             github_output = os.environ.get("GITHUB_OUTPUT")
             if github_output:  # pragma: no cover
                 with open(github_output, "a", encoding="utf-8") as fh:
-                    print(f"report<<EOF\n{report_md}\nEOF", file=fh)
+                    fh.write(f"profile={self.profile.to_json()}\n")
+        except OSError as exc:
+            print(f"⚠️ Warning: Could not write run profile: {exc}", file=sys.stderr)
+
+    @staticmethod
+    def _run_errors() -> tuple[type[Exception], ...]:
+        """Returns the errors that fail a run with a failure status instead of a
+        traceback, including GitHub and OpenAI errors left after the retries.
+        Only evaluated when an error occurs, so openai is still imported lazily."""
+        # pylint: disable=import-outside-toplevel
+        from github import GithubException
+        from openai import APIError
+
+        return (ValueError, smtplib.SMTPException, OSError, GithubException, APIError)
+
+    def run(self) -> None:
+        """Runs the report generation and email sending process."""
+        try:
+            today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            with self.profile.stage("pipeline"):
+                asyncio.run(self.run_pipeline(today))
+            if self.cursor_store is not None:
+                self.cursor_store.save()
+            if self.checkpoints is not None:
+                self.checkpoints.clear()
 
             print("✅ Report generated and sent.")
-        except (ValueError, smtplib.SMTPException, OSError) as exc:
+        except self._run_errors() as exc:
             print(f"❌ Error during report generation: {exc}", file=sys.stderr)
+            self._write_profile()
             github_output = os.environ.get("GITHUB_OUTPUT")
             if github_output:  # pragma: no cover
                 with open(github_output, "a", encoding="utf-8") as fh:
@@ -201,6 +1024,7 @@ Analyze possible issues, TODOs, or code smells and provide recommendations.
                 )
             sys.exit(1)
         else:
+            self._write_profile()
             github_output = os.environ.get("GITHUB_OUTPUT")
             if github_output:  # pragma: no cover
                 with open(github_output, "a", encoding="utf-8") as fh:
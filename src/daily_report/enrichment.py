@@ -0,0 +1,110 @@
+"""
+enrichment.py
+
+This module provides the DiffstatEnricher class, which adds a compact diffstat
+(total additions and deletions plus the largest changed files) to collected
+commits, so the analysis can judge the size and spread of a change instead of
+the commit message alone. Listing endpoints do not return file statistics, so
+each commit needs one extra request; these requests run concurrently with a
+bounded number of slots, are capped per repository, and their results are
+cached by SHA because a commit's diffstat never changes.
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from .commit_record import CommitRecord
+from .request_scheduler import RequestScheduler
+from .response_cache import ResponseCache
+
+if TYPE_CHECKING:
+    from github.Repository import Repository
+
+# Number of files GitHub includes in a single commit response; reading more
+# would cost further requests.
+FILES_PER_RESPONSE = 300
+
+
+def format_diffstat(
+    additions: int, deletions: int, files: list[tuple[str, int, int]], more: bool
+) -> str:
+    """Formats a diffstat as '+12 -3: src/a.py +10 -2, tests/b.py +2 -1, …'."""
+    summary = f"+{additions} -{deletions}"
+    if not files:
+        return summary
+    listed = ", ".join(f"{name} +{added} -{deleted}" for name, added, deleted in files)
+    return f"{summary}: {listed}{', …' if more else ''}"
+
+
+class DiffstatEnricher:
+    """Fetches and caches the diffstats of commits with bounded concurrency."""
+
+    def __init__(
+        self,
+        scheduler: RequestScheduler,
+        max_workers: int,
+        max_commits: int,
+        max_files: int,
+    ) -> None:
+        self.scheduler = scheduler
+        self.max_workers = max_workers
+        self.max_commits = max_commits
+        self.max_files = max_files
+        # Shared by all repositories, so fan-out does not multiply the requests
+        # in flight.
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    @property
+    def cache(self) -> ResponseCache | None:
+        """The cache for diffstats (the GitHub response cache, if configured)."""
+        return self.scheduler.cache
+
+    def enrich(self, repo: "Repository", commits: list[CommitRecord]) -> None:
+        """Sets the diffstat of the newest max_commits commits in place."""
+        todo: list[CommitRecord] = []
+        for commit in commits[: self.max_commits]:
+            cached = self.cache.get(self._key(commit.sha)) if self.cache else None
+            if cached is not None:
+                commit.diffstat = cached
+            else:
+                todo.append(commit)
+        if not todo:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(todo))) as pool:
+            diffstats = list(pool.map(lambda c: self._fetch(repo, c.sha), todo))
+        for commit, diffstat in zip(todo, diffstats):
+            if diffstat is None:
+                continue
+            commit.diffstat = diffstat
+            if self.cache is not None:
+                self.cache.set(self._key(commit.sha), diffstat)
+
+    def _key(self, sha: str) -> str:
+        return ResponseCache.make_key("diffstat", str(self.max_files), sha)
+
+    def _fetch(self, repo: "Repository", sha: str) -> str | None:
+        """Fetches the diffstat of one commit; returns None if that fails."""
+        # pylint: disable-next=import-outside-toplevel
+        from github.GithubException import GithubException
+
+        with self._slots:
+            try:
+                commit = repo.get_commit(sha)
+                files = list(islice(commit.files, FILES_PER_RESPONSE))
+                stats = commit.stats
+            except GithubException as exc:
+                print(
+                    f"⚠️ Warning: No diffstat for {repo.full_name}@{sha[:7]}: {exc}",
+                    file=sys.stderr,
+                )
+                return None
+        largest = sorted(files, key=lambda f: f.changes, reverse=True)[: self.max_files]
+        return format_diffstat(
+            stats.additions,
+            stats.deletions,
+            [(f.filename, f.additions, f.deletions) for f in largest],
+            more=len(files) > self.max_files,
+        )
@@ -6,12 +6,114 @@ It defines a custom exception (EnvCheckError) and a function (check_env_vars) th
 checks for the presence and plausibility of all required environment variables for
 GitHub, email, and OpenAI integration. If any variable is missing or invalid, an
 EnvCheckError is raised with a detailed message.
+
+Optional tuning variables are read by check_optional_env_vars, which falls back
+to the defaults in OPTIONAL_ENV_DEFAULTS for every variable that is not set.
+
+The GitHub client and the repositories looked up by the plausibility check are kept
+in a GithubSession, which the caller can pass in to reuse them afterwards.
 """
 
 import os
+import re
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from .mailer import parse_routes
+from .rendering import parse_templates
+from .sinks import REQUIRED_SINK_OPTIONS, SINK_NAMES, parse_sinks
+
+if TYPE_CHECKING:
+    from github import Github
+    from github.Repository import Repository
+
+# Optional environment variables and their default values.
+OPTIONAL_ENV_DEFAULTS: dict[str, str] = {
+    "REPO_TOPIC": "",
+    "MAX_WORKERS": "4",
+    "CURSOR_STORE": "",
+    "CURSOR_OVERLAP_HOURS": "24",
+    "COLLECTOR_BACKEND": "rest",
+    "SKIP_REPO_CHECK": "false",
+    "PROMPT_TOKEN_BUDGET": "8000",
+    "LLM_CACHE_DIR": "",
+    "LLM_CACHE_MAX_MB": "50",
+    "LLM_CACHE_MAX_AGE_DAYS": "7",
+    "COMMIT_MEMO": "false",
+    "EMAIL_ROUTES": "",
+    "EMAIL_TEMPLATES": "",
+    "OPENAI_STREAM": "false",
+    "OPENAI_TIMEOUT": "300",
+    "GITHUB_CACHE_DIR": "",
+    "GIT_CLONE_DIR": ".daily-report/git",
+    "INCLUDE_AUTHORS": "",
+    "EXCLUDE_AUTHORS": "",
+    "SKIP_MERGE_COMMITS": "false",
+    "EXCLUDE_MESSAGE_PATTERN": "",
+    "COMMIT_PATH": "",
+    "COMMIT_DIFFSTAT": "false",
+    "DIFFSTAT_MAX_COMMITS": "50",
+    "DIFFSTAT_MAX_FILES": "5",
+    "COLLECT_ACTIVITY": "false",
+    "PROFILE_FILE": "",
+    "BRANCHES": "",
+    "OUTPUT_SINKS": "email, file, github_output",
+    "SINK_TIMEOUT": "60",
+    "SINK_RETRIES": "2",
+    "SLACK_WEBHOOK_URL": "",
+    "TEAMS_WEBHOOK_URL": "",
+    "S3_BUCKET": "",
+    "S3_PREFIX": "",
+    "S3_ENDPOINT_URL": "",
+    "S3_REGION": "us-east-1",
+    "S3_ACCESS_KEY_ID": "",
+    "S3_SECRET_ACCESS_KEY": "",
+    "SERVICE_RETRIES": "3",
+    "CIRCUIT_BREAKER_THRESHOLD": "5",
+    "CHECKPOINT_DIR": "",
+}
+
+# Optional environment variables that must hold a positive integer.
+POSITIVE_INT_VARS: tuple[str, ...] = (
+    "MAX_WORKERS",
+    "PROMPT_TOKEN_BUDGET",
+    "LLM_CACHE_MAX_MB",
+    "LLM_CACHE_MAX_AGE_DAYS",
+    "OPENAI_TIMEOUT",
+    "DIFFSTAT_MAX_COMMITS",
+    "DIFFSTAT_MAX_FILES",
+    "SINK_TIMEOUT",
+    "CIRCUIT_BREAKER_THRESHOLD",
+)
+
+# Optional environment variables that must hold zero or a positive integer.
+NON_NEGATIVE_INT_VARS: tuple[str, ...] = (
+    "CURSOR_OVERLAP_HOURS",
+    "SINK_RETRIES",
+    "SERVICE_RETRIES",
+)
+
+# Optional environment variables restricted to a set of allowed values.
+CHOICE_VARS: dict[str, tuple[str, ...]] = {
+    "COLLECTOR_BACKEND": ("rest", "graphql", "git"),
+}
 
-from github import Github
-from github.GithubException import GithubException
+# Optional environment variables holding a boolean flag.
+BOOL_VARS: tuple[str, ...] = (
+    "SKIP_REPO_CHECK",
+    "COMMIT_MEMO",
+    "OPENAI_STREAM",
+    "SKIP_MERGE_COMMITS",
+    "COMMIT_DIFFSTAT",
+    "COLLECT_ACTIVITY",
+)
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+
+# PyGithub's default API URL; not imported from github.Consts, so validating the
+# environment does not load PyGithub.
+DEFAULT_BASE_URL = "https://api.github.com"
 
 
 class EnvCheckError(Exception):
@@ -20,10 +122,80 @@ class EnvCheckError(Exception):
     """
 
 
-def check_env_vars() -> dict[str, str]:
+def github_api_url() -> str:
+    """Returns the GitHub API URL. GitHub Actions sets GITHUB_API_URL, which
+    points to the API of a GitHub Enterprise Server (or, in the benchmarks, to a
+    local stand-in)."""
+    return (os.environ.get("GITHUB_API_URL") or DEFAULT_BASE_URL).rstrip("/")
+
+
+class GithubSession:
+    """Holds one GitHub client and caches repository lookups, so that the
+    repositories validated by check_env_vars are not fetched a second time.
+    """
+
+    def __init__(self) -> None:
+        self.client: "Github | None" = None
+        self.repos: dict[str, "Repository"] = {}
+        # Called with the client once it is created, before its first request.
+        self.on_connect: Callable[["Github"], None] | None = None
+
+    def connect(self, token: str) -> "Github":
+        """Returns the session's client, creating it (and importing PyGithub) on
+        first use."""
+        if self.client is None:
+            from github import Github  # pylint: disable=import-outside-toplevel
+
+            # Retries are left to the Daily Reporter's resilience layer
+            # (SERVICE_RETRIES), so PyGithub must not retry on its own.
+            self.client = Github(token, base_url=github_api_url(), retry=None)
+            if self.on_connect is not None:
+                self.on_connect(self.client)
+        return self.client
+
+    def get_repo(self, name: str) -> "Repository":
+        """Returns the repository, fetching it only on the first lookup."""
+        if self.client is None:
+            raise ValueError("GithubSession is not connected.")
+        if name not in self.repos:
+            self.repos[name] = self.client.get_repo(name)
+        return self.repos[name]
+
+
+def env_flag(value: str) -> bool:
+    """Interprets a boolean environment variable value."""
+    return value.strip().lower() in TRUE_VALUES
+
+
+def parse_repo_names(value: str) -> list[str]:
+    """
+    Splits a REPO_NAME value into a list of repository names.
+    Entries may be separated by commas or whitespace; duplicates are dropped
+    while keeping the original order. An entry of the form 'owner/*' selects
+    all repositories of that owner.
+    """
+    names: list[str] = []
+    for name in re.split(r"[,\s]+", value):
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def is_repo_selector(name: str) -> bool:
+    """Returns True if the repository name is an 'owner/*' selector."""
+    return name.endswith("/*")
+
+
+def check_env_vars(
+    session: GithubSession | None = None, probe: bool = True
+) -> dict[str, str]:
     """
     Checks all required environment variables and returns a dict with their names and values.
     Raises EnvCheckError if any variable is missing or invalid.
+
+    The repositories in REPO_NAME are looked up through the given session (or a
+    temporary one), so the caller can reuse client and repositories afterwards.
+    With probe=False the network plausibility check is skipped.
     """
     env = {
         "GITHUB_TOKEN": os.getenv("GITHUB_TOKEN", ""),
@@ -43,14 +215,22 @@ def check_env_vars() -> dict[str, str]:
             errors.append(f"{key} is not set.")
 
     # Plausibility checks
-    if env["REPO_NAME"] and env["GITHUB_TOKEN"]:
-        try:
-            g = Github(env["GITHUB_TOKEN"])
-            g.get_repo(env["REPO_NAME"])
-        except (AttributeError, ValueError, TypeError, GithubException) as e:
-            errors.append(
-                f"REPO_NAME '{env['REPO_NAME']}' is invalid or not accessible: {e}"
-            )
+    if probe and env["REPO_NAME"] and env["GITHUB_TOKEN"]:
+        # pylint: disable-next=import-outside-toplevel
+        from github.GithubException import GithubException
+
+        if session is None:
+            session = GithubSession()
+        session.connect(env["GITHUB_TOKEN"])
+        for repo_name in parse_repo_names(env["REPO_NAME"]):
+            if is_repo_selector(repo_name):
+                continue
+            try:
+                session.get_repo(repo_name)
+            except (AttributeError, ValueError, TypeError, GithubException) as e:
+                errors.append(
+                    f"REPO_NAME '{repo_name}' is invalid or not accessible: {e}"
+                )
 
     if env["SMTP_PORT"]:
         try:
@@ -66,3 +246,91 @@ def check_env_vars() -> dict[str, str]:
         raise EnvCheckError("\n".join(errors))
 
     return env
+
+
+def check_int_vars(env: dict[str, str]) -> list[str]:
+    """Returns the errors of the variables in POSITIVE_INT_VARS and
+    NON_NEGATIVE_INT_VARS."""
+    errors: list[str] = []
+    for key in POSITIVE_INT_VARS:
+        try:
+            if int(env[key]) < 1:
+                errors.append(f"{key} '{env[key]}' must be a positive number.")
+        except ValueError:
+            errors.append(f"{key} '{env[key]}' is not a number.")
+
+    for key in NON_NEGATIVE_INT_VARS:
+        if not env[key].isdigit():
+            errors.append(f"{key} '{env[key]}' must be zero or a positive number.")
+    return errors
+
+
+def check_email_templates(value: str) -> list[str]:
+    """Returns the errors of an EMAIL_TEMPLATES value: malformed lines and
+    template files that do not exist."""
+    try:
+        templates = parse_templates(value)
+    except ValueError as e:
+        return [f"EMAIL_TEMPLATES is invalid: {e}"]
+    return [
+        f"EMAIL_TEMPLATES file '{path}' does not exist."
+        for _pattern, path in templates
+        if not os.path.isfile(path)
+    ]
+
+
+def check_output_sinks(env: dict[str, str]) -> list[str]:
+    """Returns the errors of the output sink options: unknown sinks and sinks
+    without their required options."""
+    errors: list[str] = []
+    for name in parse_sinks(env):
+        if name not in SINK_NAMES:
+            errors.append(
+                f"OUTPUT_SINKS '{name}' must be one of: {', '.join(SINK_NAMES)}."
+            )
+        for key in REQUIRED_SINK_OPTIONS.get(name, ()):
+            if not env[key]:
+                errors.append(f"OUTPUT_SINKS '{name}' requires {key} to be set.")
+    return errors
+
+
+def check_optional_env_vars() -> dict[str, str]:
+    """
+    Reads all optional environment variables and returns a dict with their names
+    and values, using the defaults for unset or empty variables.
+    Raises EnvCheckError if any variable is invalid.
+    """
+    env = {
+        key: os.getenv(key, "") or default
+        for key, default in OPTIONAL_ENV_DEFAULTS.items()
+    }
+
+    errors = check_int_vars(env)
+    for key in BOOL_VARS:
+        if env[key].strip().lower() not in TRUE_VALUES + FALSE_VALUES:
+            errors.append(f"{key} '{env[key]}' is not a boolean (true/false).")
+
+    for key, choices in CHOICE_VARS.items():
+        if env[key] not in choices:
+            errors.append(f"{key} '{env[key]}' must be one of: {', '.join(choices)}.")
+
+    if env_flag(env["COMMIT_MEMO"]) and not env["LLM_CACHE_DIR"]:
+        errors.append("COMMIT_MEMO requires LLM_CACHE_DIR to be set.")
+
+    try:
+        parse_routes(env["EMAIL_ROUTES"])
+    except ValueError as e:
+        errors.append(f"EMAIL_ROUTES is invalid: {e}")
+
+    errors.extend(check_email_templates(env["EMAIL_TEMPLATES"]))
+    errors.extend(check_output_sinks(env))
+
+    try:
+        re.compile(env["EXCLUDE_MESSAGE_PATTERN"])
+    except re.error as e:
+        errors.append(f"EXCLUDE_MESSAGE_PATTERN is not a valid regex: {e}")
+
+    if errors:
+        raise EnvCheckError("\n".join(errors))
+
+    return env
@@ -0,0 +1,91 @@
+"""
+graphql_collector.py
+
+This module provides a commit collector that streams the history of a repository's
+default branch (or another branch) through the GitHub GraphQL API. Unlike the REST path, which may
+lazily complete each PyGithub Commit object with additional requests, it fetches
+exactly the fields the report needs (message, author, url, sha, date) for up to
+100 commits per request.
+"""
+
+from collections.abc import Iterator
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from .commit_record import CommitRecord
+
+if TYPE_CHECKING:
+    from github import Github
+
+# Maximum page size allowed by the GraphQL API.
+PAGE_SIZE = 100
+
+HISTORY_QUERY = """
+query($owner: String!, $name: String!, $since: GitTimestamp!, $after: String, $first: Int!,
+      $path: String) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(since: $since, first: $first, after: $after, path: $path) {
+            pageInfo { hasNextPage endCursor }
+            nodes { oid message url author { name date } parents { totalCount } }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+# The same query for the branch with the given qualified name (refs/heads/...).
+BRANCH_HISTORY_QUERY = HISTORY_QUERY.replace(
+    "$path: String)", "$path: String, $ref: String!)"
+).replace("defaultBranchRef", "ref(qualifiedName: $ref)")
+
+
+def parse_commit_node(node: dict[str, Any]) -> CommitRecord:
+    """Converts a GraphQL commit node into a commit record."""
+    author = node.get("author") or {}
+    date = author.get("date")
+    return CommitRecord(
+        sha=node["oid"],
+        message=node["message"],
+        author=author.get("name"),
+        url=node["url"],
+        date=datetime.fromisoformat(date) if date else None,
+        is_merge=(node.get("parents") or {}).get("totalCount", 1) > 1,
+    )
+
+
+def iter_commits_graphql(
+    github: "Github", repo_name: str, since: datetime, path: str = "", branch: str = ""
+) -> Iterator[CommitRecord]:
+    """
+    Yields the commits of the default branch (or the given branch) of repo_name
+    since the given date, newest first, optionally only those touching path.
+    The next page is only requested once the previous one has been consumed.
+    """
+    owner, name = repo_name.split("/", 1)
+    variables: dict[str, Any] = {
+        "owner": owner,
+        "name": name,
+        "since": since.isoformat(),
+        "after": None,
+        "first": PAGE_SIZE,
+        "path": path or None,
+    }
+    query, field = HISTORY_QUERY, "defaultBranchRef"
+    if branch:
+        query, field = BRANCH_HISTORY_QUERY, "ref"
+        variables["ref"] = f"refs/heads/{branch}"
+    while True:
+        _headers, data = github.requester.graphql_query(query, variables)
+        ref = data["data"]["repository"][field]
+        if ref is None:  # empty repository or deleted branch
+            return
+        history = ref["target"]["history"]
+        for node in history["nodes"]:
+            yield parse_commit_node(node)
+        if not history["pageInfo"]["hasNextPage"]:
+            return
+        variables["after"] = history["pageInfo"]["endCursor"]
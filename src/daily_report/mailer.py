@@ -0,0 +1,165 @@
+"""
+mailer.py
+
+This module provides the SmtpMailer class, which delivers any number of messages
+over one persistent, authenticated SMTP connection (EHLO, STARTTLS and LOGIN
+happen once per connection instead of once per message), and helpers to resolve
+the recipients of a repository's report from EMAIL_RECEIVER and EMAIL_ROUTES.
+compose_message puts the headers of one delivery in front of a MIME body that
+was serialized once, so large reports are not re-encoded for every message.
+"""
+
+import re
+import smtplib
+import threading
+from contextlib import ExitStack
+from email.message import Message
+from email.policy import SMTP
+from fnmatch import fnmatch
+from types import TracebackType
+
+from .profiling import RunProfile
+
+
+def parse_addresses(value: str) -> list[str]:
+    """Splits a comma, semicolon or whitespace separated list of email addresses."""
+    addresses: list[str] = []
+    for address in re.split(r"[,;\s]+", value):
+        if address and address not in addresses:
+            addresses.append(address)
+    return addresses
+
+
+def parse_routes(value: str) -> list[tuple[str, list[str]]]:
+    """
+    Parses EMAIL_ROUTES: one 'pattern: addresses' entry per line, where pattern is
+    a repository name or a shell-style pattern such as 'org/*'.
+    Raises ValueError for lines without a pattern or without addresses.
+    """
+    routes: list[tuple[str, list[str]]] = []
+    for line in value.splitlines():
+        if not line.strip():
+            continue
+        pattern, _, addresses = line.partition(":")
+        if not pattern.strip() or not parse_addresses(addresses):
+            raise ValueError(f"Invalid email route '{line.strip()}'.")
+        routes.append((pattern.strip(), parse_addresses(addresses)))
+    return routes
+
+
+def recipients_for(
+    repo_name: str, receivers: list[str], routes: list[tuple[str, list[str]]]
+) -> list[str]:
+    """Returns the default receivers plus the addresses of all matching routes."""
+    recipients = list(receivers)
+    for pattern, addresses in routes:
+        if fnmatch(repo_name.lower(), pattern.lower()):
+            recipients.extend(a for a in addresses if a not in recipients)
+    return recipients
+
+
+def compose_message(headers: dict[str, str], body: bytes) -> bytes:
+    """Returns a message from headers such as Subject, From and To and a MIME
+    body serialized for SMTP (see RenderedReport.mime_body)."""
+    head = Message(policy=SMTP)
+    for name, value in headers.items():
+        head[name] = value
+    # Drop the empty line that ends the headers; the body's own MIME headers
+    # follow.
+    return head.as_bytes()[:-2] + body
+
+
+class SmtpMailer:
+    """Sends messages over one SMTP connection that is opened on first use and
+    reopened if the server drops it. Sends are serialized, so a mailer can be
+    shared between threads. Every socket operation gives up after timeout
+    seconds."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, server: str, port: int, user: str, password: str) -> None:
+        self.server = server
+        self.port = port
+        self.user = user
+        self.password = password
+        self._stack = ExitStack()
+        self._smtp: smtplib.SMTP | None = None
+        self._lock = threading.Lock()
+        # Optional RunProfile that times connection setups as "smtp_connect".
+        self.profile: RunProfile | None = None
+        self.timeout = 60.0
+        # Set by close() while a send is in progress; the send closes the
+        # connection when it is done.
+        self._close_pending = False
+
+    def __enter__(self) -> "SmtpMailer":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _connect(self) -> smtplib.SMTP:
+        """Opens and authenticates a new connection."""
+        if self.profile is None:
+            return self._handshake()
+        with self.profile.stage("smtp_connect"):
+            return self._handshake()
+
+    def _handshake(self) -> smtplib.SMTP:
+        server = self._stack.enter_context(
+            smtplib.SMTP(self.server, port=self.port, timeout=self.timeout)
+        )
+        server.ehlo()
+        server.starttls()
+        if not self.password:
+            raise ValueError(
+                "EMAIL_PASSWORD environment variable is not set or is empty."
+            )
+        server.login(self.user, self.password)
+        return server
+
+    def send(self, sender: str, recipients: list[str], message: str | bytes) -> None:
+        """Sends one message to all recipients in a single SMTP transaction."""
+        with self._lock:
+            try:
+                self._send(sender, recipients, message)
+            finally:
+                if self._close_pending:
+                    self._close_pending = False
+                    self._close_connection()
+
+    def _send(self, sender: str, recipients: list[str], message: str | bytes) -> None:
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._smtp.sendmail(sender, recipients, message)
+        except smtplib.SMTPServerDisconnected:
+            # The server closed the idle connection; reconnect once.
+            self._close_connection()
+            self._smtp = self._connect()
+            self._smtp.sendmail(sender, recipients, message)
+
+    def _close_connection(self) -> None:
+        self._smtp = None
+        try:
+            self._stack.close()
+        except smtplib.SMTPServerDisconnected:
+            pass
+
+    def close(self) -> None:
+        """Closes the connection if one is open. If a send is still in progress,
+        e.g. one whose sink timed out, it closes the connection when it is done,
+        so close() never waits for it."""
+        # pylint: disable-next=consider-using-with
+        if not self._lock.acquire(blocking=False):
+            self._close_pending = True
+            return
+        try:
+            self._close_connection()
+        finally:
+            self._lock.release()
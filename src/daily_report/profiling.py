@@ -0,0 +1,95 @@
+"""
+profiling.py
+
+This module provides the RunProfile class, which records how long each stage of
+a run takes (environment check, GitHub collection, OpenAI requests, Markdown
+rendering, SMTP) and counts API calls, tokens and bytes. Stages are timed with
+the stage() context manager, which can be used from several threads at once.
+The profile is a JSON document that the Daily Reporter writes to PROFILE_FILE and
+to the `profile` output of the action, so latency regressions of GitHub or
+OpenAI show up in the workflow history.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class RunProfile:
+    """Collects the stage timings and counters of one run."""
+
+    def __init__(self) -> None:
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        # name -> {"calls": n, "total_seconds": s, "max_seconds": s}
+        self.stages: dict[str, dict[str, float]] = {}
+        self.counters: dict[str, int] = {}
+        self.extra: dict[str, Any] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Times the enclosed block as one call of the named stage, also if it
+        raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def call(self, name: str, func: Callable[..., T], *args: Any) -> T:
+        """Calls func(*args) as one call of the named stage."""
+        with self.stage(name):
+            return func(*args)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Adds one call of the given duration to the named stage."""
+        with self._lock:
+            stats = self.stages.setdefault(
+                name, {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            stats["calls"] += 1
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Adds amount to the named counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the profile as a JSON-compatible dict."""
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(),
+                "duration_seconds": round(time.perf_counter() - self._started, 3),
+                "stages": {
+                    name: {
+                        key: round(value, 3) if key != "calls" else int(value)
+                        for key, value in stats.items()
+                    }
+                    for name, stats in sorted(self.stages.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+                **self.extra,
+            }
+
+    def to_json(self) -> str:
+        """Returns the profile as compact single-line JSON."""
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    def save(self, path: str) -> None:
+        """Writes the profile as indented JSON to path."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+            fh.write("\n")
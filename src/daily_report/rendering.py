@@ -0,0 +1,176 @@
+"""
+rendering.py
+
+This module provides the ReportRenderer class, which turns a Markdown report into
+the plain-text and HTML bodies of its email. The renderer keeps one Markdown
+converter for all reports and resets it between uses instead of building a new
+converter and extension registry per message, and it compiles the text and HTML
+templates once. Reports are rendered once into a RenderedReport that every
+output reuses, including the MIME body of the report email, which is serialized
+once and shared by every message that carries the report. The Markdown is
+base64-encoded once for both the plain-text part and the report.md attachment.
+
+The HTML template can be replaced per team with EMAIL_TEMPLATES: one
+'pattern: path' entry per line, where pattern is a repository name or a
+shell-style pattern such as 'org/*' and path is a template file with the
+placeholders $title, $repository and $content. Because many mail clients drop
+<style> elements, the converted report carries its styles inline.
+"""
+
+import base64
+import html
+import re
+import threading
+from dataclasses import dataclass, field
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.policy import SMTP
+from fnmatch import fnmatch
+from string import Template
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from markdown import Markdown
+
+# Inline styles of the elements the Markdown converter produces.
+INLINE_STYLES: dict[str, str] = {
+    "h1": "font-size:22px;margin:16px 0 8px;",
+    "h2": "font-size:18px;margin:16px 0 8px;",
+    "h3": "font-size:16px;margin:12px 0 6px;",
+    "p": "margin:0 0 12px;",
+    "ul": "margin:0 0 12px;padding-left:24px;",
+    "ol": "margin:0 0 12px;padding-left:24px;",
+    "li": "margin:0 0 4px;",
+    "a": "color:#0969da;",
+    "blockquote": "margin:0 0 12px;padding-left:12px;border-left:3px solid #d0d7de;",
+    "pre": "margin:0 0 12px;padding:8px;background:#f6f8fa;overflow:auto;",
+    "code": "font-family:Consolas,Menlo,monospace;font-size:13px;",
+}
+
+_STYLED_TAG = re.compile(rf"<({'|'.join(INLINE_STYLES)})(?=[\s>])")
+
+HTML_TEMPLATE = Template("""\
+<html>
+  <head>
+    <meta charset="utf-8">
+    <title>$title</title>
+  </head>
+  <body style="margin:0;padding:16px;font-family:Helvetica,Arial,sans-serif;\
+font-size:14px;line-height:1.5;color:#24292f;">
+    $content
+  </body>
+</html>
+""")
+
+# The plain-text part is the report itself, so it shares its encoded payload
+# with the attachment.
+TEXT_TEMPLATE = Template("$content")
+
+
+def parse_templates(value: str) -> list[tuple[str, str]]:
+    """
+    Parses EMAIL_TEMPLATES: one 'pattern: path' entry per line.
+    Raises ValueError for lines without a pattern or without a path.
+    """
+    templates: list[tuple[str, str]] = []
+    for line in value.splitlines():
+        if not line.strip():
+            continue
+        pattern, _, path = line.partition(":")
+        if not pattern.strip() or not path.strip():
+            raise ValueError(f"Invalid email template '{line.strip()}'.")
+        templates.append((pattern.strip(), path.strip()))
+    return templates
+
+
+def inline_styles(fragment: str) -> str:
+    """Adds the INLINE_STYLES to the elements of an HTML fragment."""
+    return _STYLED_TAG.sub(
+        lambda match: f'<{match[1]} style="{INLINE_STYLES[match[1]]}"', fragment
+    )
+
+
+def _base64_part(maintype: str, subtype: str, payload: str, **params: str) -> MIMEBase:
+    """Returns a MIME part with an already base64-encoded payload."""
+    part = MIMEBase(maintype, subtype, **params)
+    part["Content-Transfer-Encoding"] = "base64"
+    part.set_payload(payload)
+    return part
+
+
+@dataclass(slots=True)
+class RenderedReport:
+    """The bodies of one report, shared by all of its outputs."""
+
+    markdown: str
+    text: str
+    html: str
+    _mime_body: bytes | None = field(default=None, init=False, repr=False)
+
+    def mime_body(self) -> bytes:
+        """Returns the multipart email body (plain text, HTML and the report.md
+        attachment) with its MIME headers, serialized for SMTP on first use."""
+        if self._mime_body is None:
+            markdown_b64 = base64.encodebytes(self.markdown.encode("utf-8")).decode()
+            text_b64 = (
+                markdown_b64
+                if self.text == self.markdown
+                else base64.encodebytes(self.text.encode("utf-8")).decode()
+            )
+            msg = MIMEMultipart("alternative")
+            msg.attach(_base64_part("text", "plain", text_b64, charset="utf-8"))
+            msg.attach(MIMEText(self.html, "html", "utf-8"))
+            attachment = _base64_part(
+                "application", "octet-stream", markdown_b64, name="report.md"
+            )
+            attachment["Content-Disposition"] = 'attachment; filename="report.md"'
+            msg.attach(attachment)
+            self._mime_body = msg.as_bytes(policy=SMTP)
+        return self._mime_body
+
+
+class ReportRenderer:
+    """Renders reports with a reusable Markdown converter and precompiled
+    templates."""
+
+    def __init__(self, templates: list[tuple[str, str]] | None = None) -> None:
+        self._templates: list[tuple[str, Template]] = []
+        for pattern, path in templates or []:
+            with open(path, encoding="utf-8") as fh:
+                self._templates.append((pattern, Template(fh.read())))
+        # Created on first use; a converter keeps state while converting, so
+        # concurrent deliveries take turns.
+        self._converter: "Markdown | None" = None
+        self._lock = threading.Lock()
+
+    def to_html(self, body_md: str) -> str:
+        """Converts Markdown to an HTML fragment."""
+        with self._lock:
+            if self._converter is None:
+                import markdown  # pylint: disable=import-outside-toplevel
+
+                self._converter = markdown.Markdown()
+            self._converter.reset()
+            return self._converter.convert(body_md)
+
+    def html_template(self, repo_name: str) -> Template:
+        """Returns the template of the first matching EMAIL_TEMPLATES entry, or
+        the default template."""
+        for pattern, template in self._templates:
+            if fnmatch(repo_name.lower(), pattern.lower()):
+                return template
+        return HTML_TEMPLATE
+
+    def render(self, body_md: str, title: str, repo_name: str = "") -> RenderedReport:
+        """Renders a report. Raises ValueError if the conversion yields no HTML."""
+        fragment = self.to_html(body_md)
+        if not fragment:
+            raise ValueError("Failed to convert Markdown to HTML.")
+        page = self.html_template(repo_name).safe_substitute(
+            title=html.escape(title),
+            repository=html.escape(repo_name),
+            content=inline_styles(fragment),
+        )
+        text = TEXT_TEMPLATE.substitute(content=body_md)
+        return RenderedReport(markdown=body_md, text=text, html=page)
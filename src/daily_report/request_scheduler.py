@@ -0,0 +1,190 @@
+"""
+request_scheduler.py
+
+This module provides the RequestScheduler class, which coordinates the GitHub
+requests of concurrent workers. Attached to a client, it queues every request
+(REST pages, lazily completed objects and GraphQL queries alike) while the
+remaining rate limit quota is below a reserve, waiting for the reset instead of
+failing with 403, and counts the requests and their body bytes for the run
+profile. It also revalidates cached responses with conditional requests: GitHub
+answers an unchanged resource with 304 Not Modified, which does not count
+against the rate limit. ETags and payloads are kept in a ResponseCache directory
+that can be restored between workflow runs.
+"""
+
+import json
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from .commit_record import CommitRecord
+from .response_cache import ResponseCache
+
+if TYPE_CHECKING:
+    from github import Github
+    from github.Requester import Requester
+
+# Maximum page size allowed by the REST API.
+PAGE_SIZE = 100
+
+
+class RequestScheduler:
+    """Paces GitHub requests by the remaining quota and serves unchanged
+    resources from an ETag cache."""
+
+    CACHE_MAX_BYTES = 20 * 1024 * 1024
+    CACHE_MAX_AGE = 7 * 86400
+
+    def __init__(self, reserve: int, cache_dir: str = "") -> None:
+        self.reserve = reserve
+        # Set by attach().
+        self.requester: "Requester | None" = None
+        self.cache: ResponseCache | None = None
+        if cache_dir:
+            self.cache = ResponseCache(
+                cache_dir, max_bytes=self.CACHE_MAX_BYTES, max_age=self.CACHE_MAX_AGE
+            )
+        # Responses (304s separately) and body bytes of all requests.
+        self.stats = {
+            "requests": 0,
+            "not_modified": 0,
+            "request_bytes": 0,
+            "response_bytes": 0,
+        }
+        self._stats_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def attach(self, github: "Github") -> None:
+        """Routes all requests of a client through wait_for_quota and counts them
+        in stats. PyGithub sends every JSON request, including pagination, lazy
+        completion and GraphQL queries, through its Requester's
+        requestJsonAndCheck (which JSON-encodes the input as the body), and
+        passes every raw response to DEBUG_ON_RESPONSE. The objects it returns
+        share that Requester. Attaching the same client again has no effect."""
+        requester = github.requester
+        if requester is self.requester:
+            return
+        self.requester = requester
+        send = requester.requestJsonAndCheck
+        on_response = requester.DEBUG_ON_RESPONSE
+
+        def request(*args: Any, **kwargs: Any) -> tuple[dict[str, Any], Any]:
+            self.wait_for_quota()
+            body = kwargs.get("input")
+            if body is not None:
+                self._count("request_bytes", len(json.dumps(body).encode()))
+            return send(*args, **kwargs)
+
+        def response(status: int, headers: dict[str, Any], data: Any) -> None:
+            self._count("requests")
+            if status == 304:
+                self._count("not_modified")
+            if isinstance(data, str):
+                self._count("response_bytes", len(data.encode()))
+            on_response(status, headers, data)
+
+        requester.requestJsonAndCheck = request
+        requester.DEBUG_ON_RESPONSE = response
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def wait_for_quota(self) -> None:
+        """Blocks until the rate limit has reset if the remaining quota reported
+        by the last response dropped below the reserve. Waiting workers are
+        queued on one lock, so only one of them sleeps and the others proceed
+        once the quota is back. Before the first response the quota is unknown
+        and requests proceed."""
+        if self.requester is None:
+            return
+        with self._lock:
+            remaining, _limit = self.requester.rate_limiting
+            if remaining >= self.reserve:
+                return
+            delay = self.requester.rate_limiting_resettime - time.time()
+            if delay > 0:
+                print(
+                    f"⏳ GitHub rate limit nearly exhausted, waiting {delay:.0f}s.",
+                    file=sys.stderr,
+                )
+                time.sleep(delay)
+
+    def get_json(self, url: str, parameters: dict[str, Any] | None = None) -> Any:
+        """
+        Sends a GET request for a REST API path and returns the decoded JSON.
+        A cached response is revalidated with If-None-Match and returned as is
+        if GitHub reports it unchanged (304).
+        """
+        if self.requester is None:
+            raise ValueError("RequestScheduler is not attached to a GitHub client.")
+        key = ResponseCache.make_key(
+            "GET", url, json.dumps(parameters or {}, sort_keys=True)
+        )
+        entry: dict[str, Any] | None = None
+        headers: dict[str, str] = {}
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                entry = json.loads(cached)
+                headers["If-None-Match"] = entry["etag"]
+
+        response_headers, data = self.requester.requestJsonAndCheck(
+            "GET", url, parameters=parameters, headers=headers
+        )
+        if data is None and entry is not None:
+            return entry["data"]
+
+        etag = response_headers.get("etag")
+        if self.cache is not None and etag:
+            self.cache.set(key, json.dumps({"etag": etag, "data": data}))
+        return data
+
+
+def parse_commit_item(item: dict[str, Any]) -> CommitRecord:
+    """Converts a REST commit item into a commit record."""
+    author = item["commit"].get("author") or {}
+    date = author.get("date")
+    return CommitRecord(
+        sha=item["sha"],
+        message=item["commit"]["message"],
+        author=author.get("name"),
+        url=item["html_url"],
+        date=datetime.fromisoformat(date) if date else None,
+        is_merge=len(item.get("parents", [])) > 1,
+    )
+
+
+def iter_commits_conditional(
+    scheduler: RequestScheduler,
+    repo_name: str,
+    since: datetime,
+    path: str = "",
+    branch: str = "",
+) -> Iterator[CommitRecord]:
+    """
+    Yields the commits of the default branch (or the given branch) of repo_name
+    since the given date, newest first, optionally only those touching path,
+    with conditional page requests. The date is truncated to the full hour so
+    that reruns within the hour, and runs with the same cursor, request the same
+    pages and can be answered with 304.
+    """
+    since = since.replace(minute=0, second=0, microsecond=0)
+    parameters: dict[str, Any] = {"since": since.isoformat(), "per_page": PAGE_SIZE}
+    if path:
+        parameters["path"] = path
+    if branch:
+        parameters["sha"] = branch
+    page = 1
+    while True:
+        items = scheduler.get_json(
+            f"/repos/{repo_name}/commits", {**parameters, "page": page}
+        )
+        for item in items:
+            yield parse_commit_item(item)
+        if len(items) < PAGE_SIZE:
+            return
+        page += 1
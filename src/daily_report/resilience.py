@@ -0,0 +1,233 @@
+"""
+resilience.py
+
+This module provides the retry and circuit breaker layer for the calls to
+GitHub, OpenAI, the SMTP server and the output sinks. call_with_retry retries
+transient errors (dropped connections, DNS failures, timeouts, HTTP 408, 429 and
+5xx, SMTP 4xx replies) with jittered exponential backoff, or after the time the service asks
+for with Retry-After or its rate limit reset headers. Every service has a
+CircuitBreaker: after a number of consecutive transient failures it opens and
+further calls fail immediately with CircuitOpenError instead of waiting for
+their own retries, until a trial call after the reset timeout succeeds.
+"""
+
+import random
+import smtplib
+import socket
+import sys
+import threading
+import time
+import urllib.error
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Backoff before the first retry; doubled for every further retry up to
+# RETRY_MAX_DELAY, of which a random half is added as jitter.
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+# Retry-After waits beyond this are not worth blocking the job for.
+MAX_RETRY_AFTER = 300.0
+# Consecutive failures that open a circuit, unless configured otherwise.
+CIRCUIT_THRESHOLD = 5
+# Seconds an open circuit rejects calls before it lets a trial call through.
+CIRCUIT_RESET_SECONDS = 60.0
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling a service whose circuit is open."""
+
+
+def _header(headers: Any, name: str) -> str | None:
+    """Returns a header value, ignoring the case of its name."""
+    for key, value in headers.items():
+        if key.lower() == name:
+            return str(value)
+    return None
+
+
+def _wait_seconds(headers: Any) -> float | None:
+    value = _header(headers, "retry-after-ms")
+    if value is not None:
+        return float(value) / 1000
+    value = _header(headers, "retry-after")
+    if value is not None:
+        if value.strip().isdigit():
+            return float(value)
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    reset = _header(headers, "x-ratelimit-reset")
+    if reset is not None and _header(headers, "x-ratelimit-remaining") == "0":
+        return float(reset) - time.time()
+    return None
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """
+    Returns the seconds the service asked to wait before retrying, from the
+    Retry-After (seconds or HTTP date) or retry-after-ms header, or from the rate
+    limit reset time once the remaining quota is 0; None if it did not ask.
+    Headers are read from exc.headers (PyGithub, urllib) or exc.response.headers
+    (openai).
+    """
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not hasattr(headers, "items"):
+        return None
+    try:
+        seconds = _wait_seconds(headers)
+    except (TypeError, ValueError):
+        return None
+    return None if seconds is None else max(seconds, 0.0)
+
+
+def status_code(exc: BaseException) -> int | None:
+    """Returns the HTTP status of a failed request (openai, PyGithub, urllib)."""
+    for attribute in ("status_code", "status", "code"):
+        value = getattr(exc, attribute, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _is_network_error(exc: BaseException) -> bool:
+    """Returns whether an error is a failed or dropped connection, a DNS failure
+    or a timeout, including those wrapped by urllib and requests (PyGithub).
+    Other OS errors, such as a missing file, a denied permission or an invalid
+    TLS certificate, are permanent."""
+    if isinstance(exc, (ConnectionError, TimeoutError, socket.gaierror)):
+        return True
+    if isinstance(exc, urllib.error.URLError):
+        return isinstance(exc.reason, BaseException) and _is_network_error(exc.reason)
+    # requests is only loaded by PyGithub; its errors cannot occur before.
+    requests = sys.modules.get("requests")
+    if requests is None:
+        return False
+    errors = requests.exceptions
+    if isinstance(exc, errors.SSLError):
+        return False
+    return isinstance(
+        exc, (errors.ConnectionError, errors.Timeout, errors.ChunkedEncodingError)
+    )
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Returns whether an error is worth retrying: SMTP 4xx replies and dropped
+    connections, HTTP 408, 429 and 5xx responses, 403 responses that ask to
+    wait (secondary rate limits), and network errors and timeouts."""
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, (smtplib.SMTPException, CircuitOpenError)):
+        return False
+    status = status_code(exc)
+    if status is not None and status >= 400:
+        if status == 403:
+            return retry_after(exc) is not None
+        return status in (408, 429) or status >= 500
+    return _is_network_error(exc)
+
+
+def backoff_delay(attempt: int, exc: BaseException) -> float | None:
+    """Returns the seconds to wait before retry number attempt + 1, or None if
+    the service asked for a longer wait than MAX_RETRY_AFTER."""
+    requested = retry_after(exc)
+    if requested is not None:
+        return requested if requested <= MAX_RETRY_AFTER else None
+    delay = min(RETRY_BASE_DELAY * 2**attempt, RETRY_MAX_DELAY)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """Counts consecutive transient failures of one service and rejects calls
+    while the circuit is open."""
+
+    def __init__(
+        self, name: str, threshold: int, reset_timeout: float = CIRCUIT_RESET_SECONDS
+    ) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.retries = 0
+        self.opened_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit is open and rejects calls."""
+        with self._lock:
+            opened_at = self.opened_at
+        return (
+            opened_at is not None and time.monotonic() - opened_at < self.reset_timeout
+        )
+
+    def check(self) -> None:
+        """Raises CircuitOpenError if the circuit is open. Once the reset timeout
+        has passed, calls go through again; the first failure reopens it."""
+        if self.is_open:
+            raise CircuitOpenError(
+                f"{self.name} is unavailable after {self.failures} consecutive "
+                "failures; not retrying for now."
+            )
+
+    def record_success(self) -> None:
+        """Closes the circuit."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_retry(self) -> None:
+        """Counts a retry of a failed call."""
+        with self._lock:
+            self.retries += 1
+
+    def record_failure(self) -> None:
+        """Counts a transient failure and opens the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+def call_with_retry(
+    breaker: CircuitBreaker,
+    func: Callable[[], T],
+    retries: int,
+    deadline: float | None = None,
+    retryable: Callable[[BaseException], bool] = is_transient,
+) -> T:
+    """
+    Calls func through the breaker and retries it up to retries times after
+    errors for which retryable returns True, as long as the backoff ends before
+    the deadline (a time.monotonic() value), if one is given. Other errors are
+    raised at once and do not count as failures of the service.
+    """
+    attempt = 0
+    while True:
+        breaker.check()
+        try:
+            result = func()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            if not retryable(exc):
+                raise
+            breaker.record_failure()
+            delay = backoff_delay(attempt, exc)
+            if attempt >= retries or delay is None or breaker.is_open:
+                raise
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise
+            attempt += 1
+            breaker.record_retry()
+            print(
+                f"⚠️ {breaker.name}: {exc or type(exc).__name__}; retry "
+                f"{attempt}/{retries} in {delay:.1f}s.",
+                file=sys.stderr,
+            )
+            time.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
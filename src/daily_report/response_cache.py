@@ -0,0 +1,118 @@
+"""
+response_cache.py
+
+This module provides the ResponseCache class, a content-addressed on-disk cache
+for OpenAI responses. Entries are keyed by a SHA-256 hash of everything that
+determines a response (model, temperature and the normalized prompt) and are
+evicted by age and by the total size of the cache directory. The size is
+tracked as entries are written, so the directory is only scanned when it
+exceeds its limit. The directory can be restored between workflow runs, e.g.
+with actions/cache.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+class ResponseCache:
+    """Stores text responses as files named by the hash of their inputs."""
+
+    SUFFIX = ".json"
+
+    def __init__(self, directory: str, max_bytes: int, max_age: float) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Bytes of all entries; set by evict() and updated by set() and get().
+        self._size = 0
+        self.evict()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Returns the content hash identifying a response for the given inputs."""
+        payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key: str) -> str | None:
+        """Returns the cached response or None if it is missing or expired."""
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.max_age:
+                os.remove(path)
+                with self._lock:
+                    self._size -= stat.st_size
+                return None
+            with open(path, encoding="utf-8") as fh:
+                value = json.load(fh)["value"]
+            os.utime(path)  # keep recently used entries during eviction
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return value if isinstance(value, str) else None
+
+    def set(self, key: str, value: str) -> None:
+        """Stores a response and evicts old entries if the cache grew too large.
+        A failure to write the cache only prints a warning."""
+        path = self._path(key)
+        tmp_path = ""
+        try:
+            # A unique name, so concurrent writes of one key do not collide.
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with open(fd, "w", encoding="utf-8") as fh:
+                json.dump({"value": value}, fh, ensure_ascii=False)
+            size = os.path.getsize(tmp_path)
+            try:
+                size -= os.path.getsize(path)
+            except OSError:  # a new entry
+                pass
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            print(f"⚠️ Warning: Could not write cache entry: {exc}", file=sys.stderr)
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            self._size += size
+            too_large = self._size > self.max_bytes
+        if too_large:
+            self.evict()
+
+    def evict(self) -> None:
+        """Removes expired entries, then the least recently used ones until the
+        cache fits into max_bytes."""
+        entries: list[tuple[float, int, str]] = []
+        now = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+                if now - stat.st_mtime > self.max_age:
+                    os.remove(path)
+                    continue
+            except OSError:  # removed concurrently
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        with self._lock:
+            self._size = total
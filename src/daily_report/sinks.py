@@ -0,0 +1,344 @@
+"""
+sinks.py
+
+This module provides the output sinks, the destinations a finished report is
+delivered to. Each sink is an OutputSink subclass that sends one report; the
+built-in sinks are:
+
+- email: the report email (rendered by the Daily Reporter),
+- file: the report as a local Markdown file,
+- github_output: the combined report of all repositories as the `report` output
+  for GitHub Actions,
+- slack and teams: a message to a Slack or Microsoft Teams incoming webhook,
+- s3: the report file uploaded to an S3-compatible bucket, signed with
+  AWS Signature Version 4, so no SDK is needed.
+
+dispatch sends a report to several sinks concurrently. Every sink has its own
+timeout for all of its attempts and retries transient errors (network errors,
+HTTP 429 and 5xx responses) with jittered exponential backoff or as long as
+Retry-After asks, so a slow or failing webhook neither delays the other sinks
+nor the job beyond its timeout. A sink that keeps failing opens its circuit
+breaker, and the reports of the following repositories skip it at once.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from urllib.parse import quote, urlsplit
+
+from .commit_filters import parse_patterns
+from .profiling import RunProfile
+from .rendering import RenderedReport
+from .resilience import CIRCUIT_THRESHOLD, CircuitBreaker, call_with_retry
+
+SINK_NAMES: tuple[str, ...] = ("email", "file", "github_output", "slack", "teams", "s3")
+
+# Options a sink cannot do without.
+REQUIRED_SINK_OPTIONS: dict[str, tuple[str, ...]] = {
+    "slack": ("SLACK_WEBHOOK_URL",),
+    "teams": ("TEAMS_WEBHOOK_URL",),
+    "s3": ("S3_BUCKET", "S3_ACCESS_KEY_ID", "S3_SECRET_ACCESS_KEY"),
+}
+
+
+@dataclass(slots=True)
+class OutputReport:
+    """A finished report on its way to the sinks. The combined report of a run
+    has no repository name and no file name."""
+
+    repo_name: str
+    subject: str
+    markdown: str
+    filename: str = ""
+    # Set for the sinks that need the rendered email bodies.
+    rendered: RenderedReport | None = None
+
+
+def post_json(url: str, payload: dict[str, object], timeout: float) -> None:
+    """Posts payload as JSON. Raises urllib.error.HTTPError for error statuses."""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+
+
+class OutputSink(ABC):
+    """Base class of the output sinks. Subclasses implement send()."""
+
+    name = ""
+    # Whether the sink receives the combined report once per run instead of the
+    # report of each repository.
+    per_run = False
+    # Whether the sink needs OutputReport.rendered.
+    needs_rendered = False
+
+    def __init__(self, timeout: float, retries: int = 0) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self.breaker = CircuitBreaker(self.name, CIRCUIT_THRESHOLD)
+
+    @abstractmethod
+    def send(self, report: OutputReport, timeout: float) -> None:
+        """Sends the report once; timeout is the time left for the attempt."""
+
+    def deliver(self, report: OutputReport) -> None:
+        """Sends the report, retrying transient errors while attempts and time
+        are left."""
+        deadline = time.monotonic() + self.timeout
+        call_with_retry(
+            self.breaker,
+            lambda: self.send(report, max(deadline - time.monotonic(), 0.001)),
+            self.retries,
+            deadline,
+        )
+
+
+class CallbackSink(OutputSink):
+    """Sink that hands the report to a function, e.g. the email delivery of the
+    Daily Reporter."""
+
+    def __init__(
+        self,
+        name: str,
+        callback: Callable[[OutputReport], None],
+        timeout: float,
+        needs_rendered: bool = False,
+    ) -> None:
+        self.name = name
+        super().__init__(timeout)
+        self.callback = callback
+        self.needs_rendered = needs_rendered
+
+    def send(self, report: OutputReport, timeout: float) -> None:
+        self.callback(report)
+
+
+class FileSink(OutputSink):
+    """Saves the report as a Markdown file."""
+
+    name = "file"
+
+    def send(self, report: OutputReport, timeout: float) -> None:
+        with open(report.filename, "w", encoding="utf-8") as reportfile:
+            reportfile.write(report.markdown)
+
+
+class GithubOutputSink(OutputSink):
+    """Provides the combined report as the `report` output for GitHub Actions."""
+
+    name = "github_output"
+    per_run = True
+
+    def send(self, report: OutputReport, timeout: float) -> None:
+        github_output = os.environ.get("GITHUB_OUTPUT")
+        if github_output:  # pragma: no cover
+            with open(github_output, "a", encoding="utf-8") as fh:
+                print(f"report<<EOF\n{report.markdown}\nEOF", file=fh)
+
+
+class SlackSink(OutputSink):
+    """Posts the report to a Slack incoming webhook."""
+
+    name = "slack"
+
+    def __init__(self, url: str, timeout: float, retries: int = 0) -> None:
+        super().__init__(timeout, retries)
+        self.url = url
+
+    def send(self, report: OutputReport, timeout: float) -> None:
+        post_json(
+            self.url, {"text": f"*{report.subject}*\n\n{report.markdown}"}, timeout
+        )
+
+
+class TeamsSink(OutputSink):
+    """Posts the report to a Microsoft Teams incoming webhook as a message card."""
+
+    name = "teams"
+
+    def __init__(self, url: str, timeout: float, retries: int = 0) -> None:
+        super().__init__(timeout, retries)
+        self.url = url
+
+    def send(self, report: OutputReport, timeout: float) -> None:
+        card = {
+            "@type": "MessageCard",
+            "@context": "https://schema.org/extensions",
+            "summary": report.subject,
+            "title": report.subject,
+            "text": report.markdown,
+        }
+        post_json(self.url, card, timeout)
+
+
+@dataclass(slots=True)
+class S3Credentials:
+    """Access key, secret key and region for AWS Signature Version 4."""
+
+    access_key: str
+    secret_key: str
+    region: str
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode("utf-8"), hashlib.sha256).digest()
+
+
+def sign_v4(
+    credentials: S3Credentials,
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    payload_hash: str,
+) -> str:
+    """
+    Returns the Authorization header of an S3 request signed with AWS Signature
+    Version 4. headers must contain host, x-amz-date and x-amz-content-sha256;
+    all of them are signed. url must not have a query string.
+    """
+    amz_date = headers["x-amz-date"]
+    scope = f"{amz_date[:8]}/{credentials.region}/s3/aws4_request"
+    names = sorted(name.lower() for name in headers)
+    values = {name.lower(): value.strip() for name, value in headers.items()}
+    canonical_request = "\n".join(
+        [
+            method,
+            urlsplit(url).path or "/",
+            "",
+            "".join(f"{name}:{values[name]}\n" for name in names),
+            ";".join(names),
+            payload_hash,
+        ]
+    )
+    string_to_sign = "\n".join(
+        [
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ]
+    )
+    key = _hmac(f"AWS4{credentials.secret_key}".encode("utf-8"), amz_date[:8])
+    for part in (credentials.region, "s3", "aws4_request"):
+        key = _hmac(key, part)
+    signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256)
+    return (
+        f"AWS4-HMAC-SHA256 Credential={credentials.access_key}/{scope}, "
+        f"SignedHeaders={';'.join(names)}, Signature={signature.hexdigest()}"
+    )
+
+
+class S3Sink(OutputSink):
+    """Uploads the report file to an S3-compatible bucket (path-style URLs)."""
+
+    name = "s3"
+
+    def __init__(
+        self, options: dict[str, str], timeout: float, retries: int = 0
+    ) -> None:
+        super().__init__(timeout, retries)
+        self.credentials = S3Credentials(
+            options["S3_ACCESS_KEY_ID"],
+            options["S3_SECRET_ACCESS_KEY"],
+            options["S3_REGION"],
+        )
+        default_endpoint = f"https://s3.{self.credentials.region}.amazonaws.com"
+        self.endpoint = (options["S3_ENDPOINT_URL"] or default_endpoint).rstrip("/")
+        self.bucket = options["S3_BUCKET"]
+        self.prefix = options["S3_PREFIX"]
+
+    def object_url(self, filename: str) -> str:
+        """Returns the URL of the object a report file is uploaded to."""
+        key = quote(f"{self.prefix}{filename}", safe="/-_.~")
+        return f"{self.endpoint}/{self.bucket}/{key}"
+
+    def send(self, report: OutputReport, timeout: float) -> None:
+        body = report.markdown.encode("utf-8")
+        url = self.object_url(report.filename)
+        headers = {
+            "host": urlsplit(url).netloc,
+            "x-amz-content-sha256": hashlib.sha256(body).hexdigest(),
+            "x-amz-date": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        }
+        headers["Authorization"] = sign_v4(
+            self.credentials, "PUT", url, headers, headers["x-amz-content-sha256"]
+        )
+        headers["Content-Type"] = "text/markdown; charset=utf-8"
+        request = urllib.request.Request(url, data=body, headers=headers, method="PUT")
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+
+
+def create_sinks(
+    options: dict[str, str], send_email: Callable[[OutputReport], None]
+) -> list[OutputSink]:
+    """Creates the sinks listed in OUTPUT_SINKS with SINK_TIMEOUT, for the
+    network sinks SINK_RETRIES, and CIRCUIT_BREAKER_THRESHOLD."""
+    timeout = float(options["SINK_TIMEOUT"])
+    retries = int(options["SINK_RETRIES"])
+    factories: dict[str, Callable[[], OutputSink]] = {
+        "email": lambda: CallbackSink("email", send_email, timeout, True),
+        "file": lambda: FileSink(timeout),
+        "github_output": lambda: GithubOutputSink(timeout),
+        "slack": lambda: SlackSink(options["SLACK_WEBHOOK_URL"], timeout, retries),
+        "teams": lambda: TeamsSink(options["TEAMS_WEBHOOK_URL"], timeout, retries),
+        "s3": lambda: S3Sink(options, timeout, retries),
+    }
+    sinks = [factories[name]() for name in dict.fromkeys(parse_sinks(options))]
+    for sink in sinks:
+        sink.breaker.threshold = int(options["CIRCUIT_BREAKER_THRESHOLD"])
+    return sinks
+
+
+def parse_sinks(options: dict[str, str]) -> list[str]:
+    """Returns the sink names listed in OUTPUT_SINKS."""
+    return [name.lower() for name in parse_patterns(options["OUTPUT_SINKS"])]
+
+
+async def _deliver(
+    sink: OutputSink,
+    report: OutputReport,
+    profile: RunProfile,
+    on_delivered: Callable[[OutputSink], None] | None,
+) -> None:
+    try:
+        await asyncio.wait_for(
+            asyncio.to_thread(profile.call, f"sink_{sink.name}", sink.deliver, report),
+            sink.timeout,
+        )
+    except asyncio.TimeoutError:
+        raise TimeoutError(
+            f"Output sink '{sink.name}' timed out after {sink.timeout:g} seconds."
+        ) from None
+    if on_delivered is not None:
+        on_delivered(sink)
+
+
+async def dispatch(
+    sinks: list[OutputSink],
+    report: OutputReport,
+    profile: RunProfile,
+    on_delivered: Callable[[OutputSink], None] | None = None,
+) -> None:
+    """Delivers a report to all sinks concurrently and calls on_delivered, if
+    given, for every sink that succeeded. Waits for every sink, then raises the
+    first error, if any."""
+    results = await asyncio.gather(
+        *(_deliver(sink, report, profile, on_delivered) for sink in sinks),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
@@ -0,0 +1,118 @@
+"""Unit tests for the pull request and issue activity collector."""
+
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import MagicMock
+
+from daily_report.activity_collector import (
+    ActivityEvent,
+    format_event,
+    iter_activity_graphql,
+    parse_activity_node,
+)
+
+SINCE = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def _pull_request(**fields: Any) -> dict[str, Any]:
+    node = {
+        "__typename": "PullRequest",
+        "number": 7,
+        "title": "Add feature",
+        "url": "https://github.com/owner/repo/pull/7",
+        "createdAt": "2024-01-01T10:00:00Z",
+        "closedAt": None,
+        "mergedAt": None,
+        "author": {"login": "alice"},
+        "reviews": {"nodes": []},
+    }
+    node.update(fields)
+    return node
+
+
+def test_parse_activity_node_pull_request() -> None:
+    """Test that only events inside the window are reported, merges once."""
+    node = _pull_request(
+        closedAt="2024-01-02T12:00:00Z",
+        mergedAt="2024-01-02T12:00:00Z",
+        reviews={
+            "nodes": [
+                {
+                    "state": "CHANGES_REQUESTED",
+                    "submittedAt": "2024-01-02T09:00:00Z",
+                    "author": {"login": "bob"},
+                },
+                {
+                    "state": "APPROVED",
+                    "submittedAt": "2024-01-01T09:00:00Z",
+                    "author": {"login": "carol"},
+                },
+            ]
+        },
+    )
+
+    events = parse_activity_node(node, SINCE)
+
+    assert [(e.kind, e.actor) for e in events] == [
+        ("pull request merged", None),
+        ("review changes requested", "bob"),
+    ]
+
+
+def test_parse_activity_node_issue() -> None:
+    """Test that opened and closed issues become events."""
+    node = {
+        "__typename": "Issue",
+        "number": 3,
+        "title": "Crash",
+        "url": "https://github.com/owner/repo/issues/3",
+        "createdAt": "2024-01-02T08:00:00Z",
+        "closedAt": "2024-01-02T09:00:00Z",
+        "author": None,
+    }
+    events = parse_activity_node(node, SINCE)
+    assert [e.kind for e in events] == ["issue opened", "issue closed"]
+
+
+def test_format_event() -> None:
+    """Test the prompt line of an event."""
+    event = ActivityEvent("pull request opened", 7, "Add feature", "", "alice", SINCE)
+    assert format_event(event) == "- pull request opened #7: Add feature (alice)"
+    event.actor = None
+    assert format_event(event) == "- pull request opened #7: Add feature"
+
+
+def test_iter_activity_graphql_paginates() -> None:
+    """Test that the search is paginated and scoped to the repository and window."""
+    github = MagicMock()
+    github.requester.graphql_query.side_effect = [
+        (
+            {},
+            {
+                "data": {
+                    "search": {
+                        "pageInfo": {"hasNextPage": True, "endCursor": "c1"},
+                        "nodes": [_pull_request(createdAt="2024-01-02T10:00:00Z"), {}],
+                    }
+                }
+            },
+        ),
+        (
+            {},
+            {
+                "data": {
+                    "search": {
+                        "pageInfo": {"hasNextPage": False, "endCursor": None},
+                        "nodes": [_pull_request(number=8)],
+                    }
+                }
+            },
+        ),
+    ]
+
+    events = list(iter_activity_graphql(github, "owner/repo", SINCE))
+
+    assert [(e.kind, e.number) for e in events] == [("pull request opened", 7)]
+    first, second = (c.args[1] for c in github.requester.graphql_query.call_args_list)
+    assert first["query"].startswith("repo:owner/repo updated:>=2024-01-02T00:00:00Z")
+    assert second["after"] == "c1"
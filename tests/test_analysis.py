@@ -0,0 +1,57 @@
+"""Unit tests for the prompt helpers used by the commit analysis."""
+
+from daily_report.analysis import (
+    chunk_by_tokens,
+    estimate_tokens,
+    format_commit,
+    parse_commit_notes,
+)
+from daily_report.commit_record import CommitRecord
+
+
+def test_estimate_tokens() -> None:
+    """Test the character based token estimate."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_format_commit() -> None:
+    """Test that a commit is formatted as one prompt line with a short SHA."""
+    commit = CommitRecord("abcdef123456", "fix: bug", "dev", "", None)
+    assert format_commit(commit) == "- [abcdef1] fix: bug (dev)"
+    assert format_commit(commit, "note") == "- [abcdef1] note (dev)"
+    commit.diffstat = "+3 -1: a.py +3 -1"
+    assert format_commit(commit) == "- [abcdef1] fix: bug (dev) [+3 -1: a.py +3 -1]"
+
+
+def test_chunk_by_tokens_respects_budget() -> None:
+    """Test that items are batched in order without exceeding the budget."""
+    items = ["x" * 20, "y" * 20, "z" * 20]  # 5 tokens + 1 for the newline each
+    assert chunk_by_tokens(items, 12) == [items[:2], items[2:]]
+    assert chunk_by_tokens(items, 100) == [items]
+    assert not chunk_by_tokens([], 10)
+
+
+def test_chunk_by_tokens_truncates_oversized_items() -> None:
+    """Test that an item larger than the budget is truncated into its own batch."""
+    chunks = chunk_by_tokens(["short", "x" * 100], 5)
+    assert chunks[0] == ["short"]
+    assert len(chunks[1][0]) == 20
+    assert chunks[1][0].endswith("…")
+
+
+def test_parse_commit_notes() -> None:
+    """Test that note lines are mapped to the full SHA of matching commits."""
+    commits = [
+        CommitRecord("abcdef1234", "", None, "", None),
+        CommitRecord("1234567890", "", None, "", None),
+    ]
+    answer = (
+        "- [abcdef1]: fixes the bug\n1234567 – adds a TODO\nunrelated line\nfffffff: x"
+    )
+
+    assert parse_commit_notes(answer, commits) == {
+        "abcdef1234": "fixes the bug",
+        "1234567890": "adds a TODO",
+    }
@@ -0,0 +1,111 @@
+"""Unit tests for the branch listing and multi-branch collection."""
+
+import os
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from daily_report.branches import iter_branches, matches_any
+from daily_report.daily_reporter import DailyReporter
+from tests.conftest import valid_env
+
+
+def _page(
+    branches: dict[str, str | None], end_cursor: str | None
+) -> tuple[dict[str, Any], Any]:
+    """Return a fake GraphQL refs response with the given branch head dates."""
+    nodes = [
+        {"name": name, "target": {"committedDate": date} if date else None}
+        for name, date in branches.items()
+    ]
+    refs = {
+        "pageInfo": {"hasNextPage": end_cursor is not None, "endCursor": end_cursor},
+        "nodes": nodes,
+    }
+    return {}, {"data": {"repository": {"refs": refs}}}
+
+
+def test_matches_any() -> None:
+    """Test that branch patterns use shell-style wildcards."""
+    assert matches_any("release/1.2", ["main", "release/*"])
+    assert not matches_any("feature/x", ["main", "release/*"])
+    assert matches_any("feature/x", ["*"])
+
+
+def test_iter_branches_paginates_and_filters() -> None:
+    """Test that all pages are read and only matching branches are yielded."""
+    github = MagicMock()
+    github.requester.graphql_query.side_effect = [
+        _page({"main": "2024-01-02T00:00:00Z", "feature/x": None}, "cursor1"),
+        _page({"release/1.0": "2023-06-01T00:00:00Z", "release/2.0": None}, None),
+    ]
+
+    branches = list(iter_branches(github, "owner/repo", ["main", "release/*"]))
+
+    assert branches == [
+        ("main", datetime(2024, 1, 2, tzinfo=timezone.utc)),
+        ("release/1.0", datetime(2023, 6, 1, tzinfo=timezone.utc)),
+        ("release/2.0", None),
+    ]
+    variables = github.requester.graphql_query.call_args_list[1].args[1]
+    assert variables["after"] == "cursor1"
+
+
+def _rest_commit(sha: str, day: int) -> MagicMock:
+    """Return a mock REST commit with the given SHA, authored on a day of 2024-01."""
+    commit = MagicMock()
+    commit.sha = sha
+    commit.commit.message = f"msg {sha}"
+    commit.commit.author.date = datetime(2024, 1, day, tzinfo=timezone.utc)
+    commit.parents = [MagicMock()]
+    return commit
+
+
+@patch("daily_report.daily_reporter.iter_branches")
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_collect_commits_walks_active_branches(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    mock_iter_branches: MagicMock,
+    tmp_path: os.PathLike[str],
+) -> None:
+    """Test that matching branches with recent heads are collected with their own
+    cursors and that commits shared between branches are kept once."""
+    path = os.path.join(tmp_path, "cursors.json")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(
+            '{"owner/repo@release/1.0": '
+            '{"sha": "r-old", "date": "2024-01-01T00:00:00+00:00"}}'
+        )
+    mock_check_env_vars.return_value = valid_env()
+    recent = datetime.now(timezone.utc)
+    mock_iter_branches.return_value = [
+        ("main", recent),
+        ("release/1.0", recent),
+        ("release/0.9", datetime(2020, 1, 1, tzinfo=timezone.utc)),
+    ]
+    histories = {
+        None: [_rest_commit("m2", 3), _rest_commit("shared", 2)],
+        "release/1.0": [
+            _rest_commit("r1", 4),
+            _rest_commit("shared", 2),
+            _rest_commit("r-old", 1),
+        ],
+    }
+    mock_repo = mock_github.return_value.get_repo.return_value
+    mock_repo.full_name = "owner/repo"
+    mock_repo.default_branch = "main"
+    mock_repo.get_commits.side_effect = lambda **kw: histories[kw.get("sha")]
+
+    with patch.dict(os.environ, {"BRANCHES": "main, release/*", "CURSOR_STORE": path}):
+        commits = DailyReporter().collect_commits()
+
+    assert [c.sha for c in commits] == ["r1", "m2", "shared"]
+    assert mock_iter_branches.call_args.args[2] == ["main", "release/*"]
+    calls = {c.kwargs.get("sha"): c.kwargs for c in mock_repo.get_commits.mock_calls}
+    assert set(calls) == {None, "release/1.0"}
+    # The branch cursor minus the default overlap of CURSOR_OVERLAP_HOURS.
+    assert calls["release/1.0"]["since"] == datetime(2023, 12, 31, tzinfo=timezone.utc)
@@ -0,0 +1,117 @@
+"""Unit tests for the checkpoints of completed report stages."""
+
+import json
+import os
+import smtplib
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from daily_report.activity_collector import ActivityEvent
+from daily_report.checkpoints import CheckpointStore
+from daily_report.commit_record import CommitRecord
+from daily_report.daily_reporter import DailyReporter
+from tests.conftest import valid_env
+
+
+def test_checkpoint_collection_roundtrip(tmp_path: os.PathLike[str]) -> None:
+    """Test that collected commits, events and branch heads are restored."""
+    date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    commit = CommitRecord("abc", "fix", "dev", "https://x/abc", date)
+    event = ActivityEvent("pull request merged", 7, "Add x", "https://x/7", "dev", date)
+    store = CheckpointStore(os.path.join(tmp_path, "checkpoints"), "2024-01-01")
+    assert store.load("owner/repo") == {}
+
+    store.save_collection("Owner/Repo", [commit], [event], {"main": commit})
+    store.update("owner/repo", report="# Report")
+    store.update("owner/repo", delivered=["file"])
+
+    checkpoint = CheckpointStore(store.directory, "2024-01-01").load("owner/repo")
+    assert checkpoint["report"] == "# Report"
+    assert checkpoint["delivered"] == ["file"]
+    assert CheckpointStore.collection(checkpoint) == (
+        [commit],
+        [event],
+        {"main": commit},
+    )
+
+
+def test_checkpoint_cleanup(tmp_path: os.PathLike[str]) -> None:
+    """Test that checkpoints of other days and of successful runs are removed,
+    and unreadable ones are ignored."""
+    directory = str(tmp_path)
+    CheckpointStore(directory, "2024-01-01").update("owner/repo", report="old")
+    store = CheckpointStore(directory, "2024-01-02")
+    store.update("owner/repo", report="new")
+    with open(os.path.join(directory, "notes.txt"), "w", encoding="utf-8") as fh:
+        fh.write("unrelated")
+
+    store.remove_stale()
+    assert sorted(os.listdir(directory)) == [
+        "checkpoint-2024-01-02-owner-repo.json",
+        "notes.txt",
+    ]
+
+    with open(store.path("owner/repo"), "w", encoding="utf-8") as fh:
+        fh.write("{not json")
+    assert store.load("owner/repo") == {}
+
+    store.clear()
+    assert os.listdir(directory) == ["notes.txt"]
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_run_resumes_from_checkpoint(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    tmp_path: os.PathLike[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a rerun after a failed email neither collects nor analyzes
+    again and only delivers to the sinks that failed."""
+    monkeypatch.chdir(tmp_path)  # the file sink writes to the working directory
+    env = valid_env(github_output_path=os.path.join(tmp_path, "output"))
+    mock_check_env_vars.return_value = env
+    mock_repo = mock_github.return_value.get_repo.return_value
+    mock_repo.full_name = "owner/repo"
+    commit = MagicMock(sha="abc1234", html_url="http://example.com", parents=[])
+    commit.commit.message = "fix"
+    commit.commit.author.name = "dev"
+    commit.commit.author.date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mock_repo.get_commits.return_value = [commit]
+    create = mock_openai.return_value.chat.completions.create
+    create.return_value.choices = [MagicMock(message=MagicMock(content="Report"))]
+    env.update(CHECKPOINT_DIR="checkpoints", OUTPUT_SINKS="email, file")
+
+    def run(send_email: MagicMock) -> None:
+        reporter = DailyReporter()
+        with (
+            patch.object(reporter, "send_email", send_email),
+            patch("builtins.print"),
+            patch("sys.exit", side_effect=SystemExit),
+        ):
+            with pytest.raises(SystemExit):
+                reporter.run()
+
+    with patch.dict(os.environ, env):
+        run(MagicMock(side_effect=smtplib.SMTPDataError(554, b"rejected")))
+        (name,) = os.listdir("checkpoints")
+        with open(os.path.join("checkpoints", name), encoding="utf-8") as fh:
+            checkpoint = json.load(fh)
+        assert (checkpoint["report"], checkpoint["delivered"]) == ("Report", ["file"])
+
+        mock_repo.get_commits.reset_mock()
+        create.reset_mock()
+        send_email = MagicMock()
+        with patch("daily_report.sinks.FileSink.send") as file_send:
+            run(send_email)
+
+    mock_repo.get_commits.assert_not_called()
+    create.assert_not_called()
+    file_send.assert_not_called()
+    assert send_email.call_args.args[1] == "Report"
+    assert not os.listdir("checkpoints")
@@ -0,0 +1,71 @@
+"""Unit tests for the commit filter stages."""
+
+from collections.abc import Iterator
+
+from daily_report.commit_filters import CommitFilter, exclude_shas
+from daily_report.commit_record import CommitRecord
+from daily_report.env_check import OPTIONAL_ENV_DEFAULTS
+
+
+def _commit(sha: str, author: str = "dev", message: str = "msg") -> CommitRecord:
+    return CommitRecord(sha, message, author, "", None)
+
+
+def _filter(skip_merges: bool = False, **options: str) -> CommitFilter:
+    return CommitFilter.from_options(
+        {**OPTIONAL_ENV_DEFAULTS, **options}, skip_merges=skip_merges
+    )
+
+
+def test_commit_filter_without_options_keeps_everything() -> None:
+    """Test that the default configuration has no stages."""
+    commits = [_commit("a"), _commit("b", author="dependabot[bot]")]
+    assert list(_filter().apply(commits)) == commits
+
+
+def test_commit_filter_excludes_authors() -> None:
+    """Test that author patterns match case-insensitively with '*' wildcards only."""
+    commit_filter = _filter(EXCLUDE_AUTHORS="Dependabot[bot], renovate*")
+    commits = [
+        _commit("a"),
+        _commit("b", author="dependabot[bot]"),
+        _commit("c", author="dependabotb"),
+        _commit("d", author="renovate-bot"),
+    ]
+    assert [c.sha for c in commit_filter.apply(commits)] == ["a", "c"]
+
+
+def test_commit_filter_includes_authors() -> None:
+    """Test that an allow list keeps only matching authors."""
+    commit_filter = _filter(INCLUDE_AUTHORS="alice\nbob")
+    commits = [_commit("a", author="alice"), _commit("b", author="eve")]
+    assert [c.sha for c in commit_filter.apply(commits)] == ["a"]
+
+
+def test_commit_filter_skips_merges_and_messages() -> None:
+    """Test that merge commits and messages matching the pattern are dropped."""
+    commit_filter = _filter(skip_merges=True, EXCLUDE_MESSAGE_PATTERN=r"\[skip ci\]")
+    merge = CommitRecord("m", "Merge branch", "dev", "", None, is_merge=True)
+    commits = [_commit("a"), merge, _commit("b", message="chore: bump [skip ci]")]
+    assert [c.sha for c in commit_filter.apply(commits)] == ["a"]
+
+
+def test_commit_filter_is_lazy() -> None:
+    """Test that commits are filtered as they arrive, not after buffering."""
+    pulled: list[str] = []
+
+    def stream() -> Iterator[CommitRecord]:
+        for sha in "abc":
+            pulled.append(sha)
+            yield _commit(sha, author="bot" if sha == "a" else "dev")
+
+    filtered = _filter(EXCLUDE_AUTHORS="bot").apply(stream())
+    assert next(filtered).sha == "b"
+    assert pulled == ["a", "b"]
+
+
+def test_exclude_shas() -> None:
+    """Test that already reported commits are dropped from the stream."""
+    commits = [_commit("a"), _commit("b"), _commit("c")]
+    assert [c.sha for c in exclude_shas(commits, {"b"})] == ["a", "c"]
+    assert len(list(exclude_shas(commits, set()))) == 3
@@ -0,0 +1,29 @@
+"""Unit tests for the slotted commit record."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from daily_report.commit_record import CommitRecord
+
+
+def test_commit_record_round_trips_through_json() -> None:
+    """Test that a record survives to_dict, JSON and from_dict unchanged."""
+    record = CommitRecord(
+        "abc", "msg", "dev", "https://x/abc", datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+
+    data = json.loads(json.dumps(record.to_dict()))
+
+    assert data["date"] == "2024-01-01T00:00:00+00:00"
+    assert CommitRecord.from_dict(data) == record
+    assert CommitRecord.from_dict({"sha": "a", "message": "m"}).date is None
+
+
+def test_commit_record_has_no_instance_dict() -> None:
+    """Test that records use slots instead of a per-instance __dict__."""
+    record = CommitRecord("abc", "msg", None, "", None)
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.extra = 1  # type: ignore[attr-defined]  # pylint: disable=assigning-non-slot
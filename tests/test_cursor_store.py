@@ -0,0 +1,104 @@
+"""Unit tests for the persistent commit cursor store."""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from daily_report.cursor_store import CursorStore
+from daily_report.daily_reporter import DailyReporter
+from tests.conftest import valid_env
+
+
+def test_cursor_store_roundtrip(tmp_path: os.PathLike[str]) -> None:
+    """Test that advanced cursors are persisted and read back by a new store."""
+    path = os.path.join(tmp_path, "state", "cursors.json")
+    store = CursorStore(path)
+    assert store.get("owner/repo") is None
+    assert store.since("owner/repo") is None
+
+    date = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    store.advance("Owner/Repo", "abc", date)
+    store.advance("owner/repo", "def", "2024-01-01", branch="release")
+    store.save()
+
+    reloaded = CursorStore(path)
+    assert reloaded.get("owner/repo") == {"sha": "abc", "date": date.isoformat()}
+    assert reloaded.since("owner/repo") == date
+    assert reloaded.since("owner/repo", branch="release") == datetime(
+        2024, 1, 1, tzinfo=timezone.utc
+    )
+
+
+def test_cursor_store_ignores_unreadable_file(tmp_path: os.PathLike[str]) -> None:
+    """Test that a corrupt or unexpected cursor file is treated as empty."""
+    path = os.path.join(tmp_path, "cursors.json")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("{not json")
+    assert CursorStore(path).get("owner/repo") is None
+
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(["unexpected"], fh)
+    assert CursorStore(path).get("owner/repo") is None
+
+
+def test_cursor_store_reported_shas(tmp_path: os.PathLike[str]) -> None:
+    """Test that reported SHAs and cursor SHAs are remembered per repository
+    and forgotten once they are dated before the start of every cursor."""
+    path = os.path.join(tmp_path, "cursors.json")
+    day = datetime(2024, 1, 10, tzinfo=timezone.utc)
+    store = CursorStore(path, timedelta(days=1))
+    store.advance("owner/repo", "head", day, branch="main")
+    store.mark_reported("Owner/Repo", [("a", day - timedelta(hours=1)), ("b", None)])
+    store.save()
+
+    reloaded = CursorStore(path, timedelta(days=1))
+    assert reloaded.start("owner/repo", branch="main") == day - timedelta(days=1)
+    assert reloaded.start("owner/repo") is None
+    assert reloaded.reported("owner/repo") == {"a", "b", "head"}
+    assert reloaded.reported("owner/other") == set()
+
+    reloaded.advance("owner/repo", "head2", day + timedelta(days=1), branch="main")
+    reloaded.mark_reported("owner/repo", [("c", day + timedelta(hours=12))])
+    assert reloaded.reported("owner/repo") == {"b", "c", "head2"}
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_collect_commits_overlaps_cursor(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    tmp_path: os.PathLike[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that collection starts CURSOR_OVERLAP_HOURS before a recent cursor
+    instead of two days ago, so commits pushed after the last run with an
+    earlier date are reported, and that reported commits are skipped."""
+    path = os.path.join(tmp_path, "cursors.json")
+    now = datetime.now(timezone.utc)
+    store = CursorStore(path)
+    store.advance("owner/repo", "cursor", now - timedelta(hours=1))
+    store.mark_reported("owner/repo", [("reported", now - timedelta(hours=2))])
+    store.save()
+    monkeypatch.setenv("CURSOR_STORE", path)
+    monkeypatch.setenv("CURSOR_OVERLAP_HOURS", "6")
+    mock_check_env_vars.return_value = valid_env()
+    mock_repo = mock_github.return_value.get_repo.return_value
+    mock_repo.full_name = "owner/repo"
+    commits = []
+    for sha in ("new", "cursor", "pushed-late", "reported"):
+        commit = MagicMock(sha=sha, html_url="http://example.com", parents=[])
+        commit.commit.message = sha
+        commit.commit.author.name = "dev"
+        commits.append(commit)
+    mock_repo.get_commits.return_value = commits
+
+    collected = DailyReporter().collect_commits()
+
+    assert [c.sha for c in collected] == ["new", "pushed-late"]
+    since = mock_repo.get_commits.call_args.kwargs["since"]
+    assert since == now - timedelta(hours=7)
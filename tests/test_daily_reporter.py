@@ -1,20 +1,25 @@
 """Unit tests for the DailyReporter class and environment validation."""
 
 import builtins
+import json
 import os
 import smtplib
+import time
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from daily_report.activity_collector import ActivityEvent
+from daily_report.commit_record import CommitRecord
 from daily_report.daily_reporter import DailyReporter
-from daily_report.env_check import EnvCheckError
+from daily_report.env_check import EnvCheckError, GithubSession
 from tests.conftest import selective_open, selective_open_github_output_path, valid_env
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 # @patch("daily_report.daily_reporter.open")
 def test_run_sends_email(
     # mock_open: MagicMock,
@@ -58,8 +63,8 @@ def test_run_sends_email(
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 def test_analyze_commits_with_gpt_empty(
     mock_openai: MagicMock,  # pylint: disable=unused-argument
     mock_github: MagicMock,  # pylint: disable=unused-argument
@@ -77,8 +82,8 @@ def test_analyze_commits_with_gpt_empty(
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 def test_analyze_commits_with_gpt_empty_response(
     mock_openai: MagicMock,
     mock_github: MagicMock,  # pylint: disable=unused-argument
@@ -94,16 +99,14 @@ def test_analyze_commits_with_gpt_empty_response(
         MagicMock(message=MagicMock(content=None))
     ]
     reporter = DailyReporter()
-    commits: list[dict[str, str]] = [
-        {"sha": "abc", "message": "msg", "author": "a", "url": "", "date": ""}
-    ]
+    commits = [CommitRecord("abc", "msg", "a", "", None)]
     result = reporter.analyze_commits_with_gpt(commits)
     assert "No summary generated" in result
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 def test_send_email_password_missing(
     mock_openai: MagicMock,  # pylint: disable=unused-argument
     mock_github: MagicMock,  # pylint: disable=unused-argument
@@ -123,8 +126,8 @@ def test_send_email_password_missing(
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 def test_collect_commits(
     mock_openai: MagicMock,  # pylint: disable=unused-argument
     mock_github: MagicMock,
@@ -150,7 +153,7 @@ def test_collect_commits(
     reporter = DailyReporter()
     commits = reporter.collect_commits()
     assert isinstance(commits, list)
-    assert commits[0]["message"] == "test"
+    assert commits[0].message == "test"
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
@@ -170,8 +173,8 @@ def test_init_env_error(
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 def test_run_exception_handling(
     mock_openai: MagicMock,
     mock_github: MagicMock,
@@ -224,8 +227,8 @@ def test_sanitize_filename() -> None:
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 def test_run_smtp_exception(
     mock_openai: MagicMock,
     mock_github: MagicMock,
@@ -270,8 +273,8 @@ def test_run_smtp_exception(
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 def test_run_github_output_oserror(
     mock_openai: MagicMock,
     mock_github: MagicMock,
@@ -311,8 +314,8 @@ def test_run_github_output_oserror(
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 def test_run_status_success(
     mock_openai: MagicMock,
     mock_github: MagicMock,
@@ -351,3 +354,647 @@ def test_run_status_success(
     with open(github_output_path, encoding="utf-8") as f:
         content = f.read()
         assert "report_status=success" in content
+
+
+def _mock_repo(full_name: str, message: str) -> MagicMock:
+    """Return a mock repository with one commit carrying the given message."""
+    mock_commit = MagicMock()
+    mock_commit.commit.message = message
+    mock_commit.commit.author.name = "dev"
+    mock_commit.html_url = "http://example.com"
+    mock_commit.sha = "abc1234"
+    mock_commit.commit.author.date = "2024-01-01"
+    mock_repo = MagicMock()
+    mock_repo.full_name = full_name
+    mock_repo.get_commits.return_value = [mock_commit]
+    return mock_repo
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_collect_targets_multiple_repos(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+) -> None:
+    """Test that collect_targets expands listed repos and 'owner/*' selectors."""
+    env = valid_env()
+    env["REPO_NAME"] = "owner/one, org/*"
+    mock_check_env_vars.return_value = env
+
+    repos = {
+        "owner/one": _mock_repo("owner/one", "first"),
+        "org/two": _mock_repo("org/two", "second"),
+    }
+    mock_github.return_value.get_repo.side_effect = repos.__getitem__
+    mock_github.return_value.search_repositories.return_value = [
+        repos["org/two"],
+        repos["owner/one"],
+    ]
+    mock_github.return_value.rate_limiting = (5000, 5000)
+
+    reporter = DailyReporter()
+    assert reporter.repo is None
+    targets = reporter.collect_targets()
+
+    assert [name for name, _ in targets] == ["owner/one", "org/two"]
+    assert reporter.collect_commits(targets[1][1])[0].message == "second"
+    mock_github.return_value.search_repositories.assert_called_once_with(
+        query="user:org archived:false"
+    )
+
+
+@patch("daily_report.request_scheduler.time.sleep")
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_github_requests_wait_for_rate_limit_reset(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    mock_sleep: MagicMock,
+) -> None:
+    """Test that every GitHub request of a single-repository run waits for the
+    reset when the rate limit is nearly exhausted."""
+    mock_check_env_vars.return_value = valid_env()
+    requester = mock_github.return_value.requester
+    send = requester.requestJsonAndCheck
+    requester.rate_limiting = (10, 5000)
+    requester.rate_limiting_resettime = 1030
+    reporter = DailyReporter()
+    assert reporter.repo is not None
+    with patch("daily_report.request_scheduler.time.time", return_value=1000.0):
+        with patch("builtins.print"):
+            reporter.github.requester.requestJsonAndCheck("GET", "/repos/o/r/commits")
+    mock_sleep.assert_called_once_with(30.0)
+    send.assert_called_once_with("GET", "/repos/o/r/commits")
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_run_multiple_repos_writes_combined_output(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    github_output_path: str,  # pylint: disable=redefined-outer-name
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that run writes one report per repository and a combined output."""
+    env = valid_env(github_output_path=github_output_path)
+    env["REPO_NAME"] = "owner/one,owner/two"
+    env["EMAIL_RECEIVER"] = "a@example.com, b@example.com"
+    mock_check_env_vars.return_value = env
+    monkeypatch.setenv("EMAIL_ROUTES", "owner/two: team@example.com")
+
+    repos = {name: _mock_repo(name, "msg") for name in ("owner/one", "owner/two")}
+    mock_github.return_value.get_repo.side_effect = repos.__getitem__
+    mock_github.return_value.rate_limiting = (5000, 5000)
+    mock_openai.return_value.chat.completions.create.return_value.choices = [
+        MagicMock(message=MagicMock(content="Test-Report"))
+    ]
+
+    with (
+        patch("sys.exit", side_effect=SystemExit),
+        patch("daily_report.daily_reporter.smtplib.SMTP") as mock_smtp,
+    ):
+        with pytest.raises(SystemExit):
+            DailyReporter().run()
+
+    sendmail = mock_smtp.return_value.__enter__.return_value.sendmail
+    assert sendmail.call_count == 2
+    mock_smtp.assert_called_once()  # one connection for all reports
+    with open(github_output_path, encoding="utf-8") as f:
+        content = f.read()
+    assert "# owner/one" in content
+    assert "# owner/two" in content
+    recipients = sorted(call.args[1] for call in sendmail.call_args_list)
+    assert recipients == [
+        ["a@example.com", "b@example.com"],
+        ["a@example.com", "b@example.com", "team@example.com"],
+    ]
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    for name in repos:
+        path = f"{today}-{name.replace('/', '-')}.md"
+        assert os.path.exists(path)
+        os.remove(path)
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_collect_commits_stops_at_cursor(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    tmp_path: os.PathLike[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that collection starts one overlap before the stored cursor and
+    that the cursor commit itself is not reported again."""
+    path = os.path.join(tmp_path, "cursors.json")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('{"owner/repo": {"sha": "old", "date": "2024-01-01T00:00:00+00:00"}}')
+    monkeypatch.setenv("CURSOR_STORE", path)
+    mock_check_env_vars.return_value = valid_env()
+
+    new_commit = _mock_repo("owner/repo", "new").get_commits.return_value[0]
+    new_commit.sha = "new"
+    old_commit = _mock_repo("owner/repo", "old").get_commits.return_value[0]
+    old_commit.sha = "old"
+    mock_repo = mock_github.return_value.get_repo.return_value
+    mock_repo.full_name = "owner/repo"
+    mock_repo.get_commits.return_value = [new_commit, old_commit]
+
+    reporter = DailyReporter()
+    commits = reporter.collect_commits()
+
+    assert [c.sha for c in commits] == ["new"]
+    since = mock_repo.get_commits.call_args.kwargs["since"]
+    assert since == datetime(2023, 12, 31, tzinfo=timezone.utc)
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_collect_commits_applies_filters(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that bot and merge commits are dropped while collecting."""
+    monkeypatch.setenv("EXCLUDE_AUTHORS", "dependabot[bot]")
+    monkeypatch.setenv("SKIP_MERGE_COMMITS", "true")
+    mock_check_env_vars.return_value = valid_env()
+
+    def rest_commit(sha: str, author: str, parents: int = 1) -> MagicMock:
+        commit = MagicMock(sha=sha, parents=[MagicMock()] * parents)
+        commit.commit.author.name = author
+        return commit
+
+    mock_repo = mock_github.return_value.get_repo.return_value
+    mock_repo.get_commits.return_value = [
+        rest_commit("a", "dev"),
+        rest_commit("b", "dependabot[bot]"),
+        rest_commit("c", "dev", parents=2),
+        rest_commit("d", "dev"),
+    ]
+
+    commits = DailyReporter().collect_commits()
+
+    assert [c.sha for c in commits] == ["a", "d"]
+
+
+@patch("daily_report.daily_reporter.iter_commits_graphql")
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_collect_commits_graphql_backend(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    mock_collect_graphql: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that COLLECTOR_BACKEND=graphql bypasses the REST commit listing."""
+    monkeypatch.setenv("COLLECTOR_BACKEND", "graphql")
+    mock_check_env_vars.return_value = valid_env()
+    mock_repo = mock_github.return_value.get_repo.return_value
+    mock_repo.full_name = "owner/repo"
+    mock_collect_graphql.return_value = [CommitRecord("abc", "msg", "a", "", None)]
+
+    commits = DailyReporter().collect_commits()
+
+    assert commits == [CommitRecord("abc", "msg", "a", "", None)]
+    mock_repo.get_commits.assert_not_called()
+    assert mock_collect_graphql.call_args.args[1] == "owner/repo"
+    assert mock_collect_graphql.call_args.args[3] == ""
+
+
+@patch("daily_report.daily_reporter.iter_commits_git")
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_collect_commits_git_backend(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    mock_collect_git: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that COLLECTOR_BACKEND=git reads commits from a per-repository clone."""
+    monkeypatch.setenv("COLLECTOR_BACKEND", "git")
+    monkeypatch.setenv("GIT_CLONE_DIR", "/clones")
+    mock_check_env_vars.return_value = valid_env()
+    mock_repo = mock_github.return_value.get_repo.return_value
+    mock_repo.full_name = "Owner/Repo"
+    mock_collect_git.return_value = [CommitRecord("abc", "msg", "a", "", None)]
+
+    commits = DailyReporter().collect_commits()
+
+    assert commits == [CommitRecord("abc", "msg", "a", "", None)]
+    mock_repo.get_commits.assert_not_called()
+    assert mock_collect_git.call_args.args[:2] == (mock_repo, "/clones/owner/repo.git")
+    assert mock_collect_git.call_args.kwargs["token"] == valid_env()["GITHUB_TOKEN"]
+
+
+@patch("daily_report.daily_reporter.iter_commits_conditional")
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_collect_commits_conditional_requests(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    mock_collect_conditional: MagicMock,
+    tmp_path: os.PathLike[str],
+) -> None:
+    """Test that GITHUB_CACHE_DIR switches the REST path to conditional requests."""
+    env = {"GITHUB_CACHE_DIR": os.path.join(tmp_path, "github")}
+    mock_check_env_vars.return_value = valid_env()
+    mock_repo = mock_github.return_value.get_repo.return_value
+    mock_repo.full_name = "owner/repo"
+    mock_collect_conditional.return_value = [CommitRecord("abc", "msg", "a", "", None)]
+
+    with patch.dict(os.environ, env):
+        reporter = DailyReporter()
+    commits = reporter.collect_commits()
+
+    assert commits == [CommitRecord("abc", "msg", "a", "", None)]
+    mock_repo.get_commits.assert_not_called()
+    assert mock_collect_conditional.call_args.args[0] is reporter.scheduler
+    assert mock_collect_conditional.call_args.args[1] == "owner/repo"
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_init_reuses_validated_session(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+) -> None:
+    """Test that the reporter reuses the client and repository from validation."""
+    validated_client = MagicMock()
+    validated_repo = MagicMock()
+
+    def fake_check_env_vars(session: GithubSession, probe: bool) -> dict[str, str]:
+        assert probe
+        session.client = validated_client
+        session.repos["owner/repo"] = validated_repo
+        return valid_env()
+
+    mock_check_env_vars.side_effect = fake_check_env_vars
+
+    reporter = DailyReporter()
+
+    assert reporter.github is validated_client
+    assert reporter.repo is validated_repo
+    mock_github.assert_not_called()
+    validated_client.get_repo.assert_not_called()
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_analyze_commits_with_gpt_map_reduce(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,  # pylint: disable=unused-argument
+    mock_check_env_vars: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that commits exceeding the token budget are summarized in batches."""
+    monkeypatch.setenv("PROMPT_TOKEN_BUDGET", "100")
+    mock_check_env_vars.return_value = valid_env()
+
+    def fake_create(**kwargs: object) -> MagicMock:
+        prompt = kwargs["messages"][0]["content"]  # type: ignore[index]
+        if "Merge them" in prompt:
+            answer = "merged"
+        elif "partial summaries" in prompt:
+            answer = "final"
+        else:
+            answer = "p" * 100  # partials too large to be reduced in one prompt
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=answer))])
+
+    create = mock_openai.return_value.chat.completions.create
+    create.side_effect = fake_create
+    commits = [CommitRecord(f"{i:07d}", "m" * 60, "dev", "", None) for i in range(10)]
+
+    result = DailyReporter().analyze_commits_with_gpt(commits)
+
+    assert result == "final"
+    prompts = [c.kwargs["messages"][0]["content"] for c in create.call_args_list]
+    chunk_prompts = [p for p in prompts if "Here is part" in p]
+    assert len(chunk_prompts) > 1
+    assert sum("0000009" in p for p in chunk_prompts) == 1
+    assert any("Merge them" in p for p in prompts)
+    assert "merged" in prompts[-1]
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_analyze_commits_with_gpt_uses_response_cache(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,  # pylint: disable=unused-argument
+    mock_check_env_vars: MagicMock,
+    tmp_path: os.PathLike[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a repeated analysis of the same commits is served from the cache."""
+    monkeypatch.setenv("LLM_CACHE_DIR", os.path.join(tmp_path, "llm"))
+    mock_check_env_vars.return_value = valid_env()
+    create = mock_openai.return_value.chat.completions.create
+    create.return_value.choices = [MagicMock(message=MagicMock(content=" Report "))]
+    commits = [CommitRecord("abc", "msg", "a", "", None)]
+
+    first = DailyReporter().analyze_commits_with_gpt(commits)
+    second = DailyReporter().analyze_commits_with_gpt(commits)
+
+    assert first == second == "Report"
+    create.assert_called_once()
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_analyze_commits_with_gpt_memoizes_commit_notes(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,  # pylint: disable=unused-argument
+    mock_check_env_vars: MagicMock,
+    tmp_path: os.PathLike[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that only commits without a cached note are sent to the model, and
+    that with OPENAI_STREAM only the final report is streamed."""
+    monkeypatch.setenv("LLM_CACHE_DIR", os.path.join(tmp_path, "llm"))
+    monkeypatch.setenv("COMMIT_MEMO", "true")
+    monkeypatch.setenv("OPENAI_STREAM", "true")
+    mock_check_env_vars.return_value = valid_env()
+
+    def fake_create(**kwargs: object) -> MagicMock:
+        prompt = kwargs["messages"][0]["content"]  # type: ignore[index]
+        if "exactly one line" in prompt:
+            shas = [
+                line[3:10] for line in prompt.splitlines() if line.startswith("- [")
+            ]
+            answer = "\n".join(f"{sha}: note {sha}" for sha in shas)
+        else:
+            answer = "report"
+        if kwargs.get("stream"):
+            return MagicMock(__iter__=lambda _: iter([_stream_chunk(answer)]))
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=answer))])
+
+    create = mock_openai.return_value.chat.completions.create
+    create.side_effect = fake_create
+
+    def commit(sha: str) -> CommitRecord:
+        return CommitRecord(sha, f"msg {sha}", "a", "", None)
+
+    path = os.path.join(tmp_path, "report.md")
+    assert DailyReporter().analyze_commits_with_gpt([commit("aaaaaaa1")], path) == (
+        "report"
+    )
+    create.reset_mock()
+    DailyReporter().analyze_commits_with_gpt(
+        [commit("bbbbbbb2"), commit("aaaaaaa1")], path
+    )
+
+    notes_call, report_call = create.call_args_list
+    assert "stream" not in notes_call.kwargs
+    assert report_call.kwargs["stream"] is True
+    prompts = [c.kwargs["messages"][0]["content"] for c in create.call_args_list]
+    notes_prompt = prompts[0]
+    assert "bbbbbbb" in notes_prompt
+    assert "aaaaaaa" not in notes_prompt
+    assert "note aaaaaaa" in prompts[-1]
+    assert "note bbbbbbb" in prompts[-1]
+
+
+@patch("daily_report.daily_reporter.iter_activity_graphql")
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_analyze_includes_pull_request_activity(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    mock_iter_activity: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that COLLECT_ACTIVITY feeds pull request events into the analysis."""
+    monkeypatch.setenv("COLLECT_ACTIVITY", "true")
+    mock_check_env_vars.return_value = valid_env()
+    mock_github.return_value.get_repo.return_value.full_name = "owner/repo"
+    event = ActivityEvent(
+        "pull request merged", 7, "Add feature", "", "alice", datetime.now(timezone.utc)
+    )
+    mock_iter_activity.return_value = iter([event])
+    create = mock_openai.return_value.chat.completions.create
+    create.return_value.choices = [MagicMock(message=MagicMock(content="report"))]
+
+    reporter = DailyReporter()
+    events = reporter._collect_activity(  # pylint: disable=protected-access
+        reporter.repo
+    )
+    report = reporter.analyze_commits_with_gpt([], events=events)
+
+    assert report == "report"
+    assert mock_iter_activity.call_args.args[1] == "owner/repo"
+    prompt = create.call_args.kwargs["messages"][0]["content"]
+    assert "pull request, review, and issue events" in prompt
+    assert "- pull request merged #7: Add feature (alice)" in prompt
+
+
+def _stream_chunk(content: str | None) -> MagicMock:
+    return MagicMock(choices=[MagicMock(delta=MagicMock(content=content))])
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_analyze_commits_with_gpt_streams_report(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,  # pylint: disable=unused-argument
+    mock_check_env_vars: MagicMock,
+    tmp_path: os.PathLike[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a streamed report is assembled and written while it arrives."""
+    monkeypatch.setenv("OPENAI_STREAM", "true")
+    mock_check_env_vars.return_value = valid_env()
+    stream = MagicMock()
+    stream.__iter__.return_value = iter(
+        [_stream_chunk("# Daily"), _stream_chunk(None), _stream_chunk(" Report ")]
+    )
+    create = mock_openai.return_value.chat.completions.create
+    create.return_value = stream
+    stream_path = os.path.join(tmp_path, "report.md")
+    commits = [CommitRecord("abc", "msg", "a", "", None)]
+
+    reporter = DailyReporter()
+    report = reporter.analyze_commits_with_gpt(commits, stream_path)
+
+    assert report == "# Daily Report"
+    assert create.call_args.kwargs["stream"] is True
+    with open(stream_path, encoding="utf-8") as fh:
+        assert fh.read() == "# Daily Report "
+    stream.close.assert_called_once()
+    assert reporter.openai_metrics[0]["finished"] is True
+    assert reporter.openai_metrics[0]["time_to_first_token"] is not None
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_analyze_commits_with_gpt_stream_timeout_keeps_partial_report(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,  # pylint: disable=unused-argument
+    mock_check_env_vars: MagicMock,
+    tmp_path: os.PathLike[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a stream exceeding OPENAI_TIMEOUT yields a truncated report
+    that is not stored in the response cache."""
+    monkeypatch.setenv("OPENAI_STREAM", "true")
+    monkeypatch.setenv("LLM_CACHE_DIR", os.path.join(tmp_path, "llm"))
+    mock_check_env_vars.return_value = valid_env()
+
+    def slow_chunks() -> object:
+        yield _stream_chunk("partial")
+        time.sleep(0.1)
+        yield _stream_chunk(" rest")
+        yield _stream_chunk(" never")
+
+    create = mock_openai.return_value.chat.completions.create
+    create.side_effect = lambda **kwargs: MagicMock(
+        __iter__=MagicMock(side_effect=slow_chunks)
+    )
+    commits = [CommitRecord("abc", "msg", "a", "", None)]
+
+    stream_path = os.path.join(tmp_path, "report.md")
+    reporter = DailyReporter()
+    reporter.openai_timeout = 0.05
+    report = reporter.analyze_commits_with_gpt(commits, stream_path)
+
+    assert report.startswith("partial rest")
+    assert "never" not in report
+    assert "Report truncated" in report
+    assert reporter.openai_metrics[0]["finished"] is False
+    reporter.analyze_commits_with_gpt(commits, stream_path)
+    assert create.call_count == 2
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_run_writes_outputs_while_email_in_flight(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    github_output_path: str,  # pylint: disable=redefined-outer-name
+) -> None:
+    """Test that the Actions output is written before the email delivery finishes."""
+    mock_check_env_vars.return_value = valid_env(github_output_path=github_output_path)
+    mock_github.return_value.get_repo.return_value = _mock_repo("owner/repo", "msg")
+    mock_openai.return_value.chat.completions.create.return_value.choices = [
+        MagicMock(message=MagicMock(content="Test-Report"))
+    ]
+    seen_during_email: list[str] = []
+
+    def slow_send_email(*_args: str) -> None:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with open(github_output_path, encoding="utf-8") as f:
+                content = f.read()
+            if "report<<EOF" in content:
+                seen_during_email.append(content)
+                return
+            time.sleep(0.01)
+
+    reporter = DailyReporter()
+    with (
+        patch.object(reporter, "send_email", side_effect=slow_send_email),
+        patch("sys.exit", side_effect=SystemExit),
+    ):
+        with pytest.raises(SystemExit):
+            reporter.run()
+
+    assert seen_during_email
+    assert "Test-Report" in seen_during_email[0]
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_run_writes_profile(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    github_output_path: str,  # pylint: disable=redefined-outer-name
+    tmp_path: os.PathLike[str],
+) -> None:
+    """Test that a run writes its timings and counters to PROFILE_FILE and output."""
+    profile_file = os.path.join(tmp_path, "profile.json")
+    env = valid_env(github_output_path=github_output_path)
+    mock_check_env_vars.return_value = env
+    mock_github.return_value.get_repo.return_value = _mock_repo("owner/repo", "fix")
+    response = mock_openai.return_value.chat.completions.create.return_value
+    response.choices = [MagicMock(message=MagicMock(content="Report"))]
+    response.usage.prompt_tokens = 42
+    response.usage.completion_tokens = 7
+    response.model_dump_json.return_value = '{"id": "chatcmpl-1"}'
+
+    with (
+        patch.dict(os.environ, {**env, "PROFILE_FILE": profile_file}),
+        patch("builtins.print"),
+        patch("sys.exit", side_effect=SystemExit),
+        patch("daily_report.daily_reporter.smtplib.SMTP"),
+    ):
+        with pytest.raises(SystemExit):
+            DailyReporter().run()
+
+    with open(profile_file, encoding="utf-8") as fh:
+        profile = json.load(fh)
+    for stage in ("env_check", "github_commits", "analyze", "openai_request"):
+        assert profile["stages"][stage]["calls"] == 1
+    assert {"render_markdown", "smtp_connect", "smtp_send"} <= set(profile["stages"])
+    assert profile["counters"]["commits"] == 1
+    assert profile["counters"]["openai_prompt_tokens"] == 42
+    assert profile["counters"]["openai_completion_tokens"] == 7
+    assert profile["counters"]["openai_response_bytes"] == 20
+    assert profile["counters"]["openai_request_bytes"] > 0
+    with open(github_output_path, encoding="utf-8") as fh:
+        assert 'profile={"started_at":' in fh.read()
+
+
+@patch("daily_report.resilience.time.sleep")
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_send_email_retries_transient_smtp_errors(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,  # pylint: disable=unused-argument
+    mock_check_env_vars: MagicMock,
+    mock_sleep: MagicMock,
+) -> None:
+    """Test that an SMTP 4xx reply is retried instead of failing the delivery."""
+    mock_check_env_vars.return_value = valid_env()
+    reporter = DailyReporter()
+    with (
+        patch("daily_report.daily_reporter.smtplib.SMTP") as mock_smtp,
+        patch("sys.stderr"),
+    ):
+        server = mock_smtp.return_value.__enter__.return_value
+        server.sendmail.side_effect = [
+            smtplib.SMTPResponseException(451, b"try again later"),
+            {},
+        ]
+        reporter.send_email("subject", "body")
+
+    assert server.sendmail.call_count == 2
+    mock_sleep.assert_called_once()
+    assert reporter.breakers["smtp"].retries == 1
@@ -0,0 +1,83 @@
+"""Unit tests for the diffstat enrichment of commits."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+from github.GithubException import GithubException
+
+from daily_report.commit_record import CommitRecord
+from daily_report.enrichment import DiffstatEnricher, format_diffstat
+from daily_report.request_scheduler import RequestScheduler
+
+
+def _file(name: str, additions: int, deletions: int) -> MagicMock:
+    file = MagicMock(additions=additions, deletions=deletions)
+    file.filename = name
+    file.changes = additions + deletions
+    return file
+
+
+def _repo() -> MagicMock:
+    repo = MagicMock(full_name="owner/repo")
+    api_commit = repo.get_commit.return_value
+    api_commit.files = [_file("a.py", 1, 0), _file("b.py", 10, 2), _file("c.py", 0, 5)]
+    api_commit.stats.additions = 11
+    api_commit.stats.deletions = 7
+    return repo
+
+
+def _enricher(cache_dir: str = "", max_commits: int = 10) -> DiffstatEnricher:
+    scheduler = RequestScheduler(reserve=100, cache_dir=cache_dir)
+    return DiffstatEnricher(
+        scheduler, max_workers=2, max_commits=max_commits, max_files=2
+    )
+
+
+def test_format_diffstat() -> None:
+    """Test the compact diffstat format."""
+    assert format_diffstat(3, 1, [], more=False) == "+3 -1"
+    assert format_diffstat(3, 1, [("a.py", 3, 1)], more=True) == "+3 -1: a.py +3 -1, …"
+
+
+def test_enrich_lists_largest_files() -> None:
+    """Test that the largest files are listed and the rest is elided."""
+    commit = CommitRecord("abc", "msg", "dev", "", None)
+
+    _enricher().enrich(_repo(), [commit])
+
+    assert commit.diffstat == "+11 -7: b.py +10 -2, c.py +0 -5, …"
+
+
+def test_enrich_respects_commit_cap() -> None:
+    """Test that only the newest max_commits commits are fetched."""
+    repo = _repo()
+    commits = [CommitRecord(str(i), "msg", "dev", "", None) for i in range(5)]
+
+    _enricher(max_commits=2).enrich(repo, commits)
+
+    assert repo.get_commit.call_count == 2
+    assert [bool(c.diffstat) for c in commits] == [True, True, False, False, False]
+
+
+def test_enrich_caches_by_sha(tmp_path: os.PathLike[str]) -> None:
+    """Test that a cached diffstat is reused without a request."""
+    repo = _repo()
+    _enricher(str(tmp_path)).enrich(repo, [CommitRecord("abc", "m", "d", "", None)])
+    commit = CommitRecord("abc", "m", "d", "", None)
+
+    _enricher(str(tmp_path)).enrich(repo, [commit])
+
+    repo.get_commit.assert_called_once_with("abc")
+    assert commit.diffstat.startswith("+11 -7")
+
+
+def test_enrich_skips_failed_requests() -> None:
+    """Test that a failing request leaves the commit without a diffstat."""
+    repo = _repo()
+    repo.get_commit.side_effect = GithubException(404, {"message": "Not Found"})
+    commit = CommitRecord("abc", "msg", "dev", "", None)
+
+    with patch("builtins.print"):
+        _enricher().enrich(repo, [commit])
+
+    assert commit.diffstat == ""
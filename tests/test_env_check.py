@@ -6,7 +6,15 @@ from unittest.mock import MagicMock, patch
 import pytest
 from github.GithubException import GithubException
 
-from daily_report.env_check import EnvCheckError, check_env_vars
+from daily_report.env_check import (
+    EnvCheckError,
+    GithubSession,
+    check_env_vars,
+    check_optional_env_vars,
+    env_flag,
+    github_api_url,
+    parse_repo_names,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -42,7 +50,7 @@ def valid_env() -> dict[str, str]:
     }
 
 
-@patch("daily_report.env_check.Github")
+@patch("github.Github")
 def test_check_env_vars_success(
     mock_github: MagicMock,
     monkeypatch: pytest.MonkeyPatch,  # pylint: disable=unused-argument
@@ -58,7 +66,7 @@ def test_check_env_vars_success(
     assert result == env
 
 
-@patch("daily_report.env_check.Github")
+@patch("github.Github")
 def test_missing_env_vars_raises(
     mock_github: MagicMock,  # pylint: disable=unused-argument
     monkeypatch: pytest.MonkeyPatch,  # pylint: disable=unused-argument
@@ -73,7 +81,7 @@ def test_missing_env_vars_raises(
     assert "REPO_NAME is not set." in str(excinfo.value)
 
 
-@patch("daily_report.env_check.Github")
+@patch("github.Github")
 def test_invalid_repo_raises(
     mock_github: MagicMock,
     monkeypatch: pytest.MonkeyPatch,  # pylint: disable=unused-argument
@@ -92,7 +100,7 @@ def test_invalid_repo_raises(
     assert "invalid or not accessible" in str(excinfo.value)
 
 
-@patch("daily_report.env_check.Github")
+@patch("github.Github")
 def test_invalid_smtp_port_nonint(
     mock_github: MagicMock,
     monkeypatch: pytest.MonkeyPatch,  # pylint: disable=unused-argument
@@ -108,7 +116,7 @@ def test_invalid_smtp_port_nonint(
     assert "SMTP_PORT 'abc' is not a number." in str(excinfo.value)
 
 
-@patch("daily_report.env_check.Github")
+@patch("github.Github")
 def test_invalid_smtp_port_range(
     mock_github: MagicMock,
     monkeypatch: pytest.MonkeyPatch,  # pylint: disable=unused-argument
@@ -124,7 +132,7 @@ def test_invalid_smtp_port_range(
     assert "SMTP_PORT '70000' is not a valid port number." in str(excinfo.value)
 
 
-@patch("daily_report.env_check.Github")
+@patch("github.Github")
 def test_all_env_vars_missing(
     mock_github: MagicMock,  # pylint: disable=unused-argument
     monkeypatch: pytest.MonkeyPatch,  # pylint: disable=unused-argument
@@ -144,3 +152,161 @@ def test_all_env_vars_missing(
     assert "OPENAI_API_KEY is not set." in msg
     assert "SMTP_SERVER is not set." in msg
     assert "SMTP_PORT is not set." in msg
+
+
+def test_parse_repo_names() -> None:
+    """Test that REPO_NAME lists are split on commas and whitespace without duplicates."""
+    assert parse_repo_names("owner/repo") == ["owner/repo"]
+    assert parse_repo_names(" a/b, c/d\ne/*  a/b,") == ["a/b", "c/d", "e/*"]
+
+
+@patch("github.Github")
+def test_check_env_vars_multiple_repos(
+    mock_github: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,  # pylint: disable=unused-argument
+) -> None:
+    """Test that every listed repository is probed, but 'owner/*' selectors are not."""
+    env = valid_env()
+    env["REPO_NAME"] = "owner/one,owner/two,org/*"
+    for k, v in env.items():
+        os.environ[k] = v
+    mock_github.return_value.get_repo.side_effect = [
+        MagicMock(),
+        GithubException(404, "not found", None),
+    ]
+    with pytest.raises(EnvCheckError) as excinfo:
+        check_env_vars()
+    assert mock_github.return_value.get_repo.call_count == 2
+    assert "REPO_NAME 'owner/two' is invalid" in str(excinfo.value)
+
+
+def test_check_optional_env_vars(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that optional variables fall back to defaults and are validated."""
+    monkeypatch.delenv("MAX_WORKERS", raising=False)
+    assert check_optional_env_vars()["MAX_WORKERS"] == "4"
+
+    monkeypatch.setenv("MAX_WORKERS", "0")
+    with pytest.raises(EnvCheckError, match="must be a positive number"):
+        check_optional_env_vars()
+
+    monkeypatch.setenv("MAX_WORKERS", "many")
+    with pytest.raises(EnvCheckError, match="is not a number"):
+        check_optional_env_vars()
+
+
+def test_check_optional_env_vars_choice(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that choice variables only accept their allowed values."""
+    monkeypatch.setenv("COLLECTOR_BACKEND", "graphql")
+    assert check_optional_env_vars()["COLLECTOR_BACKEND"] == "graphql"
+
+    monkeypatch.setenv("COLLECTOR_BACKEND", "soap")
+    with pytest.raises(EnvCheckError, match="must be one of: rest, graphql"):
+        check_optional_env_vars()
+
+
+@patch("github.Github")
+def test_check_env_vars_fills_session(
+    mock_github: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,  # pylint: disable=unused-argument
+) -> None:
+    """Test that the validated client and repository are kept in the session."""
+    env = valid_env()
+    for k, v in env.items():
+        os.environ[k] = v
+    session = GithubSession()
+
+    check_env_vars(session=session)
+
+    assert session.client is mock_github.return_value
+    # Retries are left to the resilience layer of the Daily Reporter.
+    assert mock_github.call_args.kwargs["retry"] is None
+    assert (
+        session.get_repo("owner/repo") is mock_github.return_value.get_repo.return_value
+    )
+    mock_github.return_value.get_repo.assert_called_once_with("owner/repo")
+
+
+@patch("github.Github")
+def test_check_env_vars_without_probe(
+    mock_github: MagicMock,
+    monkeypatch: pytest.MonkeyPatch,  # pylint: disable=unused-argument
+) -> None:
+    """Test that probe=False skips the network plausibility check."""
+    env = valid_env()
+    for k, v in env.items():
+        os.environ[k] = v
+
+    assert check_env_vars(probe=False) == env
+    mock_github.assert_not_called()
+
+
+def test_github_session_requires_connect() -> None:
+    """Test that repository lookups fail before the session is connected."""
+    with pytest.raises(ValueError, match="not connected"):
+        GithubSession().get_repo("owner/repo")
+
+
+def test_github_api_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that GITHUB_API_URL overrides the public GitHub API."""
+    monkeypatch.delenv("GITHUB_API_URL", raising=False)
+    assert github_api_url() == "https://api.github.com"
+    monkeypatch.setenv("GITHUB_API_URL", "https://ghe.example.com/api/v3/")
+    assert github_api_url() == "https://ghe.example.com/api/v3"
+
+
+def test_check_optional_env_vars_bool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that boolean variables are validated and interpreted."""
+    monkeypatch.setenv("SKIP_REPO_CHECK", "Yes")
+    assert env_flag(check_optional_env_vars()["SKIP_REPO_CHECK"])
+
+    monkeypatch.setenv("SKIP_REPO_CHECK", "maybe")
+    with pytest.raises(EnvCheckError, match="is not a boolean"):
+        check_optional_env_vars()
+
+
+def test_commit_memo_requires_cache_dir(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that COMMIT_MEMO is rejected without a response cache directory."""
+    monkeypatch.setenv("COMMIT_MEMO", "true")
+    monkeypatch.delenv("LLM_CACHE_DIR", raising=False)
+    with pytest.raises(EnvCheckError, match="COMMIT_MEMO requires LLM_CACHE_DIR"):
+        check_optional_env_vars()
+
+
+def test_invalid_email_routes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that malformed EMAIL_ROUTES entries are reported."""
+    monkeypatch.setenv("EMAIL_ROUTES", "owner/repo without addresses")
+    with pytest.raises(EnvCheckError, match="EMAIL_ROUTES is invalid"):
+        check_optional_env_vars()
+
+
+def test_invalid_email_templates(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that malformed or missing EMAIL_TEMPLATES entries are reported."""
+    monkeypatch.setenv("EMAIL_TEMPLATES", "owner/repo")
+    with pytest.raises(EnvCheckError, match="EMAIL_TEMPLATES is invalid"):
+        check_optional_env_vars()
+    monkeypatch.setenv("EMAIL_TEMPLATES", "owner/repo: missing/template.html")
+    with pytest.raises(EnvCheckError, match="'missing/template.html' does not"):
+        check_optional_env_vars()
+
+
+def test_invalid_output_sinks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that unknown sinks, missing sink settings and bad retries are reported."""
+    monkeypatch.setenv("OUTPUT_SINKS", "email, pager, slack, s3")
+    monkeypatch.setenv("S3_BUCKET", "reports")
+    monkeypatch.setenv("SINK_RETRIES", "-1")
+    with pytest.raises(EnvCheckError) as exc_info:
+        check_optional_env_vars()
+    assert str(exc_info.value).splitlines() == [
+        "SINK_RETRIES '-1' must be zero or a positive number.",
+        "OUTPUT_SINKS 'pager' must be one of: email, file, github_output, slack, teams, s3.",
+        "OUTPUT_SINKS 'slack' requires SLACK_WEBHOOK_URL to be set.",
+        "OUTPUT_SINKS 's3' requires S3_ACCESS_KEY_ID to be set.",
+        "OUTPUT_SINKS 's3' requires S3_SECRET_ACCESS_KEY to be set.",
+    ]
+
+
+def test_invalid_exclude_message_pattern(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an invalid EXCLUDE_MESSAGE_PATTERN regex is reported."""
+    monkeypatch.setenv("EXCLUDE_MESSAGE_PATTERN", "[skip ci")
+    with pytest.raises(EnvCheckError, match="not a valid regex"):
+        check_optional_env_vars()
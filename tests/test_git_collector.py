@@ -0,0 +1,128 @@
+"""Unit tests for the local git clone commit collector."""
+
+import os
+import shutil
+import subprocess
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from daily_report.git_collector import (
+    GitCollectorError,
+    branch_ref,
+    iter_commits_git,
+    iter_log,
+    update_clone,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git required")
+
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _git(path: str, *args: str, date: str = "2024-01-02T12:00:00+00:00") -> None:
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME="dev",
+        GIT_AUTHOR_EMAIL="dev@example.com",
+        GIT_COMMITTER_NAME="dev",
+        GIT_COMMITTER_EMAIL="dev@example.com",
+        GIT_AUTHOR_DATE=date,
+        GIT_COMMITTER_DATE=date,
+    )
+    subprocess.run(["git", "-C", path, *args], env=env, check=True, capture_output=True)
+
+
+@pytest.fixture(name="origin")
+def fixture_origin(tmp_path: os.PathLike[str]) -> str:
+    """Create an upstream repository with an old and two recent commits."""
+    path = os.path.join(tmp_path, "origin")
+    os.makedirs(path)
+    _git(path, "init", "--quiet")
+    _git(path, "commit", "--allow-empty", "-m", "old", date="2023-06-01T00:00:00Z")
+    _git(path, "commit", "--allow-empty", "-m", "first\n\nbody")
+    _git(path, "commit", "--allow-empty", "-m", "second")
+    return path
+
+
+def _repo(origin: str) -> MagicMock:
+    repo = MagicMock()
+    repo.clone_url = origin
+    repo.html_url = "https://github.com/owner/repo"
+    return repo
+
+
+def test_iter_commits_git(origin: str, tmp_path: os.PathLike[str]) -> None:
+    """Test that commits since the date are read from a fresh clone, newest first."""
+    clone = os.path.join(tmp_path, "clones", "repo.git")
+
+    commits = list(iter_commits_git(_repo(origin), clone, SINCE))
+
+    assert [c.message for c in commits] == ["second", "first\n\nbody"]
+    assert commits[0].author == "dev"
+    assert commits[0].date == datetime(2024, 1, 2, 12, tzinfo=timezone.utc)
+    assert commits[0].url == f"https://github.com/owner/repo/commit/{commits[0].sha}"
+    assert not commits[0].is_merge
+
+
+def test_iter_commits_git_fetches_incrementally(
+    origin: str, tmp_path: os.PathLike[str]
+) -> None:
+    """Test that an existing clone is updated with new commits."""
+    clone = os.path.join(tmp_path, "repo.git")
+    list(iter_commits_git(_repo(origin), clone, SINCE))
+    _git(origin, "commit", "--allow-empty", "-m", "third")
+
+    commits = list(iter_commits_git(_repo(origin), clone, SINCE))
+
+    assert [c.message for c in commits] == ["third", "second", "first\n\nbody"]
+
+
+def test_iter_commits_git_limits_to_path(
+    origin: str, tmp_path: os.PathLike[str]
+) -> None:
+    """Test that commit_path restricts the log to commits touching the path."""
+    with open(os.path.join(origin, "app.py"), "w", encoding="utf-8") as fh:
+        fh.write("print()\n")
+    _git(origin, "add", "app.py")
+    _git(origin, "commit", "-m", "add app")
+
+    commits = list(
+        iter_commits_git(
+            _repo(origin), os.path.join(tmp_path, "c.git"), SINCE, commit_path="app.py"
+        )
+    )
+
+    assert [c.message for c in commits] == ["add app"]
+
+
+def test_update_clone_fetches_branches(origin: str, tmp_path: os.PathLike[str]) -> None:
+    """Test that further branches are fetched into their own refs in one fetch."""
+    _git(origin, "checkout", "--quiet", "-b", "release/1.0")
+    _git(origin, "commit", "--allow-empty", "-m", "fix on release")
+    _git(origin, "checkout", "--quiet", "-")
+    clone = os.path.join(tmp_path, "repo.git")
+
+    update_clone(origin, clone, branches=["release/1.0"])
+
+    release = list(iter_log(clone, SINCE, ref=branch_ref("release/1.0")))
+    default = list(iter_log(clone, SINCE, ref=branch_ref("")))
+    assert [c.message for c in release] == ["fix on release", "second", "first\n\nbody"]
+    assert [c.message for c in default] == ["second", "first\n\nbody"]
+
+
+def test_iter_log_can_stop_early(origin: str, tmp_path: os.PathLike[str]) -> None:
+    """Test that the log stream can be abandoned after the first record."""
+    clone = os.path.join(tmp_path, "repo.git")
+    update_clone(origin, clone)
+
+    log = iter_log(clone, SINCE)
+    assert next(log).message == "second"
+    log.close()
+
+
+def test_update_clone_fails_for_unknown_remote(tmp_path: os.PathLike[str]) -> None:
+    """Test that git failures are reported as GitCollectorError."""
+    with pytest.raises(GitCollectorError, match="git fetch failed"):
+        update_clone(os.path.join(tmp_path, "missing"), os.path.join(tmp_path, "c"))
@@ -10,8 +10,8 @@ from tests.conftest import valid_env
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 @patch("daily_report.daily_reporter.smtplib.SMTP")
 def test_github_output_written(
     mock_smtp: MagicMock,  # pylint: disable=unused-argument
@@ -51,8 +51,8 @@ def test_github_output_written(
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 @patch("daily_report.daily_reporter.smtplib.SMTP")
 def test_multiline_github_output(
     mock_smtp: MagicMock,  # pylint: disable=unused-argument
@@ -91,3 +91,40 @@ def test_multiline_github_output(
         assert "report<<EOF" in content
         assert "Test-Report" in content
         assert "\nEOF" in content
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_stream_without_file_sink_writes_no_file(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    tmp_path: os.PathLike[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that OPENAI_STREAM does not create a report file when the file sink
+    is not configured."""
+    monkeypatch.chdir(tmp_path)
+    output_path = os.path.join(tmp_path, "output")
+    monkeypatch.setenv("OPENAI_STREAM", "true")
+    monkeypatch.setenv("OUTPUT_SINKS", "github_output")
+    monkeypatch.setenv("GITHUB_OUTPUT", output_path)
+    mock_check_env_vars.return_value = valid_env(github_output_path=output_path)
+
+    mock_commit = MagicMock(sha="abc1234", html_url="http://example.com")
+    mock_commit.commit.message = "fix: bug"
+    mock_commit.commit.author.name = "dev"
+    mock_github.return_value.get_repo.return_value.get_commits.return_value = [
+        mock_commit
+    ]
+    create = mock_openai.return_value.chat.completions.create
+    create.return_value.choices = [MagicMock(message=MagicMock(content="Test-Report"))]
+
+    with pytest.raises(SystemExit):
+        DailyReporter().run()
+
+    assert "stream" not in create.call_args.kwargs
+    assert os.listdir(tmp_path) == ["output"]
+    with open(output_path, encoding="utf-8") as fh:
+        assert "Test-Report" in fh.read()
@@ -0,0 +1,75 @@
+"""Unit tests for the GraphQL commit collector."""
+
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import MagicMock
+
+from daily_report.graphql_collector import iter_commits_graphql
+
+
+def _page(
+    oids: list[str], end_cursor: str | None, field: str = "defaultBranchRef"
+) -> tuple[dict[str, Any], Any]:
+    """Return a fake GraphQL history response containing the given commits."""
+    nodes = [
+        {
+            "oid": oid,
+            "message": f"msg {oid}",
+            "url": f"https://github.com/owner/repo/commit/{oid}",
+            "author": {"name": "dev", "date": "2024-01-01T12:00:00Z"},
+        }
+        for oid in oids
+    ]
+    history = {
+        "pageInfo": {"hasNextPage": end_cursor is not None, "endCursor": end_cursor},
+        "nodes": nodes,
+    }
+    data = {"data": {"repository": {field: {"target": {"history": history}}}}}
+    return {}, data
+
+
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_iter_commits_graphql_paginates() -> None:
+    """Test that all history pages are fetched and converted to commit records."""
+    github = MagicMock()
+    github.requester.graphql_query.side_effect = [
+        _page(["a", "b"], "cursor1"),
+        _page(["c"], None),
+    ]
+
+    commits = list(iter_commits_graphql(github, "owner/repo", SINCE))
+
+    assert [c.sha for c in commits] == ["a", "b", "c"]
+    assert commits[0].author == "dev"
+    assert commits[0].date == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    variables = github.requester.graphql_query.call_args_list[1].args[1]
+    assert variables["owner"] == "owner"
+    assert variables["name"] == "repo"
+    assert variables["after"] == "cursor1"
+    assert variables["since"] == SINCE.isoformat()
+    assert variables["path"] is None
+
+
+def test_iter_commits_graphql_empty_repository() -> None:
+    """Test that a repository without a default branch yields no commits."""
+    github = MagicMock()
+    github.requester.graphql_query.return_value = (
+        {},
+        {"data": {"repository": {"defaultBranchRef": None}}},
+    )
+    assert not list(iter_commits_graphql(github, "owner/repo", SINCE))
+
+
+def test_iter_commits_graphql_branch() -> None:
+    """Test that a named branch is read through its qualified ref."""
+    github = MagicMock()
+    github.requester.graphql_query.side_effect = [_page(["a"], None, field="ref")]
+
+    commits = list(iter_commits_graphql(github, "owner/repo", SINCE, branch="hotfix"))
+
+    assert [c.sha for c in commits] == ["a"]
+    query, variables = github.requester.graphql_query.call_args.args
+    assert "ref(qualifiedName: $ref)" in query
+    assert variables["ref"] == "refs/heads/hotfix"
@@ -24,8 +24,8 @@ def valid_env() -> dict[str, str]:
 
 @patch("daily_report.daily_reporter.check_env_vars")
 @patch("daily_report.daily_reporter.smtplib.SMTP")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 def test_send_email_markdown_to_html_and_attachment(
     mock_openai: MagicMock,
     mock_github: MagicMock,
@@ -52,20 +52,19 @@ def test_send_email_markdown_to_html_and_attachment(
 
     reporter = DailyReporter()
 
-    # Patch markdown.markdown to return valid HTML
-    with patch(
-        "daily_report.daily_reporter.markdown.markdown", return_value="<p>Test</p>"
-    ) as mock_md:
+    # Patch the Markdown converter to return valid HTML
+    with patch("markdown.Markdown") as mock_md:
+        mock_md.return_value.convert.return_value = "<p>Test</p>"
         reporter.send_email("subject", "# Test Markdown")
-        mock_md.assert_called_once_with("# Test Markdown")
+        mock_md.return_value.convert.assert_called_once_with("# Test Markdown")
         # SMTP sendmail should be called
         assert mock_smtp.return_value.__enter__.return_value.sendmail.called
 
 
 @patch("daily_report.daily_reporter.check_env_vars")
 @patch("daily_report.daily_reporter.smtplib.SMTP")
-@patch("daily_report.daily_reporter.Github")
-@patch("daily_report.daily_reporter.OpenAI")
+@patch("github.Github")
+@patch("openai.OpenAI")
 def test_send_email_markdown_to_html_empty_raises(
     mock_openai: MagicMock,
     mock_github: MagicMock,
@@ -91,7 +90,8 @@ def test_send_email_markdown_to_html_empty_raises(
     mock_github.return_value.get_repo.return_value = mock_repo
 
     reporter = DailyReporter()
-    # Patch markdown.markdown to return empty string
-    with patch("daily_report.daily_reporter.markdown.markdown", return_value=""):
+    # Patch the Markdown converter to return an empty string
+    with patch("markdown.Markdown") as mock_md:
+        mock_md.return_value.convert.return_value = ""
         with pytest.raises(ValueError, match="Failed to convert Markdown to HTML."):
             reporter.send_email("subject", "# Test Markdown")
@@ -0,0 +1,114 @@
+"""Unit tests for the persistent SMTP mailer and recipient routing."""
+
+import email
+import email.policy
+import smtplib
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from daily_report.mailer import (
+    SmtpMailer,
+    compose_message,
+    parse_addresses,
+    parse_routes,
+    recipients_for,
+)
+
+
+def test_parse_addresses() -> None:
+    """Test that address lists are split on commas, semicolons and whitespace."""
+    assert parse_addresses("a@x.com") == ["a@x.com"]
+    assert parse_addresses(" a@x.com, b@x.com;c@x.com a@x.com") == [
+        "a@x.com",
+        "b@x.com",
+        "c@x.com",
+    ]
+
+
+def test_compose_message() -> None:
+    """Test that the headers are encoded and put in front of the MIME body."""
+    body = b"Content-Type: text/plain\r\nMIME-Version: 1.0\r\n\r\nReport\r\n"
+    message = compose_message({"Subject": "Report – today", "To": "a@x.com"}, body)
+    assert message.startswith(b"Subject: Report =?utf-8?")
+    assert message.endswith(b"?= today\r\nTo: a@x.com\r\n" + body)
+    parsed = email.message_from_bytes(message, policy=email.policy.default)
+    assert parsed["Subject"] == "Report – today"
+    assert parsed.get_content() == "Report\r\n"
+
+
+def test_parse_routes_and_recipients_for() -> None:
+    """Test that matching routes add their addresses to the default receivers."""
+    routes = parse_routes("owner/repo: team@x.com\n\n  org/*: leads@x.com, a@x.com\n")
+    assert routes == [
+        ("owner/repo", ["team@x.com"]),
+        ("org/*", ["leads@x.com", "a@x.com"]),
+    ]
+
+    assert recipients_for("Org/Tool", ["a@x.com"], routes) == ["a@x.com", "leads@x.com"]
+    assert recipients_for("owner/repo", ["a@x.com"], routes) == [
+        "a@x.com",
+        "team@x.com",
+    ]
+    assert recipients_for("other/repo", ["a@x.com"], routes) == ["a@x.com"]
+
+
+def test_parse_routes_rejects_invalid_lines() -> None:
+    """Test that route lines without pattern or addresses are rejected."""
+    with pytest.raises(ValueError, match="Invalid email route"):
+        parse_routes("owner/repo")
+    with pytest.raises(ValueError, match="Invalid email route"):
+        parse_routes(": a@x.com")
+
+
+@patch("daily_report.mailer.smtplib.SMTP")
+def test_mailer_reuses_connection(mock_smtp: MagicMock) -> None:
+    """Test that several messages are sent over one authenticated connection."""
+    server = mock_smtp.return_value.__enter__.return_value
+    with SmtpMailer("smtp.example.com", 587, "user", "pw") as mailer:
+        mailer.send("s@x.com", ["a@x.com"], "one")
+        mailer.send("s@x.com", ["a@x.com", "b@x.com"], "two")
+
+    mock_smtp.assert_called_once_with("smtp.example.com", port=587, timeout=60.0)
+    server.login.assert_called_once_with("user", "pw")
+    assert server.sendmail.call_count == 2
+    mock_smtp.return_value.__exit__.assert_called_once()
+
+
+@patch("daily_report.mailer.smtplib.SMTP")
+def test_mailer_reconnects_after_disconnect(mock_smtp: MagicMock) -> None:
+    """Test that a dropped connection is reopened once and the message resent."""
+    server = mock_smtp.return_value.__enter__.return_value
+    server.sendmail.side_effect = [smtplib.SMTPServerDisconnected("gone"), None]
+    with SmtpMailer("smtp.example.com", 587, "user", "pw") as mailer:
+        mailer.send("s@x.com", ["a@x.com"], "one")
+
+    assert mock_smtp.call_count == 2
+    assert server.sendmail.call_count == 2
+
+
+@patch("daily_report.mailer.smtplib.SMTP")
+def test_mailer_close_does_not_wait_for_send(mock_smtp: MagicMock) -> None:
+    """Test that close() returns while a send hangs, and the send closes the
+    connection once it is done."""
+    started, release = threading.Event(), threading.Event()
+
+    def hanging_sendmail(*_args: object) -> None:
+        started.set()
+        release.wait(5)
+
+    mock_smtp.return_value.__enter__.return_value.sendmail.side_effect = (
+        hanging_sendmail
+    )
+    mailer = SmtpMailer("smtp.example.com", 587, "user", "pw")
+    sender = threading.Thread(target=mailer.send, args=("s@x.com", ["a@x.com"], "m"))
+    sender.start()
+    assert started.wait(5)
+
+    mailer.close()
+    mock_smtp.return_value.__exit__.assert_not_called()
+
+    release.set()
+    sender.join(5)
+    mock_smtp.return_value.__exit__.assert_called_once()
@@ -0,0 +1,53 @@
+"""Unit tests for the run profile."""
+
+import json
+import os
+
+import pytest
+
+from daily_report.profiling import RunProfile
+
+
+def test_stage_records_calls_and_durations() -> None:
+    """Test that each stage call adds to the call count and the durations."""
+    profile = RunProfile()
+    profile.record("openai_request", 0.5)
+    profile.record("openai_request", 1.5)
+    assert profile.call("render_markdown", str.upper, "x") == "X"
+
+    stages = profile.to_dict()["stages"]
+
+    assert stages["openai_request"] == {
+        "calls": 2,
+        "total_seconds": 2.0,
+        "max_seconds": 1.5,
+    }
+    assert stages["render_markdown"]["calls"] == 1
+
+
+def test_stage_records_failed_calls() -> None:
+    """Test that a stage that raises is still timed."""
+    profile = RunProfile()
+    with pytest.raises(ValueError):
+        with profile.stage("smtp_send"):
+            raise ValueError("boom")
+
+    assert profile.stages["smtp_send"]["calls"] == 1
+
+
+def test_save_writes_counters_and_extra(tmp_path: os.PathLike[str]) -> None:
+    """Test that the saved profile contains the counters and the extra fields."""
+    profile = RunProfile()
+    profile.count("openai_requests")
+    profile.count("openai_prompt_tokens", 120)
+    profile.count("openai_prompt_tokens", 30)
+    profile.extra["github_requests"] = {"requests": 3}
+    path = os.path.join(tmp_path, "out", "profile.json")
+
+    profile.save(path)
+
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    assert data["counters"] == {"openai_prompt_tokens": 150, "openai_requests": 1}
+    assert data["github_requests"] == {"requests": 3}
+    assert "\n" not in profile.to_json()
@@ -0,0 +1,144 @@
+"""Unit tests for the report renderer."""
+
+import asyncio
+import base64
+import email
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from daily_report.daily_reporter import DailyReporter
+from daily_report.rendering import (
+    HTML_TEMPLATE,
+    RenderedReport,
+    ReportRenderer,
+    inline_styles,
+    parse_templates,
+)
+from tests.conftest import valid_env
+
+
+def test_render_reuses_converter() -> None:
+    """Test that one Markdown converter is created and reset between reports."""
+    renderer = ReportRenderer()
+    with patch("markdown.Markdown") as mock_md:
+        mock_md.return_value.convert.side_effect = ["<p>one</p>", "<p>two</p>"]
+        first = renderer.render("one", "Report 1")
+        second = renderer.render("two", "Report 2")
+    mock_md.assert_called_once_with()
+    assert mock_md.return_value.reset.call_count == 2
+    assert '<p style="margin:0 0 12px;">one</p>' in first.html
+    assert '<p style="margin:0 0 12px;">two</p>' in second.html
+
+
+def test_render_report() -> None:
+    """Test that a report is rendered into text, HTML and its Markdown."""
+    report = ReportRenderer().render("# Summary\n\n- [a](https://x) <b>", "A & B")
+    assert report.markdown == "# Summary\n\n- [a](https://x) <b>"
+    assert report.text == report.markdown
+    assert "<title>A &amp; B</title>" in report.html
+    assert '<h1 style="font-size:22px;margin:16px 0 8px;">Summary</h1>' in report.html
+    assert '<a style="color:#0969da;" href="https://x">a</a>' in report.html
+
+
+def test_render_empty_html_raises() -> None:
+    """Test that an empty conversion result raises a ValueError."""
+    with patch("markdown.Markdown") as mock_md:
+        mock_md.return_value.convert.return_value = ""
+        with pytest.raises(ValueError, match="Failed to convert Markdown to HTML."):
+            ReportRenderer().render("text", "title")
+
+
+def test_mime_body_is_built_once() -> None:
+    """Test that the MIME body is serialized once with CRLF line endings and
+    that the plain-text part and the attachment share one encoded payload."""
+    report = RenderedReport(
+        markdown="# Bericht – Ä", text="# Bericht – Ä", html="<p>x</p>"
+    )
+    body = report.mime_body()
+    assert report.mime_body() is body
+    assert b"\r\n" in body and b"\n" not in body.replace(b"\r\n", b"")
+
+    plain, html_part, attachment = email.message_from_bytes(body).get_payload()
+    encoded = base64.encodebytes("# Bericht – Ä".encode()).decode().strip()
+    assert plain.get_payload().strip() == encoded
+    assert attachment.get_payload().strip() == encoded
+    assert attachment.get_filename() == "report.md"
+    assert plain.get_payload(decode=True).decode() == "# Bericht – Ä"
+    assert html_part.get_payload(decode=True) == b"<p>x</p>"
+
+
+def test_mime_body_with_separate_text() -> None:
+    """Test that a plain text that differs from the report is encoded on its own."""
+    report = RenderedReport(markdown="# Report", text="Report", html="<p>x</p>")
+    plain, _html, attachment = email.message_from_bytes(
+        report.mime_body()
+    ).get_payload()
+    assert plain.get_payload(decode=True) == b"Report"
+    assert attachment.get_payload(decode=True) == b"# Report"
+
+
+def test_inline_styles_only_styles_known_tags() -> None:
+    """Test that only whole tag names receive inline styles."""
+    assert inline_styles("<pre><code>x</code></pre><param>") == (
+        '<pre style="margin:0 0 12px;padding:8px;background:#f6f8fa;overflow:auto;">'
+        '<code style="font-family:Consolas,Menlo,monospace;font-size:13px;">x</code>'
+        "</pre><param>"
+    )
+
+
+def test_parse_templates() -> None:
+    """Test that EMAIL_TEMPLATES is parsed into pattern and path pairs."""
+    assert parse_templates("owner/repo: a.html\n\n  org/*: b.html\n") == [
+        ("owner/repo", "a.html"),
+        ("org/*", "b.html"),
+    ]
+    with pytest.raises(ValueError, match="Invalid email template 'org/\\*'"):
+        parse_templates("org/*")
+
+
+def test_templates_per_repository(tmp_path: os.PathLike[str]) -> None:
+    """Test that the first matching template is used and others get the default."""
+    path = os.path.join(tmp_path, "team.html")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("<div>Team $repository: $title</div>$content $unknown")
+    renderer = ReportRenderer([("Org/*", path)])
+
+    assert renderer.html_template("other/repo") is HTML_TEMPLATE
+    report = renderer.render("text", "Title", "org/repo")
+    assert report.html == (
+        '<div>Team org/repo: Title</div><p style="margin:0 0 12px;">text</p> $unknown'
+    )
+
+
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("daily_report.daily_reporter.smtplib.SMTP")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_deliver_report_renders_once(
+    mock_openai: MagicMock,  # pylint: disable=unused-argument
+    mock_github: MagicMock,  # pylint: disable=unused-argument
+    mock_smtp: MagicMock,
+    mock_check_env_vars: MagicMock,
+) -> None:
+    """Test that a delivered report is rendered once for the email and the file."""
+    mock_check_env_vars.return_value = valid_env()
+    reporter = DailyReporter()
+
+    with (
+        patch("markdown.Markdown") as mock_md,
+        patch("daily_report.sinks.FileSink.send") as mock_save,
+    ):
+        mock_md.return_value.convert.return_value = "<p>Report</p>"
+        asyncio.run(
+            reporter._deliver_report(  # pylint: disable=protected-access
+                "owner/repo", [], "Report", "2024-01-01"
+            )
+        )
+
+    mock_md.return_value.convert.assert_called_once_with("Report")
+    assert reporter.profile.stages["render_markdown"]["calls"] == 1
+    assert mock_smtp.return_value.__enter__.return_value.sendmail.called
+    report = mock_save.call_args.args[0]
+    assert (report.filename, report.markdown) == ("2024-01-01-owner-repo.md", "Report")
@@ -0,0 +1,138 @@
+"""Unit tests for the rate-limit aware request scheduler."""
+
+import os
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from daily_report.request_scheduler import (
+    PAGE_SIZE,
+    RequestScheduler,
+    iter_commits_conditional,
+)
+
+
+def _item(sha: str) -> dict[str, Any]:
+    """Return a fake REST commit item."""
+    return {
+        "sha": sha,
+        "html_url": f"https://github.com/owner/repo/commit/{sha}",
+        "commit": {
+            "message": f"msg {sha}",
+            "author": {"name": "dev", "date": "2024-01-01T12:00:00Z"},
+        },
+    }
+
+
+def _github(remaining: int = 5000) -> MagicMock:
+    github = MagicMock()
+    github.requester.rate_limiting = (remaining, 5000)
+    return github
+
+
+def _scheduler(github: MagicMock, cache_dir: str = "") -> RequestScheduler:
+    scheduler = RequestScheduler(reserve=100, cache_dir=cache_dir)
+    scheduler.attach(github)
+    return scheduler
+
+
+def test_get_json_revalidates_with_etag(tmp_path: os.PathLike[str]) -> None:
+    """Test that a cached response is sent with If-None-Match and reused on 304."""
+    github = _github()
+    request = github.requester.requestJsonAndCheck
+    request.side_effect = [({"etag": 'W/"abc"'}, [_item("a")]), ({}, None)]
+    scheduler = _scheduler(github, str(tmp_path))
+
+    first = scheduler.get_json("/repos/owner/repo/commits", {"page": 1})
+    second = _scheduler(github, str(tmp_path)).get_json(
+        "/repos/owner/repo/commits", {"page": 1}
+    )
+
+    assert first == second == [_item("a")]
+    assert request.call_args_list[0].kwargs["headers"] == {}
+    assert request.call_args_list[1].kwargs["headers"] == {"If-None-Match": 'W/"abc"'}
+
+
+def test_attach_counts_requests_and_bytes() -> None:
+    """Test that every response is counted with its body bytes, 304 answers
+    separately, and that JSON inputs count as request bytes."""
+    github = _github()
+
+    def send(_verb: str, url: str, **_kwargs: Any) -> tuple[dict[str, str], Any]:
+        # Like PyGithub, pass the raw response to the debug hook.
+        status, body = (304, "") if url == "/unchanged" else (200, '{"a": "ä"}')
+        github.requester.DEBUG_ON_RESPONSE(status, {}, body)
+        return {}, None
+
+    github.requester.requestJsonAndCheck.side_effect = send
+    scheduler = _scheduler(github)
+
+    github.requester.requestJsonAndCheck("POST", "/graphql", input={"query": "{}"})
+    github.requester.requestJsonAndCheck("GET", "/unchanged")
+
+    assert scheduler.stats == {
+        "requests": 2,
+        "not_modified": 1,
+        "request_bytes": len('{"query": "{}"}'),
+        "response_bytes": len('{"a": "ä"}'.encode()),
+    }
+
+
+@patch("daily_report.request_scheduler.time.sleep")
+def test_get_json_waits_for_quota(mock_sleep: MagicMock) -> None:
+    """Test that requests wait for the reset when the quota is below the reserve."""
+    github = _github(remaining=10)
+    github.requester.rate_limiting_resettime = 1020
+    github.requester.requestJsonAndCheck.return_value = ({}, [])
+    scheduler = _scheduler(github)
+
+    with patch("daily_report.request_scheduler.time.time", return_value=1000.0):
+        with patch("builtins.print"):
+            scheduler.get_json("/repos/owner/repo/commits")
+
+    mock_sleep.assert_called_once_with(20.0)
+
+
+@patch("daily_report.request_scheduler.time.sleep")
+def test_attach_paces_all_requests(mock_sleep: MagicMock) -> None:
+    """Test that requests sent by PyGithub itself (e.g. pages of a GraphQL query
+    or a lazily completed object) wait for the quota once attached, and that an
+    unknown quota before the first response does not wait."""
+    github = _github(remaining=-1)
+    github.requester.rate_limiting_resettime = 0  # PyGithub's initial values
+    send = github.requester.requestJsonAndCheck
+    send.return_value = ({}, {"data": {}})
+    scheduler = _scheduler(github)
+    scheduler.attach(github)
+
+    github.requester.requestJsonAndCheck("POST", "/graphql", input={"query": "{}"})
+    mock_sleep.assert_not_called()
+
+    github.requester.rate_limiting = (10, 5000)
+    github.requester.rate_limiting_resettime = 1030
+    with patch("daily_report.request_scheduler.time.time", return_value=1000.0):
+        with patch("builtins.print"):
+            github.requester.requestJsonAndCheck("GET", "/repos/owner/repo")
+
+    mock_sleep.assert_called_once_with(30.0)
+    assert send.call_count == 2
+
+
+def test_iter_commits_conditional_paginates() -> None:
+    """Test that pages are requested with an hour-aligned date."""
+    scheduler = MagicMock()
+    scheduler.get_json.side_effect = [
+        [_item(f"a{i}") for i in range(PAGE_SIZE)],
+        [_item("b"), _item("c")],
+    ]
+    since = datetime(2024, 1, 1, 10, 42, 7, tzinfo=timezone.utc)
+
+    commits = list(iter_commits_conditional(scheduler, "owner/repo", since))
+
+    assert len(commits) == PAGE_SIZE + 2
+    assert commits[-1].sha == "c"
+    assert commits[0].date == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    url, parameters = scheduler.get_json.call_args_list[1].args
+    assert url == "/repos/owner/repo/commits"
+    assert parameters["since"] == "2024-01-01T10:00:00+00:00"
+    assert parameters["page"] == 2
@@ -0,0 +1,194 @@
+"""Unit tests for the retry and circuit breaker layer."""
+
+import json
+import os
+import smtplib
+import socket
+import ssl
+import time
+import urllib.error
+from email.utils import formatdate
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from github.GithubException import GithubException
+from openai import APIConnectionError
+
+from daily_report.daily_reporter import DailyReporter
+from daily_report.git_collector import GitCollectorError
+from daily_report.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delay,
+    call_with_retry,
+    is_transient,
+    retry_after,
+)
+from tests.conftest import valid_env
+
+
+class _HttpError(Exception):
+    """An HTTP error carrying a status and headers like PyGithub's exceptions."""
+
+    def __init__(self, status: int, headers: dict[str, str] | None = None) -> None:
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.headers = headers or {}
+
+
+def test_retry_after_reads_headers() -> None:
+    """Test that Retry-After, retry-after-ms and rate limit reset headers are read."""
+    assert retry_after(_HttpError(429, {"Retry-After": "7"})) == 7.0
+    assert retry_after(_HttpError(429, {"retry-after-ms": "1500"})) == 1.5
+    in_a_minute = formatdate(time.time() + 60, usegmt=True)
+    assert 55 < (retry_after(_HttpError(503, {"Retry-After": in_a_minute})) or 0) <= 60
+    reset = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 30)}
+    assert 25 < (retry_after(_HttpError(403, reset)) or 0) <= 30
+
+    assert retry_after(_HttpError(503)) is None
+    assert retry_after(_HttpError(503, {"Retry-After": "soon"})) is None
+    assert retry_after(ValueError("no headers")) is None
+
+
+def test_is_transient() -> None:
+    """Test which errors are worth retrying."""
+    assert is_transient(_HttpError(502))
+    assert is_transient(_HttpError(429))
+    assert is_transient(_HttpError(403, {"Retry-After": "60"}))
+    assert is_transient(TimeoutError("timed out"))
+    assert is_transient(ConnectionResetError("reset"))
+    assert is_transient(socket.gaierror(-3, "Temporary failure in name resolution"))
+    assert is_transient(urllib.error.URLError(ConnectionRefusedError("refused")))
+    assert is_transient(requests.exceptions.ConnectionError("connection aborted"))
+    assert is_transient(requests.exceptions.ReadTimeout("read timed out"))
+    assert is_transient(smtplib.SMTPServerDisconnected("closed"))
+    assert is_transient(smtplib.SMTPResponseException(421, b"try again later"))
+
+    assert not is_transient(_HttpError(404))
+    assert not is_transient(_HttpError(403))
+    assert not is_transient(smtplib.SMTPAuthenticationError(535, b"bad credentials"))
+    assert not is_transient(CircuitOpenError("open"))
+    assert not is_transient(ValueError("bad input"))
+    assert not is_transient(PermissionError("denied"))
+    assert not is_transient(FileNotFoundError("git"))
+    assert not is_transient(ssl.SSLCertVerificationError("self-signed certificate"))
+    assert not is_transient(urllib.error.URLError("unknown url type: ftp"))
+    assert not is_transient(requests.exceptions.SSLError("certificate verify failed"))
+    assert not is_transient(GitCollectorError("git fetch failed with exit code 128"))
+
+
+def test_backoff_delay() -> None:
+    """Test that the backoff doubles with jitter and honors Retry-After."""
+    assert 0.5 <= (backoff_delay(0, TimeoutError()) or 0) <= 1.0
+    assert 4.0 <= (backoff_delay(3, TimeoutError()) or 0) <= 8.0
+    assert 15.0 <= (backoff_delay(10, TimeoutError()) or 0) <= 30.0
+    assert backoff_delay(0, _HttpError(429, {"Retry-After": "7"})) == 7.0
+    assert backoff_delay(0, _HttpError(429, {"Retry-After": "3600"})) is None
+
+
+@patch("daily_report.resilience.time.sleep")
+def test_call_with_retry_retries_transient_errors(mock_sleep: MagicMock) -> None:
+    """Test that transient errors are retried and others are raised at once."""
+    breaker = CircuitBreaker("github", 5)
+    func = MagicMock(side_effect=[_HttpError(503), _HttpError(429), "ok"])
+    with patch("sys.stderr"):
+        assert call_with_retry(breaker, func, 3) == "ok"
+    assert func.call_count == 3
+    assert mock_sleep.call_count == 2
+    assert (breaker.retries, breaker.failures) == (2, 0)
+
+    func = MagicMock(side_effect=_HttpError(404))
+    with pytest.raises(_HttpError, match="404"):
+        call_with_retry(breaker, func, 3)
+    assert func.call_count == 1
+
+    func = MagicMock(side_effect=TimeoutError("timed out"))
+    with patch("sys.stderr"), pytest.raises(TimeoutError):
+        call_with_retry(breaker, func, 2)
+    assert func.call_count == 3
+
+
+@patch("daily_report.resilience.time.sleep")
+def test_call_with_retry_respects_deadline(mock_sleep: MagicMock) -> None:
+    """Test that no retry is attempted if its backoff would pass the deadline."""
+    func = MagicMock(side_effect=_HttpError(429, {"Retry-After": "10"}))
+    with pytest.raises(_HttpError):
+        call_with_retry(
+            CircuitBreaker("slack", 5), func, 3, deadline=time.monotonic() + 5
+        )
+    assert func.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+@patch("daily_report.resilience.time.sleep")
+def test_circuit_breaker_opens_and_recovers(
+    mock_sleep: MagicMock,  # pylint: disable=unused-argument
+) -> None:
+    """Test that an open circuit rejects calls until its reset timeout has passed."""
+    breaker = CircuitBreaker("smtp", 2)
+    func = MagicMock(side_effect=ConnectionResetError("reset"))
+    with patch("sys.stderr"), pytest.raises(ConnectionResetError):
+        call_with_retry(breaker, func, 5)
+    assert func.call_count == 2
+    assert breaker.is_open
+
+    with pytest.raises(CircuitOpenError, match="smtp is unavailable"):
+        call_with_retry(breaker, func, 5)
+    assert func.call_count == 2
+
+    breaker.reset_timeout = 0
+    assert call_with_retry(breaker, lambda: "sent", 5) == "sent"
+    assert not breaker.is_open
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        GithubException(502, "bad gateway", None),
+        APIConnectionError(request=MagicMock()),
+    ],
+)
+@patch("daily_report.daily_reporter.check_env_vars")
+@patch("github.Github")
+@patch("openai.OpenAI")
+def test_run_reports_exhausted_retries_as_failure(
+    mock_openai: MagicMock,
+    mock_github: MagicMock,
+    mock_check_env_vars: MagicMock,
+    error: Exception,
+    tmp_path: os.PathLike[str],
+) -> None:
+    """Test that GitHub and OpenAI errors left after the retries fail the run
+    with a failure status and a profile that lists the retries."""
+    output_path = os.path.join(tmp_path, "output")
+    profile_path = os.path.join(tmp_path, "profile.json")
+    mock_check_env_vars.return_value = valid_env(github_output_path=output_path)
+    mock_repo = mock_github.return_value.get_repo.return_value
+    mock_repo.full_name = "owner/repo"
+    mock_repo.get_commits.return_value = [
+        MagicMock(sha="abc1234", html_url="http://example.com", parents=[])
+    ]
+    if isinstance(error, GithubException):
+        mock_repo.get_commits.side_effect = error
+    mock_openai.return_value.chat.completions.create.side_effect = error
+
+    env = {"GITHUB_OUTPUT": output_path, "PROFILE_FILE": profile_path}
+    with (
+        patch.dict(os.environ, {**env, "SERVICE_RETRIES": "1"}),
+        patch("daily_report.resilience.time.sleep"),
+        patch("daily_report.mailer.smtplib.SMTP") as mock_smtp,
+        patch("builtins.print"),
+        patch("sys.exit", side_effect=SystemExit) as mock_exit,
+    ):
+        with pytest.raises(SystemExit):
+            DailyReporter().run()
+
+    mock_exit.assert_called_once_with(1)
+    mock_smtp.return_value.__enter__.return_value.sendmail.assert_not_called()
+    with open(output_path, encoding="utf-8") as fh:
+        assert "report_status=failure" in fh.read()
+    with open(profile_path, encoding="utf-8") as fh:
+        retries = json.load(fh)["retries"]
+    service = "github" if isinstance(error, GithubException) else "openai"
+    assert retries[service] == sum(retries.values()) == 1
@@ -0,0 +1,89 @@
+"""Unit tests for the on-disk OpenAI response cache."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from daily_report.response_cache import ResponseCache
+
+
+def test_response_cache_roundtrip(tmp_path: os.PathLike[str]) -> None:
+    """Test that stored responses are returned for the same inputs only."""
+    cache = ResponseCache(os.path.join(tmp_path, "cache"), max_bytes=10_000, max_age=60)
+    key = ResponseCache.make_key("model", "0.4", "prompt")
+
+    assert cache.get(key) is None
+    cache.set(key, "answer")
+
+    assert cache.get(key) == "answer"
+    assert ResponseCache.make_key("model", "0.4", "prompt") == key
+    assert ResponseCache.make_key("model", "0.5", "prompt") != key
+
+
+def test_response_cache_expires_entries(tmp_path: os.PathLike[str]) -> None:
+    """Test that entries older than max_age are not returned and get removed."""
+    cache = ResponseCache(str(tmp_path), max_bytes=10_000, max_age=60)
+    cache.set("old", "stale")
+    path = os.path.join(tmp_path, "old.json")
+    past = time.time() - 120
+    os.utime(path, (past, past))
+
+    assert cache.get("old") is None
+    assert not os.path.exists(path)
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path: os.PathLike[str]) -> None:
+    """Test that the oldest entries are evicted once the size limit is exceeded."""
+    cache = ResponseCache(str(tmp_path), max_bytes=250, max_age=3600)
+    now = time.time()
+    for age, key in enumerate(["c", "b", "a"]):
+        cache.set(key, "x" * 100)
+        path = os.path.join(tmp_path, f"{key}.json")
+        os.utime(path, (now - 10 * (age + 1), now - 10 * (age + 1)))
+    cache.set("d", "x" * 100)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == "x" * 100
+    assert cache.get("d") == "x" * 100
+
+
+def test_response_cache_ignores_corrupt_entries(tmp_path: os.PathLike[str]) -> None:
+    """Test that unreadable cache files are treated as misses."""
+    cache = ResponseCache(str(tmp_path), max_bytes=10_000, max_age=60)
+    with open(os.path.join(tmp_path, "bad.json"), "w", encoding="utf-8") as fh:
+        fh.write("{")
+    assert cache.get("bad") is None
+
+
+def test_response_cache_concurrent_writes(tmp_path: os.PathLike[str]) -> None:
+    """Test that threads writing the same key do not collide on a temp file."""
+    cache = ResponseCache(str(tmp_path), max_bytes=10_000, max_age=60)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda i: cache.set("key", f"value {i % 4}"), range(400)))
+    assert cache.get("key") in {f"value {i}" for i in range(4)}
+    assert os.listdir(tmp_path) == ["key.json"]
+
+
+def test_response_cache_tracks_size_without_scanning(
+    tmp_path: os.PathLike[str],
+) -> None:
+    """Test that writes below the size limit do not scan the directory and that
+    a failed write only prints a warning."""
+    cache = ResponseCache(str(tmp_path), max_bytes=10_000, max_age=60)
+    with patch.object(cache, "evict") as evict:
+        cache.set("a", "x" * 100)
+        cache.set("a", "y" * 100)
+        evict.assert_not_called()
+    # pylint: disable-next=protected-access
+    rescanned = ResponseCache(str(tmp_path), max_bytes=10_000, max_age=60)._size
+    assert rescanned == cache._size  # pylint: disable=protected-access
+
+    with (
+        patch("daily_report.response_cache.os.replace", side_effect=OSError("full")),
+        patch("sys.stderr"),
+    ):
+        cache.set("b", "value")
+    assert cache.get("b") is None
+    assert os.listdir(tmp_path) == ["a.json"]